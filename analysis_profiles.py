@@ -1,5 +1,5 @@
 # analysis_profiles.py
-# [Version 2.2.6]
+# [Version 2.4.1]
 
 from __future__ import annotations
 
@@ -10,7 +10,7 @@ import os
 # ==============================================================================
 # IMPORT DE LA CLASSE DE BASE
 # ==============================================================================
-from codetotext_core.profiles.base import AnalysisProfile
+from codetotext_core.profiles.base import AnalysisProfile, ConsolidationBlock
 
 # ==============================================================================
 # 2. PROFILS CONCRETS (LES STRATÉGIES)
@@ -21,6 +21,11 @@ class AdminScolaireProfile(AnalysisProfile):
     profile_id: str = "admin_scolaire"
     profile_name: str = "Projet : Administration Scolaire"
 
+    PATH_SIGNATURES: dict[str, float] = {
+        "administration_scolaire_app/": 3.0,
+        "react_apps/sports_budget/": 1.0,
+    }
+
     # --- Règles de filtrage ---
     IGNORED_DIRS_OR_COMPONENTS: set[str] = {
         "mon_application/static/assets/sports_budget/", "administration_scolaire_app/static/assets/sports_budget/",
@@ -184,6 +189,12 @@ class ScenarioBuilderProfile(AnalysisProfile):
     profile_id: str = "scenario_builder"
     profile_name: str = "Projet : Scenario Builder"
 
+    PATH_SIGNATURES: dict[str, float] = {
+        "scenario_builder_app/": 3.0,
+        "backend/seed_data/profiles/": 2.0,
+        "backend/seed_data/models/": 1.0,
+    }
+
     IGNORED_DIRS_OR_COMPONENTS: set[str] = {
         ".git", ".github", ".ruff_cache", "__pycache__", "venv",
         "instance", 
@@ -380,6 +391,12 @@ class CodeToTextProfile(AnalysisProfile):
     profile_id: str = "codetotext"
     profile_name: str = "Projet : CodeToText (Auto-Analyse)"
 
+    PATH_SIGNATURES: dict[str, float] = {
+        "analysis_profiles.py": 3.0,
+        "codetotext_core/": 2.0,
+        "templates/index.html": 0.5,
+    }
+
     IGNORED_PATH_COMPONENTS: set[str] = {
         ".git", ".github", ".ruff_cache", "__pycache__", "venv",
         "instance", "node_modules", "dist", "build"
@@ -452,6 +469,12 @@ class MermaidProfile(AnalysisProfile):
     profile_id: str = "mermaid"
     profile_name: str = "Projet : Mermaid Editor"
 
+    PATH_SIGNATURES: dict[str, float] = {
+        "frontend/src/types/api.ts": 2.0,
+        "backend/app/services/mermaid_parser.py": 2.0,
+        "backend/app/routes/mermaid.py": 1.0,
+    }
+
     IGNORED_DIRS_OR_COMPONENTS: set[str] = {
         ".git", ".github", ".ruff_cache", "__pycache__", "venv",
         "node_modules", "dist", "build", "instance", "attached_assets",
@@ -590,7 +613,7 @@ class MermaidProfile(AnalysisProfile):
         return categories
 
     def generate_consolidated_files(
-        self, categorized_files: list[tuple[str, set[str]]]
+        self, categorized_files: list[tuple[ConsolidationBlock, set[str]]]
     ) -> dict[str, str]:
         def join_blocks(blocks: Iterable[str]) -> str:
             return "\n\n".join(blocks)
@@ -639,7 +662,7 @@ class MermaidProfile(AnalysisProfile):
 
         output_files["__code_mermaid_backend.txt"] = join_blocks(
             backend_core_parts + 
-            [b for b in backend_config_parts if "requirements.txt" in b or ".replit" in b] + 
+            [b for b in backend_config_parts if "requirements.txt" in b.path or ".replit" in b.path] + 
             backend_code_critical_parts + 
             backend_services_critical_parts + 
             backend_code_parts
@@ -648,12 +671,13 @@ class MermaidProfile(AnalysisProfile):
         output_files["__code_mermaid_frontend.txt"] = join_blocks(
             frontend_code_parts + 
             frontend_types_parts +
-            [b for b in frontend_config_parts if "package.json" in b or "vite.config.ts" in b or "tailwind.config.js" in b or "tsconfig" in b or "postcss.config.js" in b] + 
+            [b for b in frontend_config_parts if "package.json" in b.path or "vite.config.ts" in b.path or "tailwind.config.js" in b.path or "tsconfig" in b.path or "postcss.config.js" in b.path] + 
             frontend_static_parts
         )
 
-        remaining_backend_configs = [b for b in backend_config_parts if "requirements.txt" not in b and ".replit" not in b]
-        remaining_frontend_configs = [b for b in frontend_config_parts if "package.json" not in b and "vite.config.ts" not in b and "tailwind.config.js" not in b and "tsconfig" not in b and "postcss.config.js" not in b]
+        # Aiguillage sur le chemin : le texte du bloc peut n'être qu'un marqueur (magasin de blocs)
+        remaining_backend_configs = [b for b in backend_config_parts if "requirements.txt" not in b.path and ".replit" not in b.path]
+        remaining_frontend_configs = [b for b in frontend_config_parts if "package.json" not in b.path and "vite.config.ts" not in b.path and "tailwind.config.js" not in b.path and "tsconfig" not in b.path and "postcss.config.js" not in b.path]
 
         output_files["__code_mermaid_config_docs.txt"] = join_blocks(
             config_doc_parts + 
@@ -733,12 +757,7 @@ class CompleteProfile(AnalysisProfile):
 # 3. REGISTRE DES PROFILIS DISPONIBLES
 # ==============================================================================
 
-PROFILES: dict[str, AnalysisProfile] = {
-    p.profile_id: p for p in [
-        AdminScolaireProfile(),
-        ScenarioBuilderProfile(),
-        CodeToTextProfile(),
-        CompleteProfile(),
-        MermaidProfile(),
-    ]
-}
\ No newline at end of file
+# Le registre est désormais paresseux et vit dans codetotext_core.profiles.registry
+# (voir BUILTIN_PROFILES) : les profils ne sont construits qu'au premier accès.
+# Ré-export conservé pour la compatibilité des imports existants.
+from codetotext_core.profiles.registry import PROFILES  # noqa: E402
@@ -1,162 +1,380 @@
 # app.py
-# [Version 8.3]
+# [Version 11.2]
 
 from __future__ import annotations
 
+import contextlib
+import dataclasses
+import hashlib
+import hmac
 import io
 import os
-import uuid
+import tarfile
+import threading
 import zipfile
-from collections import Counter
+from collections.abc import Callable, Iterator
 from datetime import datetime
+from typing import BinaryIO
 
 from flask import (
     Flask,
+    abort,
+    copy_current_request_context,
     flash,
+    jsonify,
     redirect,
     render_template,
     request,
+    send_file,
     send_from_directory,
     url_for,
 )
+from werkzeug.utils import safe_join, secure_filename
 
-# Importation du système de profils
-from analysis_profiles import PROFILES
-# Import de la classe de base depuis le nouveau module core
+# Registre paresseux des profils : aucun profil n'est importé ni construit avant usage
+from codetotext_core.profiles.registry import DEFAULT_CACHE_DIR, PROFILES
 from codetotext_core.profiles.base import AnalysisProfile
+from codetotext_core.profiles.detection import (
+    AUTO_PROFILE_ID,
+    FALLBACK_PROFILE_ID,
+    ProfileDetection,
+    detect_zip_profile,
+)
+from codetotext_core.processing.code_index import extract_index_from_archive, find_symbols, search_index
+from codetotext_core.processing.content_sniffing import DEFAULT_MAX_FILE_SIZE
+from codetotext_core.processing.dependency_graph import DependencySelection
+from codetotext_core.processing.diff_mode import process_zip_diff
+from codetotext_core.processing.estimate import DEFAULT_TOP_CONTRIBUTORS, estimate_zip
+from codetotext_core.processing.outline import DEFAULT_OUTLINE_CATEGORIES, DEFAULT_OUTLINE_THRESHOLD, OutlineOptions
+from codetotext_core.processing.output_writer import OUTPUT_FORMAT_PRESETS, OutputFormat
+from codetotext_core.processing.parallel_deflate import DEFAULT_DEFLATE_WORKERS
+# Le pipeline vit dans le module core (indépendant de Flask, partagé avec la CLI)
+from codetotext_core.processing.pipeline import (
+    ARCHIVE_EXTENSIONS,
+    archive_kind,
+    process_archive_path,
+    process_tar_stream,
+)
+from codetotext_core.processing.pipeline import process_zip_file as _process_zip_file
+from codetotext_core.processing.resource_budget import DEFAULT_RESOURCE_LIMITS, check_zip_archive
 # Import des fonctions utilitaires depuis le nouveau module core
-from codetotext_core.utils.file_utils import get_language_from_filename, generate_zip_tree
+from codetotext_core.utils.chunked_upload import DEFAULT_CHUNK_SIZE, ChunkedUploads, UploadError, UploadSession
+from codetotext_core.utils.file_utils import generate_zip_tree
+from codetotext_core.utils.precompressed import ENCODING_SUFFIXES, load_manifest, precompress_members
+from codetotext_core.utils.profiling import (
+    DEFAULT_KEEP_PROFILES,
+    DEFAULT_MAX_PROFILE_BYTES,
+    FOLDED_SUFFIX,
+    PSTATS_SUFFIX,
+    ProfileCapture,
+    capture_profile,
+)
+from codetotext_core.utils.shared_store import SharedStore, unique_filename, write_file_atomic
 
 app = Flask(__name__, template_folder='templates', instance_relative_config=True)
 app.secret_key = "supersecretkey"
 app.config["MAX_CONTENT_LENGTH"] = 50 * 1024 * 1024
-
+# Taille maximale (non compressée) d'un fichier inliné ; au-delà il est résumé.
+app.config["MAX_FILE_SIZE"] = DEFAULT_MAX_FILE_SIZE
+# Limites par traitement (entrées, taille décompressée, ratio, durée, sortie, mémoire)
+app.config["RESOURCE_LIMITS"] = DEFAULT_RESOURCE_LIMITS
+# Traitements simultanés, tous workers confondus, répartis équitablement entre clients
+app.config["ADMISSION_CAPACITY"] = 4
+# Délai suggéré au client refusé (en-tête Retry-After, secondes)
+app.config["ADMISSION_RETRY_AFTER"] = 5
+# Attente maximale du résultat d'une archive identique traitée par une autre requête
+# (secondes) : inférieure au délai d'expiration des requêtes du serveur
+app.config["CACHE_WAIT_SECONDS"] = 20.0
+# Téléversement par morceaux (/api/uploads) : taille totale maximale d'une archive
+app.config["MAX_UPLOAD_SIZE"] = 16 * 1024 ** 3
+# Threads de compression des gros membres deflate des archives ZIP produites
+app.config["DEFLATE_WORKERS"] = DEFAULT_DEFLATE_WORKERS
+
+# Le dossier est créé au premier enregistrement, pas à l'import (démarrage à froid)
 DOWNLOAD_FOLDER = os.path.join(app.instance_path, "downloads")
 app.config["DOWNLOAD_FOLDER"] = DOWNLOAD_FOLDER
-os.makedirs(DOWNLOAD_FOLDER, exist_ok=True)
-
-ALLOWED_EXTENSIONS = {"zip"}
+# Index SQLite extraits des archives produites, pour les requêtes de recherche
+app.config["INDEX_CACHE_FOLDER"] = os.path.join(DEFAULT_CACHE_DIR, "index")
+# Membres texte de chaque sortie (bruts et précompressés), servis un par un
+app.config["MEMBERS_FOLDER"] = os.path.join(DOWNLOAD_FOLDER, "_members")
+# Les noms serveur sont uniques et leur contenu immuable : cache client d'un an
+app.config["DOWNLOAD_MAX_AGE"] = 365 * 24 * 3600
+# Profilage à la demande d'un traitement (jeton `profiling_token` égal à ce secret) ; désactivé sans secret
+app.config["PROFILING_SECRET"] = os.environ.get("CODETOTEXT_PROFILING_SECRET")
+app.config["PROFILING_FOLDER"] = os.path.join(app.instance_path, "profiling")
+# Rotation des captures : nombre conservé et taille totale maximale du dossier
+app.config["PROFILING_KEEP"] = DEFAULT_KEEP_PROFILES
+app.config["PROFILING_MAX_BYTES"] = DEFAULT_MAX_PROFILE_BYTES
+
+# Exécuteur des traitements (pool de processus, fourni par le mode asynchrone asgi.py) ;
+# None : le traitement s'exécute dans le thread de la requête
+app.config["PROCESSING_EXECUTOR"] = None
+# Clé d'environnement WSGI du corps de requête déjà reçu sur disque (mode asynchrone)
+BODY_PATH_ENVIRON_KEY = "codetotext.body_path"
+
+# État partagé entre workers (tâches, cache de résultats) : SQLite WAL sous instance/
+STORE = SharedStore(os.path.join(app.instance_path, "shared"))
+# Archives en cours de téléversement par morceaux, reconstituées sur disque
+UPLOADS = ChunkedUploads(STORE, os.path.join(app.instance_path, "uploads"))
+
+def _is_known_profile(profile_id: str) -> bool:
+    return profile_id == AUTO_PROFILE_ID or profile_id in PROFILES
+
+
+def _resolve_profile(profile_id: str, zip_source: bytes | BinaryIO | None) -> tuple[AnalysisProfile, ProfileDetection | None]:
+    """
+    Profil demandé, ou pour `auto` le profil détecté sur le répertoire central
+    de l'archive ZIP. Un flux TAR ne livre ses chemins qu'au fil du
+    traitement : `auto` y retombe sur le profil de repli.
+    """
+    if profile_id != AUTO_PROFILE_ID:
+        return PROFILES[profile_id], None
+    if zip_source is None:
+        detection = ProfileDetection(FALLBACK_PROFILE_ID, 0.0, {})
+    else:
+        detection = detect_zip_profile(zip_source, PROFILES)
+    app.logger.info(detection.summary_line())
+    return PROFILES[detection.profile_id], detection
 
 
 def allowed_file(filename: str) -> bool:
-    """Vérifie si l'extension du fichier est autorisée."""
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    """Vérifie si l'extension du fichier est autorisée (.zip, .tar, .tar.gz, .tgz, ...)."""
+    return archive_kind(filename) is not None
+
+
+def client_filename(filename: str | None, default: str = "archive.zip") -> str:
+    """
+    Nom de fichier fourni par le client, réduit par `secure_filename` (ni
+    répertoire, ni `..`) avant de servir à nommer les fichiers du serveur.
+    Si le nom perd son radical ou son extension d'archive, celle-ci est
+    reprise sous le nom `archive`.
+    """
+    filename = filename or ""
+    safe = secure_filename(filename)
+    if safe and archive_kind(safe) == archive_kind(filename):
+        return safe
+    extension = next((ext for ext in ARCHIVE_EXTENSIONS if filename.lower().endswith(ext)), None)
+    return f"archive{extension}" if extension else default
+
+
+def _output_format_from_form(form) -> OutputFormat:
+    """Construit le format de sortie à partir des champs du formulaire (ou de l'API)."""
+    preset_id = form.get("output_format") or "zip"
+    if preset_id not in OUTPUT_FORMAT_PRESETS:
+        raise ValueError(f"Format de sortie inconnu : {preset_id}.")
+    _, preset = OUTPUT_FORMAT_PRESETS[preset_id]
+    return dataclasses.replace(
+        preset,
+        include_individual_files=form.get("omit_individual_files") != "true",
+        include_combined_files=form.get("omit_combined_files") != "true",
+        deflate_workers=app.config["DEFLATE_WORKERS"],
+    )
+
+
+def _outline_options_from_form(form) -> OutlineOptions | None:
+    """Options du mode plan (None si désactivé) : seuil en Ko et catégories séparées par des virgules."""
+    if form.get("outline") != "true":
+        return None
+    threshold_kb = (form.get("outline_threshold_kb") or "").strip()
+    try:
+        size_threshold = int(threshold_kb) * 1024 if threshold_kb else None
+    except ValueError:
+        raise ValueError(f"Seuil du mode plan invalide : {threshold_kb}.")
+    categories = form.get("outline_categories")
+    if categories is None:
+        return OutlineOptions(size_threshold=size_threshold)
+    return OutlineOptions(
+        size_threshold=size_threshold,
+        categories=frozenset(c.strip().upper() for c in categories.split(",") if c.strip()),
+    )
+
+
+def _selection_from_form(form) -> DependencySelection | None:
+    """
+    Sélection par dépendances (None sans point d'entrée) : fichiers d'entrée
+    séparés par des virgules ou des retours à la ligne, profondeur et budget en Ko.
+    """
+    entry_points = tuple(
+        entry.strip() for entry in (form.get("entry_points") or "").replace("\n", ",").split(",") if entry.strip()
+    )
+    if not entry_points:
+        return None
+    depth = (form.get("dependency_depth") or "").strip()
+    max_kb = (form.get("dependency_max_kb") or "").strip()
+    try:
+        max_depth = int(depth) if depth else None
+        max_bytes = int(max_kb) * 1024 if max_kb else None
+    except ValueError:
+        raise ValueError(f"Profondeur ou budget de la sélection par dépendances invalide : {depth or max_kb}.")
+    return DependencySelection(entry_points, max_depth, max_bytes)
+
+
+def _save_output(processed_stream: io.BytesIO, base_output_filename: str, output_format: OutputFormat) -> dict[str, object]:
+    """Enregistre l'archive produite dans le dossier de téléchargement et retourne ses liens."""
+    timestamp = datetime.now().strftime("%y-%m-%d_%Hh%M")
+    # L'extension peut être composée (".tar.gz") : on la retire telle quelle
+    extension = output_format.extension
+    name_root = base_output_filename[:-len(extension)]
+    user_facing_filename = f"{name_root}_{timestamp}{extension}"
+    # Nom serveur unique entre workers ; écriture atomique (jamais de fichier tronqué servi)
+    server_filename = unique_filename(secure_filename(name_root) or "archive", extension)
+    server_path = os.path.join(app.config['DOWNLOAD_FOLDER'], server_filename)
+    write_file_atomic(server_path, processed_stream.getbuffer())
+    # ETag et variantes précompressées des membres texte, calculés une fois pour toutes
+    precompress_members(server_path, output_format.container, _members_folder(server_filename))
+    return _download_info(server_filename, user_facing_filename)
+
+
+def _members_folder(server_filename: str) -> str:
+    return os.path.join(app.config["MEMBERS_FOLDER"], server_filename)
+
+
+def _download_info(server_filename: str, user_facing_filename: str) -> dict[str, object]:
+    manifest = load_manifest(_members_folder(server_filename)) or {"members": {}}
+    return {
+        "url": url_for('download_file', server_filename=server_filename, user_filename=user_facing_filename),
+        "filename": user_facing_filename,
+        "server_filename": server_filename,
+        "members": [
+            {"name": name, "size": member["size"], "url": url_for(
+                "download_member", server_filename=server_filename, member_name=name,
+            )}
+            for name, member in sorted(manifest["members"].items())
+        ],
+    }
+
+
+def _result_cache_key(*parts: bytes | str) -> str:
+    """Empreinte des entrées d'un traitement (contenus téléversés et options)."""
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultPending(Exception):
+    """Une archive identique est déjà en cours de traitement (tâche `job_id`, si connue)."""
+
+    def __init__(self, job_id: str | None) -> None:
+        super().__init__(
+            "Une archive identique est déjà en cours de traitement"
+            + (f" (tâche {job_id})" if job_id else "") + " : réessayez dans quelques instants."
+        )
+        self.job_id = job_id
+
+
+def _run_cached(
+    cache_key: str | None,
+    output_format: OutputFormat,
+    produce: Callable[[], tuple[io.BytesIO, str, str]],
+    job_id: str | None = None,
+) -> tuple[dict[str, object], str]:
+    """
+    Exécute `produce` (-> flux, nom de sortie, texte affiché) et enregistre la sortie,
+    sauf si un résultat identique existe déjà dans le cache partagé.
+
+    Deux envois simultanés d'une même archive ne déclenchent qu'un traitement :
+    le second attend le résultat du premier, quel que soit le worker, mais au
+    plus CACHE_WAIT_SECONDS ; au-delà, `ResultPending` désigne la tâche en cours.
+    """
+    if cache_key is None:
+        processed_stream, base_output_filename, tree_output = produce()
+        return _save_output(processed_stream, base_output_filename, output_format), tree_output
+
+    while True:
+        claim = STORE.cache_claim("result", cache_key, timeout=app.config["CACHE_WAIT_SECONDS"], job_id=job_id)
+        if claim.value is None and not claim.owner:
+            raise ResultPending(claim.pending_job)
+        if claim.value is None:
+            break
+        if os.path.isfile(os.path.join(app.config["DOWNLOAD_FOLDER"], claim.value["server_filename"])):
+            return _download_info(claim.value["server_filename"], claim.value["filename"]), claim.value["tree"]
+        STORE.cache_invalidate("result", cache_key)  # Sortie supprimée entre-temps : on recalcule
+
+    try:
+        processed_stream, base_output_filename, tree_output = produce()
+        download_info = _save_output(processed_stream, base_output_filename, output_format)
+    except BaseException:
+        STORE.cache_release("result", cache_key)
+        raise
+    STORE.cache_put("result", cache_key, {
+        "server_filename": download_info["server_filename"], "filename": download_info["filename"], "tree": tree_output,
+    })
+    return download_info, tree_output
+
+
+def _run_processing(func: Callable, /, *args, inline: bool = False, **kwargs):
+    """
+    Exécute un traitement (fonction du pipeline, arguments sérialisables) dans
+    l'exécuteur configuré, sinon dans le thread courant. `inline` force le
+    thread courant (traitement profilé, flux non sérialisable).
+    """
+    executor = app.config["PROCESSING_EXECUTOR"]
+    if executor is None or inline:
+        return func(*args, **kwargs)
+    return executor.submit(func, *args, **kwargs).result()
+
+
+def _acquire_processing_slot() -> str | None:
+    """Créneau de traitement pour le client de la requête, None si le serveur est saturé."""
+    limits = app.config["RESOURCE_LIMITS"]
+    # Le bail couvre la durée maximale d'un traitement : un worker tué libère son créneau ensuite
+    lease_seconds = limits.max_wall_seconds if limits is not None else None
+    return STORE.acquire_slot(
+        "processing", request.remote_addr or "inconnu", app.config["ADMISSION_CAPACITY"], lease_seconds=lease_seconds,
+    )
+
+
+def _busy_response():
+    """Réponse 429 d'une requête d'API refusée par le contrôle d'admission."""
+    response = jsonify(error="Le serveur traite déjà le maximum d'archives.")
+    response.status_code = 429
+    response.headers["Retry-After"] = str(app.config["ADMISSION_RETRY_AFTER"])
+    return response
+
+
+def _profiling_requested(values) -> bool:
+    """
+    Profilage demandé par la requête : jeton `profiling_token` (champ, paramètre
+    d'URL ou en-tête X-Profiling-Token) égal au secret configuré.
+    """
+    secret = app.config["PROFILING_SECRET"]
+    token = request.headers.get("X-Profiling-Token") or values.get("profiling_token") or ""
+    return bool(secret) and hmac.compare_digest(token.encode("utf-8"), secret.encode("utf-8"))
+
+
+@contextlib.contextmanager
+def _profiled(job_id: str, enabled: bool) -> Iterator[ProfileCapture | None]:
+    """Profile le bloc (cProfile et piles échantillonnées) si `enabled` ; captures nommées d'après la tâche."""
+    if not enabled:
+        yield None
+        return
+    with capture_profile(
+        app.config["PROFILING_FOLDER"], job_id, app.config["PROFILING_KEEP"], app.config["PROFILING_MAX_BYTES"],
+    ) as capture:
+        yield capture
+
+
+def _with_profiling(download_info: dict[str, object], capture: ProfileCapture | None) -> dict[str, object]:
+    """Ajoute au résultat de la tâche les fichiers de profilage produits."""
+    if capture is None or not capture.artifacts():
+        return download_info
+    return dict(download_info, profiling=capture.artifacts())
 
-def _process_zip_file(
-    input_zip_stream: io.BytesIO,
-    uploaded_filename: str,
-    keep_original_extension: bool,
-    tree_content: str,
-    profile: AnalysisProfile,  # Le profil est maintenant un paramètre
-) -> tuple[io.BytesIO, str]:
-    """
-    Traite un fichier ZIP en utilisant le profil d'analyse fourni.
-    """
-    output_zip_stream = io.BytesIO()
-    with zipfile.ZipFile(input_zip_stream, "r") as zin, zipfile.ZipFile(output_zip_stream, "w", zipfile.ZIP_DEFLATED) as zout:
-        all_file_paths_in_zip = [item.filename for item in zin.infolist() if not item.is_dir()]
-        common_prefix_to_remove = ""
-        if all_file_paths_in_zip:
-            first_path_parts = all_file_paths_in_zip[0].split('/', 1)
-            if len(first_path_parts) > 1 and first_path_parts[0]:
-                potential_common_dir = first_path_parts[0] + '/'
-                if all(p.startswith(potential_common_dir) for p in all_file_paths_in_zip):
-                    common_prefix_to_remove = potential_common_dir
-
-        basename_counts = Counter(item.filename.split('/')[-1] for item in zin.infolist() if not item.is_dir())
-        full_code_content_parts, full_code_sans_css_parts, categorized_files = [], [], []
-
-        for item in zin.infolist():
-            if item.is_dir():
-                continue
-            full_path_in_zip = item.filename
-            path_for_filtering = full_path_in_zip.replace(common_prefix_to_remove, "", 1).replace('\\', '/')
-            path_components = path_for_filtering.split('/')
-            filename_basename, filename_basename_lower = path_components[-1], path_components[-1].lower()
-
-            # --- ÉTAPE 1 : GATEKEEPER P_1 (Exclusion Impérative) ---
-            if AnalysisProfile.is_always_ignored(path_for_filtering, path_components):
-                continue  # Skip précoce des fichiers "garbage"
-            # --- FIN DU GATEKEEPER ---
-
-            # --- ÉTAPE 2 : LOGIQUE MÉTIER DU PROFIL ---
-            if profile.is_file_ignored(path_for_filtering, path_components):
-                continue  # Filtrage spécifique au projet
-            # --- FIN LOGIQUE MÉTIER ---
-
-            # Logique de filtrage générique restante
-            if filename_basename.startswith(".") and filename_basename != '.replit':
-                continue
-            if not keep_original_extension and filename_basename_lower.endswith(".txt"):
-                continue
-
-            content = zin.read(item.filename)
-            path_for_display = path_for_filtering
-
-            new_filename_base = path_for_display.replace('/', '.') if basename_counts[filename_basename] > 1 else filename_basename
-
-            # AC-3 + P_2 : Liste blanche des extensions critiques
-            # Assure la conservation des extensions même en mode textifié
-            extensions_to_keep = {".tsx", ".css", ".html", ".js", ".json", ".py", ".md"}
-            _, ext = os.path.splitext(filename_basename_lower)
-
-            if keep_original_extension or ext in extensions_to_keep or filename_basename_lower in ["package.json"]:
-                new_filename_in_zip = new_filename_base
-            else:
-                new_filename_in_zip = new_filename_base + ".txt"
-
-            if filename_basename_lower == "synthèse_développement.md":
-                new_filename_in_zip = new_filename_base
-            elif filename_basename_lower == ".replit":
-                new_filename_in_zip = "replit.txt"
-
-            zout.writestr(new_filename_in_zip, content)
-
-            # --- ÉTAPE 3 : CONTRÔLE DE CONCATÉNATION P_4 ---
-            # Exclut les documents d'architecture des consolidations
-            is_architecture_doc = AnalysisProfile.is_always_included(path_for_filtering, path_components)
-            if not is_architecture_doc:  # Condition P_4
-                try:
-                    file_content_str = content.decode('utf-8', errors='replace')
-                    language = get_language_from_filename(filename_basename)
-                    file_block = f"-- DEBUT DU FICHIER --\nChemin: {path_for_display}\nLangage: {language}\n-- CONTENU DU CODE --\n{file_content_str}\n-- FIN DU FICHIER --\n"
-                    full_code_content_parts.append(file_block)
-                    if not filename_basename_lower.endswith('.css'):
-                        full_code_sans_css_parts.append(file_block)
-
-                    # Délégation au profil pour la catégorisation (seulement si pas un doc d'architecture)
-                    categories = profile.categorize_file(path_for_filtering)
-                    categorized_files.append((file_block, categories))
-
-                except Exception as e:
-                    app.logger.error(f"Erreur préparation contenu de {full_path_in_zip}: {e}")
-            # --- FIN CONTRÔLE P_4 ---
-
-        if not full_code_content_parts:
-            raise ValueError("Le fichier ZIP ne contenait aucun fichier traitable après filtrage.")
-
-        zout.writestr("__arborescence.txt", tree_content.encode('utf-8'))
-        tree_block_for_code_complet = f"--- DEBUT DE L'ARBORESCENCE ---\n{tree_content}\n--- FIN DE L'ARBORESCENCE ---\n"
-        final_full_code_content = [tree_block_for_code_complet] + full_code_content_parts
-        zout.writestr("__code_complet.txt", "\n".join(final_full_code_content).encode('utf-8'))
-        zout.writestr("__code_complet_sans_CSS.txt", "\n".join(full_code_sans_css_parts).encode('utf-8'))
-
-        # Délégation au profil pour les fichiers consolidés
-        consolidated_files = profile.generate_consolidated_files(categorized_files)
-        for filename, content in consolidated_files.items():
-            zout.writestr(filename, content.encode("utf-8"))
-
-    output_zip_stream.seek(0)
-    original_zip_name_base, _ = os.path.splitext(uploaded_filename)
-    suffix_zip = "_flat_orig_ext.zip" if keep_original_extension else "_flat_textified.zip"
-    base_output_filename = f"{original_zip_name_base}{suffix_zip}"
-    return output_zip_stream, base_output_filename
+
+def _outline_defaults() -> dict[str, object]:
+    return {
+        "outline_threshold_kb": DEFAULT_OUTLINE_THRESHOLD // 1024,
+        "outline_categories": ", ".join(sorted(DEFAULT_OUTLINE_CATEGORIES)),
+    }
 
 
 @app.route("/", methods=["GET", "POST"])
 def index():
     """Route principale de l'application."""
-    available_profiles = list(PROFILES.values())
+    available_profiles = PROFILES.descriptors()
 
     if request.method == "POST":
         if 'file' not in request.files:
@@ -170,65 +388,532 @@ def index():
             flash("Aucun fichier sélectionné.", "error")
             return redirect(request.url)
         if not allowed_file(file.filename):
-            flash("Type de fichier non autorisé. Veuillez téléverser un fichier ZIP.", "error")
+            flash("Type de fichier non autorisé. Veuillez téléverser un fichier ZIP ou TAR (.tar, .tar.gz).", "error")
             return redirect(request.url)
         if not profile_id:
             flash("Veuillez sélectionner un profil d'analyse.", "error")
             return redirect(request.url)
 
-        profile = PROFILES.get(profile_id)
-        if not profile:
+        if not _is_known_profile(profile_id):
             flash(f"Profil d'analyse inconnu : {profile_id}.", "error")
             return redirect(request.url)
 
+        slot_id = _acquire_processing_slot()
+        if slot_id is None:
+            flash("Le serveur traite déjà le maximum d'archives. Réessayez dans quelques secondes.", "error")
+            return redirect(request.url)
+
+        job_id = None
+        filename = client_filename(file.filename)
         try:
+            limits = app.config["RESOURCE_LIMITS"]
             keep_original_extension = request.form.get("keep_original_extension") == "true"
-            file_bytes = file.read()
-            tree_stream, process_stream = io.BytesIO(file_bytes), io.BytesIO(file_bytes)
-            tree_output = generate_zip_tree(tree_stream)
-
-            # Appel à la fonction de traitement en passant le profil sélectionné
-            processed_stream, base_output_filename = _process_zip_file(
-                process_stream, file.filename, keep_original_extension, tree_output, profile
-            )
-
-            timestamp = datetime.now().strftime("%y-%m-%d_%Hh%M")
-            name_root, extension = os.path.splitext(base_output_filename)
-            user_facing_filename = f"{name_root}_{timestamp}{extension}"
-            server_filename = user_facing_filename  # Pas d'UUID, juste le timestamp
-            save_path = os.path.join(app.config['DOWNLOAD_FOLDER'], server_filename)
-            with open(save_path, 'wb') as f:
-                f.write(processed_stream.getbuffer())
-
-            download_info = {
-                "url": url_for('download_file', server_filename=server_filename, user_filename=user_facing_filename),
-                "filename": user_facing_filename
-            }
-
+            build_index = request.form.get("build_index") == "true"
+            compact = request.form.get("compact") == "true"
+            trace_rules = request.form.get("trace_rules") == "true"
+            build_bundle = request.form.get("build_bundle") == "true"
+            outline = _outline_options_from_form(request.form)
+            selection = _selection_from_form(request.form)
+            output_format = _output_format_from_form(request.form)
+            max_file_size = app.config["MAX_FILE_SIZE"]
+            profiling = _profiling_requested(request.form)
+            options = repr((
+                profile_id, keep_original_extension, build_index, compact, outline, output_format, max_file_size,
+                selection, trace_rules, build_bundle,
+            ))
+            job_id = STORE.create_job("upload", {"filename": filename, "profile": profile_id})
+            baseline_file = request.files.get("baseline_file")
+            if baseline_file and baseline_filename:
+                # Mode différentiel : seuls les changements par rapport à la référence sont produits
+                if archive_kind(filename) != "zip" or archive_kind(baseline_filename) != "zip":
+                    raise ValueError("Le mode différentiel compare deux archives ZIP.")
+                baseline_bytes, file_bytes = baseline_file.read(), file.read()
+                profile, detection = _resolve_profile(profile_id, file_bytes)
+
+                def produce() -> tuple[io.BytesIO, str, str]:
+                    processed_stream, base_output_filename, archive_diff = _run_processing(
+                        process_zip_diff, io.BytesIO(baseline_bytes), io.BytesIO(file_bytes), filename,
+                        keep_original_extension, profile, max_file_size=max_file_size, output_format=output_format,
+                        limits=limits, inline=profiling,
+                    )
+                    summary = "\n".join(
+                        [archive_diff.summary_line()]
+                        + [f"+ {path}" for path in archive_diff.added]
+                        + [f"~ {path}" for path in archive_diff.modified]
+                        + [f"- {path}" for path in archive_diff.removed]
+                    )
+                    return processed_stream, base_output_filename, summary
+
+                cache_key = _result_cache_key("diff", options, filename, baseline_bytes, file_bytes)
+            elif archive_kind(filename) == "tar":
+                profile, detection = _resolve_profile(profile_id, None)
+
+                # Lecture séquentielle du flux téléversé, sans le charger en mémoire (donc sans cache)
+                def produce() -> tuple[io.BytesIO, str, str]:
+                    return process_tar_stream(
+                        file.stream, filename, keep_original_extension, profile,
+                        max_file_size=max_file_size, output_format=output_format,
+                        build_index=build_index, compact=compact, outline=outline, limits=limits,
+                        selection=selection, trace_rules=trace_rules, build_bundle=build_bundle,
+                    )
+
+                cache_key = None
+            else:
+                file_bytes = file.read()
+                profile, detection = _resolve_profile(profile_id, file_bytes)
+
+                def produce() -> tuple[io.BytesIO, str, str]:
+                    if limits is not None:
+                        check_zip_archive(file_bytes, limits)  # Admission sur le seul répertoire central
+                    tree_output = generate_zip_tree(io.BytesIO(file_bytes))
+                    # Appel à la fonction de traitement en passant le profil sélectionné
+                    processed_stream, base_output_filename = _run_processing(
+                        _process_zip_file, io.BytesIO(file_bytes), filename, keep_original_extension,
+                        tree_output, profile, max_file_size=max_file_size, output_format=output_format,
+                        build_index=build_index, compact=compact, outline=outline, limits=limits,
+                        selection=selection, trace_rules=trace_rules, build_bundle=build_bundle, inline=profiling,
+                    )
+                    return processed_stream, base_output_filename, tree_output
+
+                cache_key = _result_cache_key("zip", options, filename, file_bytes)
+
+            # Un traitement profilé ne passe jamais par le cache : il doit réellement s'exécuter
+            with _profiled(job_id, profiling) as capture:
+                download_info, tree_output = _run_cached(
+                    None if profiling else cache_key, output_format, produce, job_id,
+                )
+            download_info = _with_profiling(download_info, capture)
+            STORE.finish_job(job_id, download_info)
+
+            if detection is not None:
+                flash(detection.summary_line(), "success")
             flash("Traitement réussi ! Vous pouvez télécharger le fichier et consulter l'arborescence.", "success")
-            return render_template("index.html", tree_output=tree_output, download_info=download_info, profiles=available_profiles)
+            return render_template(
+                "index.html", tree_output=tree_output, download_info=download_info,
+                profiles=available_profiles, output_formats=OUTPUT_FORMAT_PRESETS, **_outline_defaults(),
+            )
 
+        except ResultPending as e:
+            # Le résultat sera servi par le cache au prochain envoi
+            STORE.fail_job(job_id, str(e))
+            flash(str(e), "error")
         except (zipfile.BadZipFile, ValueError) as e:
+            if job_id:
+                STORE.fail_job(job_id, str(e))
             flash(str(e), "error")
         except Exception as e:
+            if job_id:
+                STORE.fail_job(job_id, f"Erreur interne : {type(e).__name__}")
             app.logger.error(f"Erreur inattendue : {e}", exc_info=True)
             flash("Une erreur interne est survenue.", "error")
+        finally:
+            STORE.release_slot(slot_id)
 
         return redirect(request.url)
 
-    return render_template("index.html", profiles=available_profiles)
+    return render_template(
+        "index.html", profiles=available_profiles, output_formats=OUTPUT_FORMAT_PRESETS, **_outline_defaults(),
+    )
+
+
+@app.route("/api/process-tar", methods=["POST"])
+def api_process_tar():
+    """
+    Traite une archive TAR (.tar, .tar.gz, ...) envoyée brute dans le corps de la requête.
+
+    Les membres sont filtrés, décodés et écrits pendant la réception du corps :
+    le réseau et le traitement se chevauchent. Les options sont passées en
+    paramètres d'URL : profile, output_format, keep_original_extension,
+    omit_individual_files, omit_combined_files, build_index, compact, outline,
+    outline_threshold_kb, outline_categories, entry_points, dependency_depth,
+    dependency_max_kb, trace_rules, build_bundle, filename, profiling_token (profilage, si configuré).
+    """
+    profile_id = request.args.get("profile", "")
+    if not _is_known_profile(profile_id):
+        return jsonify(error=f"Profil d'analyse inconnu : {profile_id}."), 400
+    profile, _ = _resolve_profile(profile_id, None)
+
+    try:
+        output_format = _output_format_from_form(request.args)
+        outline = _outline_options_from_form(request.args)
+        selection = _selection_from_form(request.args)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    slot_id = _acquire_processing_slot()
+    if slot_id is None:
+        return _busy_response()
+
+    uploaded_filename = client_filename(request.args.get("filename"), "archive.tar.gz")
+    job_id = STORE.create_job("process-tar", {"filename": uploaded_filename, "profile": profile_id})
+    try:
+        profiling = _profiling_requested(request.args)
+        keep_original_extension = request.args.get("keep_original_extension") == "true"
+        options = dict(
+            max_file_size=app.config["MAX_FILE_SIZE"], output_format=output_format,
+            build_index=request.args.get("build_index") == "true", compact=request.args.get("compact") == "true",
+            outline=outline, limits=app.config["RESOURCE_LIMITS"], selection=selection,
+            trace_rules=request.args.get("trace_rules") == "true",
+            build_bundle=request.args.get("build_bundle") == "true",
+        )
+        body_path = request.environ.get(BODY_PATH_ENVIRON_KEY)
+        with _profiled(job_id, profiling) as capture:
+            if body_path is not None:
+                # Corps déjà reçu sur disque (mode asynchrone) : traité dans l'exécuteur
+                processed_stream, base_output_filename, tree_output = _run_processing(
+                    process_archive_path, body_path, uploaded_filename, keep_original_extension, profile,
+                    kind="tar", inline=profiling, **options,
+                )
+            else:
+                processed_stream, base_output_filename, tree_output = process_tar_stream(
+                    request.stream, uploaded_filename, keep_original_extension, profile, **options,
+                )
+        download_info = _with_profiling(
+            _save_output(processed_stream, base_output_filename, output_format), capture,
+        )
+    except (tarfile.TarError, ValueError) as e:
+        STORE.fail_job(job_id, str(e))
+        return jsonify(error=str(e), job_id=job_id), 400
+    except Exception as e:
+        app.logger.error(f"Erreur inattendue : {e}", exc_info=True)
+        STORE.fail_job(job_id, f"Erreur interne : {type(e).__name__}")
+        return jsonify(error="Une erreur interne est survenue.", job_id=job_id), 500
+    finally:
+        STORE.release_slot(slot_id)
+    STORE.finish_job(job_id, download_info)
+
+    return jsonify(
+        job_id=job_id, download_url=download_info["url"], filename=download_info["filename"], tree=tree_output,
+        profile=profile.profile_id,
+    )
+
+
+@app.route("/api/estimate", methods=["POST"])
+def api_estimate():
+    """
+    Estimation à blanc d'un traitement, sur une archive ZIP envoyée brute :
+    taille et tokens prévus de `__code_complet.txt` et de chaque consolidation
+    du profil, par catégorie, avec les plus gros contributeurs. Seul le
+    répertoire central est lu ; aucun membre n'est décompressé.
+
+    Paramètres d'URL : profile (auto accepté), keep_original_extension, top.
+    """
+    profile_id = request.args.get("profile", "")
+    if not _is_known_profile(profile_id):
+        return jsonify(error=f"Profil d'analyse inconnu : {profile_id}."), 400
+    archive_bytes = request.get_data()
+    try:
+        profile, detection = _resolve_profile(profile_id, archive_bytes)
+        estimate = estimate_zip(
+            archive_bytes, profile, request.args.get("keep_original_extension") == "true",
+            max_file_size=app.config["MAX_FILE_SIZE"],
+            top=min(request.args.get("top", DEFAULT_TOP_CONTRIBUTORS, type=int), 100),
+        )
+    except (zipfile.BadZipFile, ValueError) as e:
+        return jsonify(error=str(e)), 400
+    result = estimate.to_dict()
+    if detection is not None:
+        result["detection"] = detection.summary_line()
+    return jsonify(result)
+
+
+@app.route("/api/uploads", methods=["POST"])
+def api_initiate_upload():
+    """
+    Ouvre un téléversement par morceaux, pour les archives qui dépassent la
+    taille d'une requête ou les connexions instables.
+
+    Corps JSON : `filename`, `size` (octets), `chunk_size` (facultatif). Le
+    client envoie ensuite chaque morceau (PUT .../chunks/<index>, en-tête
+    `X-Chunk-SHA256`), peut consulter les plages reçues (GET) pour reprendre
+    après une coupure, puis finalise (POST .../finalize).
+    """
+    payload = request.get_json(silent=True) or {}
+    filename = client_filename(str(payload.get("filename") or ""), "")
+    if not allowed_file(filename):
+        return jsonify(error="Type de fichier non autorisé (ZIP ou TAR attendu)."), 400
+    try:
+        total_size = int(payload.get("size") or 0)
+        chunk_size = int(payload.get("chunk_size") or DEFAULT_CHUNK_SIZE)
+    except (TypeError, ValueError):
+        return jsonify(error="Tailles invalides."), 400
+    if total_size > app.config["MAX_UPLOAD_SIZE"]:
+        return jsonify(error=f"Archive trop volumineuse (limite : {app.config['MAX_UPLOAD_SIZE']} octets)."), 413
+    if chunk_size > app.config["MAX_CONTENT_LENGTH"]:
+        return jsonify(error=f"Morceaux trop grands (limite : {app.config['MAX_CONTENT_LENGTH']} octets)."), 400
+    try:
+        session = UPLOADS.initiate(filename, total_size, chunk_size)
+    except UploadError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(UPLOADS.status(session)), 201
+
+
+def _upload_session_or_404(upload_id: str) -> UploadSession:
+    session = UPLOADS.session(upload_id)
+    if session is None:
+        abort(404, description=f"Téléversement inconnu ou expiré : {upload_id}.")
+    return session
+
+
+@app.route("/api/uploads/<upload_id>", methods=["GET"])
+def api_upload_status(upload_id: str):
+    """Plages d'octets reçues et morceaux manquants : de quoi reprendre un envoi interrompu."""
+    return jsonify(UPLOADS.status(_upload_session_or_404(upload_id)))
+
+
+@app.route("/api/uploads/<upload_id>", methods=["DELETE"])
+def api_abort_upload(upload_id: str):
+    UPLOADS.discard(_upload_session_or_404(upload_id).upload_id)
+    return "", 204
+
+
+@app.route("/api/uploads/<upload_id>/chunks/<int:chunk_index>", methods=["PUT"])
+def api_upload_chunk(upload_id: str, chunk_index: int):
+    """Reçoit un morceau (corps brut), écrit directement à sa place dans le fichier."""
+    session = _upload_session_or_404(upload_id)
+    sha256 = request.headers.get("X-Chunk-SHA256", "")
+    if not sha256:
+        return jsonify(error="En-tête X-Chunk-SHA256 requis."), 400
+    try:
+        UPLOADS.write_chunk(session, chunk_index, request.stream, sha256)
+    except UploadError as e:
+        return jsonify(error=str(e), **UPLOADS.status(session)), 400
+    return jsonify(UPLOADS.status(session))
+
+
+def _process_archive_file(
+    archive_path: str,
+    uploaded_filename: str,
+    profile_id: str,
+    args,
+    output_format: OutputFormat,
+    outline: OutlineOptions | None,
+    selection: DependencySelection | None,
+    inline: bool = False,
+) -> tuple[dict[str, object], str]:
+    """Traite une archive déjà sur disque (ZIP projeté en mémoire, TAR lu en flux), via l'exécuteur."""
+    limits = app.config["RESOURCE_LIMITS"]
+    options = dict(
+        max_file_size=app.config["MAX_FILE_SIZE"], output_format=output_format,
+        build_index=args.get("build_index") == "true", compact=args.get("compact") == "true",
+        outline=outline, limits=limits, selection=selection, trace_rules=args.get("trace_rules") == "true",
+        build_bundle=args.get("build_bundle") == "true",
+    )
+    if archive_kind(uploaded_filename) == "tar":
+        profile, _ = _resolve_profile(profile_id, None)
+    else:
+        with open(archive_path, "rb") as f:
+            if limits is not None:
+                check_zip_archive(f, limits)
+            profile, _ = _resolve_profile(profile_id, f)
+    processed_stream, base_output_filename, tree_output = _run_processing(
+        process_archive_path, archive_path, uploaded_filename, args.get("keep_original_extension") == "true",
+        profile, inline=inline, **options,
+    )
+    return _save_output(processed_stream, base_output_filename, output_format), tree_output
+
+
+@app.route("/api/uploads/<upload_id>/finalize", methods=["POST"])
+def api_finalize_upload(upload_id: str):
+    """
+    Vérifie que l'archive est complète (et son empreinte `sha256` si fournie)
+    puis la traite. Mêmes paramètres d'URL que /api/process-tar ; avec
+    `background=true`, répond aussitôt 202 et le résultat se consulte via
+    /api/jobs/<job_id>. Le téléversement est supprimé une fois traité.
+    """
+    session = _upload_session_or_404(upload_id)
+    profile_id = request.args.get("profile", "")
+    if not _is_known_profile(profile_id):
+        return jsonify(error=f"Profil d'analyse inconnu : {profile_id}."), 400
+    try:
+        output_format = _output_format_from_form(request.args)
+        outline = _outline_options_from_form(request.args)
+        selection = _selection_from_form(request.args)
+        archive_path = UPLOADS.assemble(session, request.args.get("sha256"))
+    except UploadError as e:
+        return jsonify(error=str(e), **UPLOADS.status(session)), 400
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    slot_id = _acquire_processing_slot()
+    if slot_id is None:
+        return _busy_response()
+    job_id = STORE.create_job("chunked-upload", {"filename": session.filename, "profile": profile_id})
+    args = request.args.to_dict()
+    profiling = _profiling_requested(request.args)
+
+    def run() -> tuple[dict[str, object], str] | None:
+        try:
+            with _profiled(job_id, profiling) as capture:
+                download_info, tree_output = _process_archive_file(
+                    archive_path, session.filename, profile_id, args, output_format, outline, selection,
+                    inline=profiling,
+                )
+            download_info = _with_profiling(download_info, capture)
+        except (zipfile.BadZipFile, ValueError) as e:
+            STORE.fail_job(job_id, str(e))
+            return None
+        except Exception as e:
+            app.logger.error(f"Erreur inattendue : {e}", exc_info=True)
+            STORE.fail_job(job_id, f"Erreur interne : {type(e).__name__}")
+            return None
+        finally:
+            STORE.release_slot(slot_id)
+            UPLOADS.discard(session.upload_id)
+        STORE.finish_job(job_id, download_info)
+        return download_info, tree_output
+
+    if request.args.get("background") == "true":
+        threading.Thread(target=copy_current_request_context(run), daemon=True).start()
+        return jsonify(job_id=job_id, status_url=url_for("api_job", job_id=job_id)), 202
+
+    result = run()
+    if result is None:
+        return jsonify(error=STORE.get_job(job_id)["error"], job_id=job_id), 400
+    download_info, tree_output = result
+    return jsonify(
+        job_id=job_id, download_url=download_info["url"], filename=download_info["filename"], tree=tree_output,
+    )
+
+
+@app.route("/api/jobs/<job_id>")
+def api_job(job_id: str):
+    """État d'un traitement, servi par n'importe quel worker (état partagé)."""
+    job = STORE.get_job(job_id)
+    if job is None:
+        return jsonify(error=f"Tâche inconnue : {job_id}."), 404
+    return jsonify(job)
+
+
+def _index_path_for(server_filename: str) -> str:
+    """
+    Chemin de l'index extrait d'une archive produite, extrait au premier appel
+    (ou si l'archive est plus récente que l'extraction précédente).
+    """
+    archive_path = safe_join(app.config["DOWNLOAD_FOLDER"], server_filename)
+    if archive_path is None or not os.path.isfile(archive_path):
+        abort(404)
+    index_path = os.path.join(app.config["INDEX_CACHE_FOLDER"], server_filename.replace("/", "_") + ".sqlite")
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(archive_path):
+        if not extract_index_from_archive(archive_path, index_path):
+            abort(404, description="Cette archive ne contient pas d'index (__index.sqlite).")
+    return index_path
+
+
+@app.route("/api/search/<path:server_filename>")
+def api_search(server_filename: str):
+    """
+    Interroge l'index d'une archive produite avec l'option d'indexation.
+
+    Paramètres d'URL : `q` (recherche plein texte, tous les termes) et/ou
+    `symbol` (définition par nom exact, ou préfixe avec `*`), `limit`.
+    """
+    query = request.args.get("q", "")
+    symbol = request.args.get("symbol", "")
+    if not query and not symbol:
+        return jsonify(error="Paramètre 'q' ou 'symbol' requis."), 400
+    limit = min(request.args.get("limit", 20, type=int), 200)
+
+    index_path = _index_path_for(server_filename)
+    result: dict[str, list] = {}
+    if query:
+        result["matches"] = search_index(index_path, query, limit)
+    if symbol:
+        result["symbols"] = find_symbols(index_path, symbol, limit)
+    return jsonify(result)
+
+
+def _immutable(response):
+    """Cache de longue durée : un nom serveur désigne toujours le même contenu."""
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 
 @app.route("/download/<path:server_filename>")
 def download_file(server_filename: str):
-    """Route pour le téléchargement des fichiers traités."""
+    """
+    Route pour le téléchargement des fichiers traités.
+
+    ETag fort tiré du contenu (réponse 304 sur If-None-Match), requêtes
+    partielles (Range) pour reprendre un téléchargement interrompu.
+    """
     user_filename = request.args.get('user_filename', server_filename)
-    return send_from_directory(
+    manifest = load_manifest(_members_folder(server_filename))
+    response = send_from_directory(
         app.config["DOWNLOAD_FOLDER"],
         server_filename,
         as_attachment=True,
-        download_name=user_filename
+        download_name=user_filename,
+        etag=manifest["etag"] if manifest else True,
+        max_age=app.config["DOWNLOAD_MAX_AGE"],
+        conditional=True,
+    )
+    return _immutable(response)
+
+
+@app.route("/download-member/<server_filename>/<member_name>")
+def download_member(server_filename: str, member_name: str):
+    """
+    Un seul fichier texte d'une sortie (`__code_complet.txt`,
+    `__arborescence.txt`...), sans télécharger l'archive entière.
+
+    La variante précompressée à l'écriture est choisie selon Accept-Encoding
+    (brotli, puis gzip, sinon le texte brut) ; ETag propre à chaque variante,
+    304 conditionnels et Range comme pour l'archive.
+    """
+    members_folder = _members_folder(server_filename)
+    manifest = load_manifest(members_folder)
+    if manifest is None or member_name not in manifest["members"]:
+        abort(404, description=f"Membre inconnu pour cette sortie : {member_name}.")
+    member = manifest["members"][member_name]
+    encoding = request.accept_encodings.best_match(list(member["encodings"]), default=None)
+    suffix = ENCODING_SUFFIXES[encoding] if encoding else ""
+    path = safe_join(members_folder, member_name + suffix)
+    if path is None:
+        abort(404)
+    response = send_file(
+        path,
+        mimetype="text/plain",
+        etag=f"{member['etag']}-{encoding}" if encoding else member["etag"],
+        max_age=app.config["DOWNLOAD_MAX_AGE"],
+        conditional=True,
+        download_name=member_name,
     )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return _immutable(response)
+
+
+@app.route("/api/jobs/<job_id>/members")
+def api_job_members(job_id: str):
+    """Membres texte téléchargeables individuellement d'un traitement terminé."""
+    job = STORE.get_job(job_id)
+    if job is None:
+        return jsonify(error=f"Tâche inconnue : {job_id}."), 404
+    if job["status"] != "done":
+        return jsonify(error="Traitement non terminé.", status=job["status"]), 409
+    download_info = _download_info(job["result"]["server_filename"], job["result"]["filename"])
+    return jsonify(members=download_info["members"])
+
+
+@app.route("/api/jobs/<job_id>/profiling/<kind>")
+def api_job_profiling(job_id: str, kind: str):
+    """
+    Capture de profilage d'un traitement : `pstats` (cProfile, pour pstats ou
+    snakeviz) ou `folded` (piles agrégées, pour flamegraph.pl ou speedscope).
+    Protégée par le même jeton que la demande de profilage.
+    """
+    if not _profiling_requested(request.args):
+        abort(403)
+    suffixes = {"pstats": PSTATS_SUFFIX, "folded": FOLDED_SUFFIX}
+    if kind not in suffixes:
+        abort(404)
+    path = safe_join(app.config["PROFILING_FOLDER"], job_id + suffixes[kind])
+    if path is None or not os.path.isfile(path):
+        abort(404, description="Aucune capture de profilage pour ce traitement (ou capture supprimée par rotation).")
+    return send_file(path, as_attachment=True, download_name=os.path.basename(path))
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,292 @@
+# asgi.py
+# [Version 1.0]
+
+# Mode de service asynchrone : application ASGI autour de l'application Flask,
+# pour un serveur ASGI (uvicorn asgi:application, hypercorn asgi:application).
+#
+# - Le corps des requêtes est reçu par la boucle d'événements (sur disque
+#   au-delà de BODY_SPOOL_SIZE) : un client lent n'occupe aucun thread.
+# - Les vues Flask s'exécutent ensuite dans un pool de threads, une fois le
+#   corps complet, et les traitements (pipeline) dans un pool de processus :
+#   le travail CPU ne bloque jamais la boucle.
+# - Les fichiers servis (send_file : téléchargements, membres, Range) sont
+#   transmis par la boucle, par blocs : le thread est libéré dès les en-têtes.
+
+from __future__ import annotations
+
+import asyncio
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO
+
+from app import BODY_PATH_ENVIRON_KEY, app as flask_app
+
+# Au-delà de cette taille, le corps reçu est écrit dans un fichier temporaire.
+BODY_SPOOL_SIZE: int = 1024 * 1024
+FILE_CHUNK_SIZE: int = 256 * 1024
+# Vues Flask exécutées simultanément (la plupart attendent un traitement ou la base partagée)
+DEFAULT_VIEW_THREADS: int = 32
+
+Scope = dict
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+class _ClientDisconnected(Exception):
+    pass
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class FileResponseBody:
+    """
+    `wsgi.file_wrapper` : marque un corps de réponse issu d'un fichier, que
+    le serveur transmet lui-même de façon asynchrone. Reste itérable (lecture
+    synchrone) pour tout intermédiaire qui l'itérerait.
+    """
+
+    def __init__(self, file: BinaryIO, block_size: int = FILE_CHUNK_SIZE) -> None:
+        self.file = file
+        self.block_size = block_size
+
+    def __iter__(self) -> FileResponseBody:
+        return self
+
+    def __next__(self) -> bytes:
+        data = self.file.read(self.block_size)
+        if not data:
+            raise StopIteration
+        return data
+
+    def seekable(self) -> bool:
+        return self.file.seekable()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self.file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _file_body(iterable: Iterable[bytes]) -> tuple[FileResponseBody, int, int | None] | None:
+    """(fichier, début, longueur) d'un corps servi depuis un fichier, éventuellement restreint à une plage (Range)."""
+    if isinstance(iterable, FileResponseBody):
+        return iterable, 0, None
+    # Requête partielle : werkzeug enveloppe le corps dans un _RangeWrapper (iterable, start_byte, byte_range)
+    inner = getattr(iterable, "iterable", None)
+    if isinstance(inner, FileResponseBody) and hasattr(iterable, "start_byte"):
+        return inner, iterable.start_byte, iterable.byte_range
+    return None
+
+
+def _wsgi_environ(scope: Scope, body: BinaryIO, body_length: int, body_path: str | None) -> dict:
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        # WSGI attend les octets du chemin décodés en latin-1
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": scope["client"][0] if scope.get("client") else "",
+        "CONTENT_LENGTH": str(body_length),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": body,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+        "wsgi.file_wrapper": FileResponseBody,
+    }
+    if body_path is not None:
+        environ[BODY_PATH_ENVIRON_KEY] = body_path
+    for raw_name, raw_value in scope.get("headers", ()):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_LENGTH":
+            continue  # Longueur réelle du corps reçu
+        key = "CONTENT_TYPE" if name == "CONTENT_TYPE" else f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class AsyncServer:
+    """
+    Application ASGI servant une application WSGI (Flask) : réception des
+    corps et envoi des fichiers dans la boucle d'événements, vues dans un pool
+    de threads, traitements dans un pool de processus (installé comme
+    `PROCESSING_EXECUTOR` de l'application).
+    """
+
+    def __init__(self, wsgi_app, view_threads: int = DEFAULT_VIEW_THREADS, processes: int | None = None) -> None:
+        self.wsgi_app = wsgi_app
+        self.view_threads = view_threads
+        self.processes = processes or wsgi_app.config["ADMISSION_CAPACITY"]
+        self._views: ThreadPoolExecutor | None = None
+        self._processing: ProcessPoolExecutor | None = None
+
+    def startup(self) -> None:
+        if self._views is not None:
+            return
+        self._views = ThreadPoolExecutor(self.view_threads, thread_name_prefix="view")
+        # "spawn" : pas de fork d'un processus qui a déjà des threads
+        self._processing = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+        self.wsgi_app.config["PROCESSING_EXECUTOR"] = self._processing
+
+    def shutdown(self) -> None:
+        if self._views is None:
+            return
+        self.wsgi_app.config["PROCESSING_EXECUTOR"] = None
+        self._views.shutdown(wait=True)
+        self._processing.shutdown(wait=True)
+        self._views = self._processing = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            self.startup()  # Serveurs sans événements lifespan
+            await self._http(scope, receive, send)
+        else:
+            raise RuntimeError(f"Type de connexion non pris en charge : {scope['type']}.")
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await asyncio.get_running_loop().run_in_executor(None, self.shutdown)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _receive_body(self, receive: Receive, limit: int | None) -> tuple[BinaryIO, int, str | None]:
+        """Corps complet de la requête : en mémoire, puis dans un fichier temporaire au-delà de BODY_SPOOL_SIZE."""
+        body: BinaryIO = io.BytesIO()
+        body_path = None
+        size = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    raise _ClientDisconnected()
+                chunk = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                size += len(chunk)
+                if limit is not None and size > limit:
+                    raise _BodyTooLarge()
+                if body_path is None and size > BODY_SPOOL_SIZE:
+                    spooled = tempfile.NamedTemporaryFile(prefix="codetotext-body-", delete=False)
+                    spooled.write(body.getbuffer())
+                    body, body_path = spooled, spooled.name
+                body.write(chunk)
+        except BaseException:
+            _discard_body(body, body_path)
+            raise
+        body.flush()
+        body.seek(0)
+        return body, size, body_path
+
+    def _call_view(self, environ: dict) -> tuple[int, list[tuple[bytes, bytes]], list[bytes] | None, tuple | None]:
+        """Exécute la vue (dans un thread du pool) ; un corps non fichier est entièrement produit ici."""
+        response: dict = {}
+
+        def start_response(status: str, headers: list[tuple[str, str]], exc_info=None):
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+            return response.setdefault("written", []).append
+
+        iterable = self.wsgi_app(environ, start_response)
+        file_body = _file_body(iterable)
+        if file_body is not None:
+            return response["status"], response["headers"], None, file_body
+        try:
+            chunks = response.get("written", []) + [chunk for chunk in iterable if chunk]
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+        return response["status"], response["headers"], chunks, None
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            body, body_length, body_path = await self._receive_body(
+                receive, self.wsgi_app.config.get("MAX_CONTENT_LENGTH"),
+            )
+        except _ClientDisconnected:
+            return
+        except _BodyTooLarge:
+            await _send_simple(send, 413, "Corps de requête trop volumineux.".encode("utf-8"))
+            return
+
+        try:
+            environ = _wsgi_environ(scope, body, body_length, body_path)
+            status, headers, chunks, file_body = await loop.run_in_executor(self._views, self._call_view, environ)
+        finally:
+            _discard_body(body, body_path)
+
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        if file_body is None:
+            await send({"type": "http.response.body", "body": b"".join(chunks)})
+            return
+        file_wrapper, start, length = file_body
+        try:
+            await self._send_file(send, file_wrapper.file, start, length)
+        finally:
+            file_wrapper.close()
+
+    async def _send_file(self, send: Send, file: BinaryIO, start: int, length: int | None) -> None:
+        """Transmet le fichier par blocs ; les lectures disque passent par l'exécuteur par défaut."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, file.seek, start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            size = FILE_CHUNK_SIZE if remaining is None else min(FILE_CHUNK_SIZE, remaining)
+            chunk = await loop.run_in_executor(None, file.read, size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            # Le serveur ASGI n'achève `send` qu'une fois le tampon du client vidé : contre-pression
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _discard_body(body: BinaryIO, body_path: str | None) -> None:
+    body.close()
+    if body_path is not None:
+        try:
+            os.remove(body_path)
+        except FileNotFoundError:
+            pass
+
+
+async def _send_simple(send: Send, status: int, message: bytes) -> None:
+    await send({
+        "type": "http.response.start", "status": status,
+        "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(message)).encode())],
+    })
+    await send({"type": "http.response.body", "body": message})
+
+
+application = AsyncServer(flask_app)
+
+if __name__ == "__main__":
+    import uvicorn  # Serveur ASGI facultatif : pip install uvicorn
+
+    uvicorn.run("asgi:application", host="0.0.0.0", port=5000)
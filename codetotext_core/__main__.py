@@ -0,0 +1,8 @@
+# codetotext_core/__main__.py
+# [Version 1.0]
+
+import sys
+
+from codetotext_core.cli import main
+
+sys.exit(main())
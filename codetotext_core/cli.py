@@ -0,0 +1,433 @@
+# codetotext_core/cli.py
+# [Version 1.15]
+
+# Point d'entrée en ligne de commande : python -m codetotext_core <commande>
+# Les imports lourds sont faits dans chaque commande pour garder un démarrage
+# à froid minimal (Flask n'est jamais importé par la CLI).
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import TYPE_CHECKING, BinaryIO
+
+if TYPE_CHECKING:
+    from codetotext_core.profiles.base import AnalysisProfile
+
+# Budgets de temps d'import à froid (en millisecondes), vérifiés par `startup-budget`
+# (exécutée par tests/test_startup.py).
+IMPORT_TIME_BUDGETS_MS: dict[str, float] = {
+    "codetotext_core.cli": 50.0,
+    "app": 400.0,
+}
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cmd_profiles(args: argparse.Namespace) -> int:
+    from codetotext_core.profiles.detection import AUTO_PROFILE_ID, AUTO_PROFILE_NAME
+    from codetotext_core.profiles.registry import PROFILES
+
+    print(f"{AUTO_PROFILE_ID}\t{AUTO_PROFILE_NAME}")
+    for descriptor in PROFILES.descriptors():
+        print(f"{descriptor.profile_id}\t{descriptor.profile_name}")
+    return 0
+
+
+def _resolve_profile(
+    profile_id: str, paths: list[str] | None = None, zip_source: BinaryIO | None = None
+) -> AnalysisProfile:
+    """Profil demandé, ou détecté (`auto`) sur les chemins d'un dossier ou d'une archive ZIP."""
+    from codetotext_core.profiles.detection import (
+        AUTO_PROFILE_ID,
+        FALLBACK_PROFILE_ID,
+        detect_profile,
+        detect_zip_profile,
+    )
+    from codetotext_core.profiles.registry import PROFILES
+
+    if profile_id != AUTO_PROFILE_ID:
+        return PROFILES[profile_id]
+    if zip_source is not None:
+        detection = detect_zip_profile(zip_source, PROFILES)
+    elif paths is not None:
+        detection = detect_profile(paths, PROFILES)
+    else:
+        print(f"Détection impossible sur un flux TAR : profil « {FALLBACK_PROFILE_ID} ».", file=sys.stderr)
+        return PROFILES[FALLBACK_PROFILE_ID]
+    print(detection.summary_line(), file=sys.stderr)
+    return PROFILES[detection.profile_id]
+
+
+def _is_known_profile(profile_id: str) -> bool:
+    from codetotext_core.profiles.detection import AUTO_PROFILE_ID
+    from codetotext_core.profiles.registry import PROFILES
+
+    return profile_id == AUTO_PROFILE_ID or profile_id in PROFILES
+
+
+def _cmd_flatten(args: argparse.Namespace) -> int:
+    import dataclasses
+
+    from codetotext_core.processing.dependency_graph import DependencySelection
+    from codetotext_core.processing.outline import OutlineOptions
+    from codetotext_core.processing.output_writer import OUTPUT_FORMAT_PRESETS
+    from codetotext_core.processing.parallel_deflate import DEFAULT_DEFLATE_WORKERS
+    from codetotext_core.processing.pipeline import archive_kind, process_tar_stream, process_zip_file
+    from codetotext_core.processing.resource_budget import DEFAULT_RESOURCE_LIMITS, BudgetExceeded, check_zip_archive
+    from codetotext_core.utils.file_utils import generate_zip_tree
+
+    if not _is_known_profile(args.profile):
+        print(f"Profil d'analyse inconnu : {args.profile}.", file=sys.stderr)
+        return 2
+    if args.output_format not in OUTPUT_FORMAT_PRESETS:
+        print(f"Format de sortie inconnu : {args.output_format}.", file=sys.stderr)
+        return 2
+    output_format = dataclasses.replace(
+        OUTPUT_FORMAT_PRESETS[args.output_format][1],
+        include_individual_files=not args.omit_individual_files,
+        include_combined_files=not args.omit_combined_files,
+        deflate_workers=args.deflate_workers or DEFAULT_DEFLATE_WORKERS,
+    )
+    outline = None
+    if args.outline:
+        outline = OutlineOptions(
+            size_threshold=args.outline_threshold,
+            categories=frozenset(args.outline_categories.split(",")) if args.outline_categories else frozenset(),
+        )
+    selection = None
+    if args.entry:
+        selection = DependencySelection(tuple(args.entry), args.depth, args.max_bytes)
+    limits = None if args.no_limits else DEFAULT_RESOURCE_LIMITS
+
+    with open(args.archive, "rb") as f:
+        try:
+            if archive_kind(args.archive) == "tar":
+                output_stream, base_output_filename, _ = process_tar_stream(
+                    f, os.path.basename(args.archive), args.keep_original_extension,
+                    _resolve_profile(args.profile), max_file_size=args.max_file_size, output_format=output_format,
+                    build_index=args.index, compact=args.compact, outline=outline, limits=limits,
+                    selection=selection, trace_rules=args.trace_rules, build_bundle=args.bundle,
+                )
+            else:
+                if limits is not None:
+                    check_zip_archive(f, limits)
+                profile = _resolve_profile(args.profile, zip_source=f)
+                tree_output = generate_zip_tree(f)
+                f.seek(0)
+                output_stream, base_output_filename = process_zip_file(
+                    f, os.path.basename(args.archive), args.keep_original_extension, tree_output,
+                    profile, max_file_size=args.max_file_size, output_format=output_format,
+                    build_index=args.index, compact=args.compact, outline=outline, limits=limits,
+                    selection=selection, trace_rules=args.trace_rules, build_bundle=args.bundle,
+                )
+        except BudgetExceeded as e:
+            print(f"{e} (--no-limits pour lever les limites)", file=sys.stderr)
+            return 1
+
+    output_path = args.output or os.path.join(os.path.dirname(os.path.abspath(args.archive)), base_output_filename)
+    with open(output_path, "wb") as f:
+        f.write(output_stream.getbuffer())
+    print(output_path)
+    return 0
+
+
+def _cmd_diff(args: argparse.Namespace) -> int:
+    import dataclasses
+
+    from codetotext_core.processing.diff_mode import process_zip_diff
+    from codetotext_core.processing.output_writer import OUTPUT_FORMAT_PRESETS
+    from codetotext_core.processing.parallel_deflate import DEFAULT_DEFLATE_WORKERS
+    from codetotext_core.processing.resource_budget import DEFAULT_RESOURCE_LIMITS
+
+    if not _is_known_profile(args.profile):
+        print(f"Profil d'analyse inconnu : {args.profile}.", file=sys.stderr)
+        return 2
+    if args.output_format not in OUTPUT_FORMAT_PRESETS:
+        print(f"Format de sortie inconnu : {args.output_format}.", file=sys.stderr)
+        return 2
+
+    with open(args.baseline, "rb") as baseline, open(args.archive, "rb") as current:
+        try:
+            output_stream, base_output_filename, archive_diff = process_zip_diff(
+                baseline, current, os.path.basename(args.archive), args.keep_original_extension,
+                _resolve_profile(args.profile, zip_source=current), max_file_size=args.max_file_size,
+                output_format=dataclasses.replace(
+                    OUTPUT_FORMAT_PRESETS[args.output_format][1],
+                    deflate_workers=args.deflate_workers or DEFAULT_DEFLATE_WORKERS,
+                ),
+                limits=None if args.no_limits else DEFAULT_RESOURCE_LIMITS,
+            )
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+
+    output_path = args.output or os.path.join(os.path.dirname(os.path.abspath(args.archive)), base_output_filename)
+    with open(output_path, "wb") as f:
+        f.write(output_stream.getbuffer())
+    print(archive_diff.summary_line(), file=sys.stderr)
+    print(output_path)
+    return 0
+
+
+def _cmd_estimate(args: argparse.Namespace) -> int:
+    import json
+    import zipfile
+
+    from codetotext_core.processing.estimate import estimate_zip
+
+    if not _is_known_profile(args.profile):
+        print(f"Profil d'analyse inconnu : {args.profile}.", file=sys.stderr)
+        return 2
+    with open(args.archive, "rb") as f:
+        try:
+            estimate = estimate_zip(
+                f, _resolve_profile(args.profile, zip_source=f), args.keep_original_extension,
+                max_file_size=args.max_file_size, top=args.top,
+            )
+        except (zipfile.BadZipFile, ValueError) as e:
+            print(str(e), file=sys.stderr)
+            return 1
+    if args.json:
+        print(json.dumps(estimate.to_dict(), ensure_ascii=False, indent=2))
+    else:
+        print("\n".join(estimate.summary_lines()))
+    return 0
+
+
+def _cmd_watch(args: argparse.Namespace) -> int:
+    from codetotext_core.processing.outline import OutlineOptions
+    from codetotext_core.processing.watch_mode import DirectoryFlattener, watch_directory
+    from codetotext_core.profiles.detection import AUTO_PROFILE_ID, FALLBACK_PROFILE_ID
+    from codetotext_core.profiles.registry import PROFILES
+
+    if not _is_known_profile(args.profile):
+        print(f"Profil d'analyse inconnu : {args.profile}.", file=sys.stderr)
+        return 2
+    if not os.path.isdir(args.directory):
+        print(f"Dossier introuvable : {args.directory}.", file=sys.stderr)
+        return 2
+    outline = None
+    if args.outline:
+        outline = OutlineOptions(
+            size_threshold=args.outline_threshold,
+            categories=frozenset(args.outline_categories.split(",")) if args.outline_categories else frozenset(),
+        )
+    source_dir = os.path.abspath(args.directory)
+    output_dir = args.output or f"{source_dir}_flat"
+    if args.profile == AUTO_PROFILE_ID:
+        # Détection sur les chemins du dossier, parcouru avec les exclusions du profil de repli
+        paths = list(DirectoryFlattener(source_dir, output_dir, PROFILES[FALLBACK_PROFILE_ID]).scan())
+        profile = _resolve_profile(args.profile, paths=paths)
+    else:
+        profile = PROFILES[args.profile]
+    flattener = DirectoryFlattener(
+        source_dir, output_dir, profile, args.keep_original_extension, args.max_file_size, outline,
+    )
+    print(f"Surveillance de {source_dir} -> {os.path.abspath(output_dir)} (Ctrl+C pour arrêter)", file=sys.stderr)
+    try:
+        watch_directory(
+            flattener, lambda update: print(update.summary_line(), file=sys.stderr),
+            poll_interval=args.interval, debounce=args.debounce,
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cmd_search(args: argparse.Namespace) -> int:
+    import tempfile
+
+    from codetotext_core.processing.code_index import extract_index_from_archive, find_symbols, search_index
+
+    if not args.query and not args.symbol:
+        print("Indiquez un texte à rechercher ou --symbol.", file=sys.stderr)
+        return 2
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_path = os.path.join(tmp_dir, "index.sqlite")
+        if not extract_index_from_archive(args.archive, index_path):
+            print("Cette archive ne contient pas d'index (__index.sqlite).", file=sys.stderr)
+            return 1
+        if args.symbol:
+            for symbol in find_symbols(index_path, args.symbol, args.limit):
+                print(f"{symbol['path']}:{symbol['line']}\t{symbol['kind']}\t{symbol['signature']}")
+        if args.query:
+            for match in search_index(index_path, args.query, args.limit):
+                print(f"{match['path']}\t{match['snippet']}")
+    return 0
+
+
+def _cmd_bundle(args: argparse.Namespace) -> int:
+    import tempfile
+
+    from codetotext_core.processing.bundle import open_bundle
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            bundle = open_bundle(args.archive, tmp_dir)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        with bundle:
+            if args.category:
+                for entry, _ in bundle.category(args.category):
+                    print(f"{entry.path}\t{entry.language}\t{entry.length}")
+            elif args.path:
+                try:
+                    sys.stdout.write(bundle.read_text(args.path))
+                except KeyError:
+                    print(f"Fichier absent du bundle : {args.path}", file=sys.stderr)
+                    return 1
+            else:
+                for entry in bundle.entries:
+                    print(f"{entry.path}\t{entry.language}\t{entry.length}\t{','.join(entry.categories)}")
+    return 0
+
+
+def measure_import_time(module_name: str) -> float:
+    """Mesure, dans un interpréteur neuf, le temps d'import à froid d'un module (en ms)."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module_name}; "
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=_PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _cmd_startup_budget(args: argparse.Namespace) -> int:
+    exit_code = 0
+    for module_name, budget_ms in IMPORT_TIME_BUDGETS_MS.items():
+        # Meilleure de plusieurs mesures, pour lisser le bruit de la machine
+        elapsed_ms = min(measure_import_time(module_name) for _ in range(args.runs))
+        status = "OK" if elapsed_ms <= budget_ms else "DÉPASSÉ"
+        print(f"{module_name:<24} {elapsed_ms:8.1f} ms / budget {budget_ms:.0f} ms  {status}")
+        if elapsed_ms > budget_ms:
+            exit_code = 1
+    return exit_code
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from codetotext_core.processing.content_sniffing import DEFAULT_MAX_FILE_SIZE
+    from codetotext_core.processing.outline import DEFAULT_OUTLINE_CATEGORIES, DEFAULT_OUTLINE_THRESHOLD
+
+    parser = argparse.ArgumentParser(prog="codetotext", description="Aplatit une archive de projet en fichiers texte.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    profiles_parser = subparsers.add_parser("profiles", help="Liste les profils d'analyse disponibles.")
+    profiles_parser.set_defaults(handler=_cmd_profiles)
+
+    flatten_parser = subparsers.add_parser("flatten", help="Traite une archive ZIP ou TAR avec un profil.")
+    flatten_parser.add_argument("archive", help="Chemin de l'archive ZIP ou TAR (.tar, .tar.gz, ...) à traiter.")
+    flatten_parser.add_argument("-p", "--profile", default="complet", help="Identifiant du profil d'analyse (auto : détection).")
+    flatten_parser.add_argument("-o", "--output", help="Chemin de l'archive de sortie.")
+    flatten_parser.add_argument("--keep-original-extension", action="store_true")
+    flatten_parser.add_argument("--max-file-size", type=int, default=DEFAULT_MAX_FILE_SIZE)
+    flatten_parser.add_argument("--output-format", default="zip", help="Préréglage de format (zip, zip_max, tar_xz, ...).")
+    flatten_parser.add_argument(
+        "--deflate-workers", type=int, help="Threads de compression des gros membres ZIP (défaut : min(4, processeurs)).",
+    )
+    flatten_parser.add_argument("--omit-individual-files", action="store_true")
+    flatten_parser.add_argument("--omit-combined-files", action="store_true")
+    flatten_parser.add_argument("--index", action="store_true", help="Ajoute __index.sqlite (texte intégral et symboles).")
+    flatten_parser.add_argument(
+        "--compact", action="store_true", help="Compacte le code des consolidations (commentaires, lignes vides)."
+    )
+    flatten_parser.add_argument(
+        "--outline", action="store_true", help="Réduit à leur plan les gros fichiers et les catégories choisies."
+    )
+    flatten_parser.add_argument("--outline-threshold", type=int, default=DEFAULT_OUTLINE_THRESHOLD, help="Octets.")
+    flatten_parser.add_argument(
+        "--outline-categories", default=",".join(sorted(DEFAULT_OUTLINE_CATEGORIES)),
+        help="Catégories de profil rendues en plan, séparées par des virgules.",
+    )
+    flatten_parser.add_argument(
+        "--entry", action="append", metavar="FICHIER",
+        help="Point d'entrée de la sélection par dépendances (__code_dependances.txt), répétable.",
+    )
+    flatten_parser.add_argument("--depth", type=int, help="Profondeur maximale des imports suivis depuis les entrées.")
+    flatten_parser.add_argument("--max-bytes", type=int, help="Budget (octets) de la sélection par dépendances.")
+    flatten_parser.add_argument(
+        "--trace-rules", action="store_true",
+        help="Trace les règles du profil (déclenchements, temps, fichiers décidés) dans __rules_trace.json.",
+    )
+    flatten_parser.add_argument(
+        "--bundle", action="store_true",
+        help="Ajoute un bundle à accès direct (__bundle.dat et sa table __bundle_index.json).",
+    )
+    flatten_parser.add_argument(
+        "--no-limits", action="store_true", help="Désactive les limites de ressources (archives de confiance)."
+    )
+    flatten_parser.set_defaults(handler=_cmd_flatten)
+
+    diff_parser = subparsers.add_parser("diff", help="N'émet que les changements entre deux archives ZIP.")
+    diff_parser.add_argument("baseline", help="Archive ZIP de référence (instantané précédent).")
+    diff_parser.add_argument("archive", help="Nouvelle archive ZIP du même projet.")
+    diff_parser.add_argument("-p", "--profile", default="complet", help="Identifiant du profil d'analyse (auto : détection).")
+    diff_parser.add_argument("-o", "--output", help="Chemin de l'archive de sortie.")
+    diff_parser.add_argument("--keep-original-extension", action="store_true")
+    diff_parser.add_argument("--max-file-size", type=int, default=DEFAULT_MAX_FILE_SIZE)
+    diff_parser.add_argument("--output-format", default="zip", help="Préréglage de format (zip, zip_max, tar_xz, ...).")
+    diff_parser.add_argument(
+        "--deflate-workers", type=int, help="Threads de compression des gros membres ZIP (défaut : min(4, processeurs)).",
+    )
+    diff_parser.add_argument(
+        "--no-limits", action="store_true", help="Désactive les limites de ressources (archives de confiance)."
+    )
+    diff_parser.set_defaults(handler=_cmd_diff)
+
+    estimate_parser = subparsers.add_parser(
+        "estimate", help="Estime tailles et tokens des fichiers produits, sans décompresser l'archive ZIP."
+    )
+    estimate_parser.add_argument("archive", help="Chemin de l'archive ZIP.")
+    estimate_parser.add_argument("-p", "--profile", default="complet", help="Identifiant du profil d'analyse (auto : détection).")
+    estimate_parser.add_argument("--keep-original-extension", action="store_true")
+    estimate_parser.add_argument("--max-file-size", type=int, default=DEFAULT_MAX_FILE_SIZE)
+    estimate_parser.add_argument("--top", type=int, default=10, help="Nombre de plus gros contributeurs listés.")
+    estimate_parser.add_argument("--json", action="store_true", help="Sortie JSON (même format que /api/estimate).")
+    estimate_parser.set_defaults(handler=_cmd_estimate)
+
+    watch_parser = subparsers.add_parser(
+        "watch", help="Tient à jour la sortie aplatie d'un dossier local à chaque modification."
+    )
+    watch_parser.add_argument("directory", help="Dossier du projet à surveiller.")
+    watch_parser.add_argument("-p", "--profile", default="complet", help="Identifiant du profil d'analyse (auto : détection).")
+    watch_parser.add_argument("-o", "--output", help="Dossier de sortie (par défaut : <dossier>_flat).")
+    watch_parser.add_argument("--keep-original-extension", action="store_true")
+    watch_parser.add_argument("--max-file-size", type=int, default=DEFAULT_MAX_FILE_SIZE)
+    watch_parser.add_argument("--interval", type=float, default=0.2, help="Période de scrutation (secondes).")
+    watch_parser.add_argument("--debounce", type=float, default=0.05, help="Stabilité requise avant mise à jour (secondes).")
+    watch_parser.add_argument("--outline", action="store_true", help="Réduit à leur plan les gros fichiers.")
+    watch_parser.add_argument("--outline-threshold", type=int, default=DEFAULT_OUTLINE_THRESHOLD, help="Octets.")
+    watch_parser.add_argument("--outline-categories", default=",".join(sorted(DEFAULT_OUTLINE_CATEGORIES)))
+    watch_parser.set_defaults(handler=_cmd_watch)
+
+    search_parser = subparsers.add_parser("search", help="Interroge l'index d'une archive produite avec --index.")
+    search_parser.add_argument("archive", help="Archive de sortie contenant __index.sqlite.")
+    search_parser.add_argument("query", nargs="?", default="", help="Termes à rechercher dans le contenu.")
+    search_parser.add_argument("-s", "--symbol", help="Nom de définition (préfixe avec '*').")
+    search_parser.add_argument("--limit", type=int, default=20)
+    search_parser.set_defaults(handler=_cmd_search)
+
+    bundle_parser = subparsers.add_parser("bundle", help="Lit le bundle d'une archive produite avec --bundle.")
+    bundle_parser.add_argument("archive", help="Archive de sortie contenant __bundle.dat et __bundle_index.json.")
+    bundle_parser.add_argument("path", nargs="?", help="Fichier à afficher (sans chemin : liste des fichiers).")
+    bundle_parser.add_argument("-c", "--category", help="Liste les fichiers d'une catégorie.")
+    bundle_parser.set_defaults(handler=_cmd_bundle)
+
+    budget_parser = subparsers.add_parser(
+        "startup-budget", help="Vérifie le temps d'import à froid des points d'entrée."
+    )
+    budget_parser.add_argument("--runs", type=int, default=3)
+    budget_parser.set_defaults(handler=_cmd_startup_budget)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,128 @@
+# codetotext_core/processing/block_store.py
+# [Version 1.1]
+
+# Magasin de blocs sur disque : chaque bloc de consolidation est encodé et
+# écrit une seule fois dans un fichier temporaire ; le passage ne conserve que
+# des enregistrements (position, longueur, chemin, catégories). Les
+# consolidations sont décrites par des gabarits (texte littéral et marqueurs
+# de blocs) et assemblées en recopiant des plages du fichier (tranches mmap)
+# vers les membres de sortie, par morceaux bornés.
+
+from __future__ import annotations
+
+import mmap
+import re
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from codetotext_core.processing.output_writer import ArchiveWriter
+
+# Les profils consolident des marqueurs plutôt que des blocs : l'appartenance
+# de chaque fichier à chaque consolidation vient de la logique du profil elle-même.
+PLACEHOLDER = "\x00{}\x00"
+PLACEHOLDER_PATTERN = re.compile("\x00(\\d+)\x00")
+# Taille des morceaux transmis à l'écrivain de sortie
+COPY_CHUNK_SIZE: int = 1024 * 1024
+# Contenu qu'un passage peut garder en mémoire hors du magasin, par usage
+# (compactages en cours, originaux de la déduplication).
+MEMORY_CONTENT_LIMIT: int = 16 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class BlockRecord:
+    """Bloc d'un fichier dans le magasin : plage d'octets (UTF-8), chemin et catégories."""
+
+    index: int
+    offset: int
+    length: int
+    path: str
+    categories: set[str]
+
+    @property
+    def placeholder(self) -> str:
+        return PLACEHOLDER.format(self.index)
+
+    @property
+    def in_sans_css(self) -> bool:
+        return not self.path.lower().endswith(".css")
+
+
+class BlockStore:
+    """Blocs écrits une fois dans un fichier temporaire (supprimé à la fermeture), relus par mmap."""
+
+    def __init__(self, directory: str | None = None) -> None:
+        self._file = tempfile.TemporaryFile(prefix="codetotext-blocks-", dir=directory)
+        self._size = 0
+        self._mapping: mmap.mmap | None = None
+        self.records: list[BlockRecord] = []
+
+    def add(self, block: str, path: str, categories: set[str]) -> BlockRecord:
+        data = block.encode("utf-8")
+        self._file.write(data)
+        record = BlockRecord(len(self.records), self._size, len(data), path, categories)
+        self._size += len(data)
+        self.records.append(record)
+        return record
+
+    def _view(self) -> mmap.mmap:
+        """Projection du fichier, refaite si des blocs ont été ajoutés depuis."""
+        if self._mapping is None or len(self._mapping) < self._size:
+            if self._mapping is not None:
+                self._mapping.close()
+            self._file.flush()
+            self._mapping = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+        return self._mapping
+
+    def read(self, record: BlockRecord) -> bytes:
+        if not record.length:
+            return b""
+        return self._view()[record.offset:record.offset + record.length]
+
+    def read_text(self, record: BlockRecord) -> str:
+        return self.read(record).decode("utf-8")
+
+    def segments(self, template: str) -> tuple[list[bytes | BlockRecord], int]:
+        """Découpe un gabarit en texte littéral (encodé) et blocs ; retourne aussi la taille assemblée."""
+        segments: list[bytes | BlockRecord] = []
+        size = 0
+        for position, part in enumerate(PLACEHOLDER_PATTERN.split(template)):
+            if position % 2:
+                record = self.records[int(part)]
+                segments.append(record)
+                size += record.length
+            elif part:
+                data = part.encode("utf-8")
+                segments.append(data)
+                size += len(data)
+        return segments, size
+
+    def iter_bytes(self, segments: list[bytes | BlockRecord]) -> Iterator[bytes]:
+        """Contenu assemblé, par morceaux d'environ COPY_CHUNK_SIZE octets (les petits segments sont regroupés)."""
+        buffer = bytearray()
+        for segment in segments:
+            if isinstance(segment, bytes):
+                buffer += segment
+            else:
+                end = segment.offset + segment.length
+                for start in range(segment.offset, end, COPY_CHUNK_SIZE):
+                    buffer += self._view()[start:min(start + COPY_CHUNK_SIZE, end)]
+                    if len(buffer) >= COPY_CHUNK_SIZE:
+                        yield bytes(buffer)
+                        buffer.clear()
+            if len(buffer) >= COPY_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    def write_member(self, writer: ArchiveWriter, name: str, template: str) -> None:
+        """Écrit le membre `name` décrit par le gabarit, sans jamais le matérialiser en entier."""
+        segments, size = self.segments(template)
+        writer.write_chunks(name, self.iter_bytes(segments), size)
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+        self._file.close()
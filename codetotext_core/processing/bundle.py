@@ -0,0 +1,226 @@
+# codetotext_core/processing/bundle.py
+# [Version 1.0]
+
+# Bundle à accès direct : contenu (UTF-8) de chaque fichier consolidé, mis bout
+# à bout dans `__bundle.dat`, et table des positions `__bundle_index.json`
+# (chemin, langage, catégories, position, longueur, empreinte SHA-256).
+# Contrairement aux consolidations texte, aucun marqueur n'est à chercher :
+# un fichier ou une catégorie s'obtient par simple lecture de la table.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tarfile
+import tempfile
+from dataclasses import dataclass
+
+from codetotext_core.processing.block_store import BlockStore
+from codetotext_core.processing.output_writer import ArchiveWriter
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+BUNDLE_DATA_FILENAME: str = "__bundle.dat"
+BUNDLE_INDEX_FILENAME: str = "__bundle_index.json"
+BUNDLE_FORMAT: str = "codetotext-bundle"
+BUNDLE_VERSION: int = 1
+
+
+@dataclass(frozen=True)
+class BundleEntry:
+    """Position d'un fichier dans les données du bundle."""
+
+    path: str
+    language: str
+    categories: tuple[str, ...]
+    offset: int
+    length: int
+    sha256: str
+    duplicate_of: str | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        entry = {
+            "path": self.path, "language": self.language, "categories": list(self.categories),
+            "offset": self.offset, "length": self.length, "sha256": self.sha256,
+        }
+        if self.duplicate_of is not None:
+            entry["duplicate_of"] = self.duplicate_of
+        return entry
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> BundleEntry:
+        return cls(
+            entry["path"], entry["language"], tuple(entry["categories"]), entry["offset"], entry["length"],
+            entry["sha256"], entry.get("duplicate_of"),
+        )
+
+
+class BundleBuilder:
+    """
+    Construit le bundle pendant le passage de traitement : chaque contenu est
+    écrit une fois dans un magasin sur disque ; un doublon reprend la plage
+    de son original.
+    """
+
+    def __init__(self) -> None:
+        self._store = BlockStore()
+        self.entries: list[BundleEntry] = []
+        self._by_path: dict[str, BundleEntry] = {}
+
+    def add_file(
+        self, path: str, language: str, categories: set[str], content: str, duplicate_of: str | None = None,
+    ) -> BundleEntry:
+        original = self._by_path.get(duplicate_of) if duplicate_of is not None else None
+        if original is not None:
+            entry = BundleEntry(
+                path, language, tuple(sorted(categories)), original.offset, original.length, original.sha256,
+                duplicate_of,
+            )
+        else:
+            data = content.encode("utf-8")
+            record = self._store.add(content, path, categories)
+            entry = BundleEntry(
+                path, language, tuple(sorted(categories)), record.offset, record.length,
+                hashlib.sha256(data).hexdigest(),
+            )
+        self.entries.append(entry)
+        self._by_path[path] = entry
+        return entry
+
+    def index(self) -> dict[str, object]:
+        categories: dict[str, list[int]] = {}
+        for position, entry in enumerate(self.entries):
+            for category in entry.categories:
+                categories.setdefault(category, []).append(position)
+        return {
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "data": BUNDLE_DATA_FILENAME,
+            "size": sum(record.length for record in self._store.records),
+            "files": [entry.to_dict() for entry in self.entries],
+            "categories": dict(sorted(categories.items())),
+        }
+
+    def write(self, writer: ArchiveWriter) -> None:
+        """Écrit les données (recopiées du magasin, dans l'ordre d'écriture) puis la table des positions."""
+        self._store.write_member(writer, BUNDLE_DATA_FILENAME, "".join(r.placeholder for r in self._store.records))
+        writer.writestr(BUNDLE_INDEX_FILENAME, json.dumps(self.index(), ensure_ascii=False).encode("utf-8"))
+
+    def discard(self) -> None:
+        self._store.close()
+
+
+# ------------------------------------------------------------------------------
+# Lecture
+# ------------------------------------------------------------------------------
+
+class Bundle:
+    """
+    Bundle ouvert en lecture : la table est chargée en mémoire, les données
+    projetées par mmap. `read` et `category` ne parcourent jamais les
+    données : une tranche (memoryview, sans copie) s'obtient en temps
+    constant. Une tranche encore référencée après `close` garde la
+    projection ouverte jusqu'à sa libération.
+    """
+
+    def __init__(self, data_path: str, index_path: str) -> None:
+        with open(index_path, "rb") as f:
+            index = json.load(f)
+        if index.get("format") != BUNDLE_FORMAT or index.get("version") != BUNDLE_VERSION:
+            raise ValueError(f"Table de bundle non reconnue : {index_path}.")
+        self.entries: list[BundleEntry] = [BundleEntry.from_dict(entry) for entry in index["files"]]
+        self._by_path: dict[str, BundleEntry] = {entry.path: entry for entry in self.entries}
+        self._categories: dict[str, list[int]] = index["categories"]
+        self._file = open(data_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size != index["size"]:
+            self._file.close()
+            raise ValueError(f"Données du bundle tronquées : {size} octets au lieu de {index['size']}.")
+        self._mapping = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._view = memoryview(self._mapping) if self._mapping is not None else memoryview(b"")
+
+    @property
+    def paths(self) -> list[str]:
+        return [entry.path for entry in self.entries]
+
+    @property
+    def categories(self) -> list[str]:
+        return list(self._categories)
+
+    def entry(self, path: str) -> BundleEntry:
+        return self._by_path[path]
+
+    def read(self, path: str) -> memoryview:
+        """Contenu (UTF-8) du fichier `path` ; KeyError s'il n'est pas dans le bundle."""
+        entry = self._by_path[path]
+        return self._view[entry.offset:entry.offset + entry.length]
+
+    def read_text(self, path: str) -> str:
+        return str(self.read(path), "utf-8")
+
+    def category(self, name: str) -> list[tuple[BundleEntry, memoryview]]:
+        """Fichiers d'une catégorie, dans l'ordre du traitement, avec leur contenu."""
+        entries = [self.entries[position] for position in self._categories.get(name, ())]
+        return [(entry, self._view[entry.offset:entry.offset + entry.length]) for entry in entries]
+
+    def verify(self, path: str) -> bool:
+        """Vérifie l'empreinte SHA-256 du contenu de `path`."""
+        return hashlib.sha256(self.read(path)).hexdigest() == self._by_path[path].sha256
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                pass  # Tranches encore référencées : la projection sera libérée avec la dernière
+            self._mapping = None
+        self._file.close()
+
+    def __enter__(self) -> Bundle:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def extract_bundle_from_archive(archive_path: str, directory: str) -> bool:
+    """
+    Extrait `__bundle.dat` et `__bundle_index.json` d'une archive de sortie
+    (ZIP ou TAR) dans `directory`, par flux.
+
+    Returns:
+        False si l'archive ne contient pas de bundle.
+    """
+    names = (BUNDLE_DATA_FILENAME, BUNDLE_INDEX_FILENAME)
+    os.makedirs(directory, exist_ok=True)
+    extracted: list[str] = []
+
+    def extract(name: str, source) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(source, f, 1024 * 1024)
+        os.replace(tmp_path, os.path.join(directory, name))
+        extracted.append(name)
+
+    if tarfile.is_tarfile(archive_path):
+        with tarfile.open(archive_path, "r:*") as tar:
+            for member in tar:
+                if member.name in names and member.isfile():
+                    extract(member.name, tar.extractfile(member))
+    else:
+        with CentralDirectoryReader(archive_path) as reader:
+            for record in reader.iter_records():
+                if record.filename in names:
+                    with reader.open(record) as source:
+                        extract(record.filename, source)
+    return len(extracted) == len(names)
+
+
+def open_bundle(archive_path: str, directory: str) -> Bundle:
+    """Extrait le bundle d'une archive de sortie dans `directory` et l'ouvre ; ValueError s'il est absent."""
+    if not extract_bundle_from_archive(archive_path, directory):
+        raise ValueError(f"L'archive ne contient pas de bundle : {archive_path}.")
+    return Bundle(os.path.join(directory, BUNDLE_DATA_FILENAME), os.path.join(directory, BUNDLE_INDEX_FILENAME))
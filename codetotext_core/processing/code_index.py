@@ -0,0 +1,258 @@
+# codetotext_core/processing/code_index.py
+# [Version 1.2]
+
+from __future__ import annotations
+
+import ast
+import contextlib
+import os
+import re
+import sqlite3
+import tarfile
+import tempfile
+
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+# Nom du membre contenant l'index dans l'archive de sortie.
+INDEX_FILENAME: str = "__index.sqlite"
+
+_SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    language TEXT NOT NULL,
+    categories TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE files_fts USING fts5(path, content, tokenize = 'unicode61');
+CREATE TABLE symbols (
+    name TEXT NOT NULL,
+    qualified_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    line INTEGER NOT NULL,
+    signature TEXT NOT NULL
+);
+CREATE INDEX symbols_name ON symbols(name COLLATE NOCASE);
+"""
+
+# Définitions reconnues dans les sources TypeScript / JavaScript (une par ligne).
+_JS_SYMBOL_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("function", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)\s*[<(]")),
+    ("class", re.compile(r"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)")),
+    ("interface", re.compile(r"^\s*(?:export\s+)?interface\s+([A-Za-z_$][\w$]*)")),
+    ("type", re.compile(r"^\s*(?:export\s+)?type\s+([A-Za-z_$][\w$]*)\s*(?:<[^=]*>)?\s*=")),
+    ("enum", re.compile(r"^\s*(?:export\s+)?(?:const\s+)?enum\s+([A-Za-z_$][\w$]*)")),
+    ("function", re.compile(
+        r"^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=]+)?=\s*(?:async\s+)?"
+        r"(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|[A-Za-z_$][\w$]*\s*=>)"
+    )),
+)
+_JS_EXTENSIONS: frozenset[str] = frozenset({".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"})
+_PY_FALLBACK_PATTERN = re.compile(r"^\s*(?:async\s+)?(def|class)\s+([A-Za-z_]\w*)")
+
+
+def python_signature(node: ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef) -> str:
+    """Signature d'une définition Python, sans son corps : `def f(a: int) -> str`."""
+    if isinstance(node, ast.ClassDef):
+        bases = ", ".join(ast.unparse(base) for base in node.bases)
+        return f"class {node.name}({bases})" if bases else f"class {node.name}"
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+
+def _extract_python_symbols(text: str) -> list[tuple[str, str, str, int, str]]:
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        # Source invalide : repli sur une détection ligne à ligne
+        return [
+            (match.group(2), match.group(2), "class" if match.group(1) == "class" else "function", line_number, line.strip())
+            for line_number, line in enumerate(text.splitlines(), start=1)
+            if (match := _PY_FALLBACK_PATTERN.match(line))
+        ]
+
+    symbols: list[tuple[str, str, str, int, str]] = []
+
+    def visit(body: list[ast.stmt], scope: str, in_class: bool) -> None:
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                qualified_name = f"{scope}.{node.name}" if scope else node.name
+                if isinstance(node, ast.ClassDef):
+                    kind = "class"
+                else:
+                    kind = "method" if in_class else "function"
+                symbols.append((node.name, qualified_name, kind, node.lineno, python_signature(node)))
+                visit(node.body, qualified_name, isinstance(node, ast.ClassDef))
+            elif not scope and isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name) and target.id.isupper():
+                        symbols.append((target.id, target.id, "constant", node.lineno, target.id))
+
+    visit(tree.body, "", False)
+    return symbols
+
+
+def _extract_js_symbols(text: str) -> list[tuple[str, str, str, int, str]]:
+    symbols: list[tuple[str, str, str, int, str]] = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        for kind, pattern in _JS_SYMBOL_PATTERNS:
+            match = pattern.match(line)
+            if match:
+                name = match.group(1)
+                symbols.append((name, name, kind, line_number, line.strip()[:200]))
+                break
+    return symbols
+
+
+def extract_symbols(path: str, text: str) -> list[tuple[str, str, str, int, str]]:
+    """
+    Extrait les définitions d'un fichier source.
+
+    Returns:
+        Une liste de tuples (nom, nom qualifié, nature, ligne, signature).
+        Python est analysé avec `ast` ; TS/TSX/JS avec des expressions régulières.
+    """
+    _, ext = os.path.splitext(path.lower())
+    if ext in (".py", ".pyi"):
+        return _extract_python_symbols(text)
+    if ext in _JS_EXTENSIONS:
+        return _extract_js_symbols(text)
+    return []
+
+
+class CodeIndexBuilder:
+    """
+    Construit, au fil du traitement, une base SQLite contenant un index plein
+    texte (FTS5) des fichiers et une table des symboles définis.
+    """
+
+    def __init__(self) -> None:
+        fd, self._path = tempfile.mkstemp(suffix=".sqlite", prefix="codetotext_index_")
+        os.close(fd)
+        self._connection = sqlite3.connect(self._path)
+        self._connection.executescript(_SCHEMA)
+        self.file_count = 0
+        self.symbol_count = 0
+
+    def add_file(self, path: str, language: str, categories: set[str], content: str) -> None:
+        cursor = self._connection.execute(
+            "INSERT OR IGNORE INTO files (path, language, categories) VALUES (?, ?, ?)",
+            (path, language, ",".join(sorted(categories))),
+        )
+        if not cursor.rowcount:
+            return
+        file_id = cursor.lastrowid
+        self._connection.execute(
+            "INSERT INTO files_fts (rowid, path, content) VALUES (?, ?, ?)", (file_id, path, content)
+        )
+        symbols = extract_symbols(path, content)
+        self._connection.executemany(
+            "INSERT INTO symbols (name, qualified_name, kind, file_id, line, signature) VALUES (?, ?, ?, ?, ?, ?)",
+            [(name, qualified, kind, file_id, line, signature) for name, qualified, kind, line, signature in symbols],
+        )
+        self.file_count += 1
+        self.symbol_count += len(symbols)
+
+    def finish(self) -> bytes:
+        """Finalise la base (optimisation FTS, compactage) et retourne son contenu."""
+        try:
+            self._connection.execute("INSERT INTO files_fts (files_fts) VALUES ('optimize')")
+            self._connection.commit()
+            self._connection.execute("VACUUM")
+            self._connection.close()
+            with open(self._path, "rb") as f:
+                return f.read()
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        try:
+            self._connection.close()
+        except sqlite3.Error:
+            pass
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+
+# ------------------------------------------------------------------------------
+# Interrogation
+# ------------------------------------------------------------------------------
+
+def extract_index_from_archive(archive_path: str, destination_path: str) -> bool:
+    """
+    Extrait `__index.sqlite` d'une archive de sortie (ZIP ou TAR) vers un fichier.
+
+    Returns:
+        False si l'archive ne contient pas d'index.
+    """
+    data: bytes | None = None
+    if tarfile.is_tarfile(archive_path):
+        with tarfile.open(archive_path, "r:*") as tar:
+            try:
+                member = tar.extractfile(INDEX_FILENAME)
+            except KeyError:
+                return False
+            data = member.read() if member else None
+    else:
+        with CentralDirectoryReader(archive_path) as reader:
+            for record in reader.iter_records():
+                if record.filename == INDEX_FILENAME:
+                    data = reader.read(record)
+                    break
+    if data is None:
+        return False
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(destination_path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, destination_path)
+    return True
+
+
+def _fts_query(text: str) -> str:
+    """Transforme une saisie libre en requête FTS5 (tous les termes, entre guillemets)."""
+    terms = [term.replace('"', '""') for term in text.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _connect_read_only(index_path: str) -> contextlib.closing[sqlite3.Connection]:
+    """
+    Connexion en lecture seule à l'index, fermée en sortie de bloc (le `with`
+    d'une connexion sqlite3 ne fait que terminer la transaction).
+    """
+    return contextlib.closing(sqlite3.connect(f"file:{index_path}?mode=ro", uri=True))
+
+
+def search_index(index_path: str, text: str, limit: int = 20) -> list[dict[str, object]]:
+    """Recherche plein texte : fichiers contenant tous les termes, avec extrait."""
+    if not text.strip():
+        return []
+    with _connect_read_only(index_path) as connection:
+        rows = connection.execute(
+            "SELECT files.path, files.language, snippet(files_fts, 1, '[', ']', '…', 12) "
+            "FROM files_fts JOIN files ON files.id = files_fts.rowid "
+            "WHERE files_fts MATCH ? ORDER BY rank LIMIT ?",
+            (_fts_query(text), limit),
+        ).fetchall()
+    return [{"path": path, "language": language, "snippet": snippet} for path, language, snippet in rows]
+
+
+def find_symbols(index_path: str, name: str, limit: int = 50) -> list[dict[str, object]]:
+    """Recherche de définitions par nom exact (insensible à la casse) ou préfixe `nom*`."""
+    if name.endswith("*"):
+        condition, parameter = "symbols.name LIKE ? ESCAPE '\\'", name[:-1].replace("_", "\\_").replace("%", "\\%") + "%"
+    else:
+        condition, parameter = "symbols.name = ? COLLATE NOCASE", name
+    with _connect_read_only(index_path) as connection:
+        rows = connection.execute(
+            "SELECT symbols.qualified_name, symbols.kind, files.path, symbols.line, symbols.signature "
+            f"FROM symbols JOIN files ON files.id = symbols.file_id WHERE {condition} "
+            "ORDER BY files.path, symbols.line LIMIT ?",
+            (parameter, limit),
+        ).fetchall()
+    return [
+        {"name": qualified_name, "kind": kind, "path": path, "line": line, "signature": signature}
+        for qualified_name, kind, path, line, signature in rows
+    ]
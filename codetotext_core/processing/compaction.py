@@ -0,0 +1,520 @@
+# codetotext_core/processing/compaction.py
+# [Version 1.3]
+
+# Compactage des sources avant consolidation : suppression des commentaires,
+# docstrings, lignes vides et espaces superflus, sans jamais modifier les
+# littéraux de chaîne. Le traitement est confié à un pool de processus.
+
+from __future__ import annotations
+
+import ast
+import io
+import multiprocessing
+import os
+import re
+import threading
+import tokenize
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+# Estimation grossière utilisée pour les rapports : ~4 octets par token.
+ESTIMATED_BYTES_PER_TOKEN: int = 4
+# Nombre de processus de compactage (0 = nombre de cœurs).
+COMPACTION_WORKERS: int = int(os.environ.get("CODETOTEXT_COMPACTION_WORKERS", "0")) or (os.cpu_count() or 1)
+
+# Plage (Unicode à usage privé) où choisir le caractère qui remplace
+# temporairement un saut de ligne situé dans un littéral, pour qu'il échappe au
+# nettoyage ligne à ligne : le premier absent du texte est retenu.
+_PROTECTED_NEWLINE_CANDIDATES = range(0xE000, 0x110000)
+
+_PYTHON_LANGUAGES = frozenset({"Python", "Python Stub"})
+# Depuis Python 3.12, une f-string est découpée en FSTRING_START ... FSTRING_END
+# (et une t-string en TSTRING_*, 3.14) au lieu d'un seul jeton STRING.
+_INTERPOLATED_STRING_BOUNDS = {
+    getattr(tokenize, start): getattr(tokenize, end)
+    for start, end in (("FSTRING_START", "FSTRING_END"), ("TSTRING_START", "TSTRING_END"))
+    if hasattr(tokenize, start)
+}
+_SCRIPT_LANGUAGES = frozenset({"JavaScript", "JavaScript Module", "TypeScript"})
+# Le texte JSX (<p>Voir http://...</p>) n'est pas du code : ni commentaire, ni espace à réduire
+_JSX_LANGUAGES = frozenset({"TypeScript React"})
+# Début d'élément JSX : <Nom ou fragment <>. Le groupe capture ce qui signale
+# plutôt un paramètre de type générique (<T,>, <T extends U>).
+_JSX_TAG_START = re.compile(r"<(?:>|[A-Za-z_$][\w$.:-]*(\s*(?:,|extends\s))?)")
+# Caractères après lesquels un "<" peut ouvrir un élément JSX (pas une comparaison).
+_JSX_PRECEDING_CHARS = frozenset("(,=:[!&|?{};>")
+
+# Mots-clés après lesquels un "/" ouvre une expression régulière, pas une division.
+_REGEX_PRECEDING_KEYWORDS = frozenset({
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+    "case", "do", "else", "yield", "await",
+})
+_REGEX_PRECEDING_CHARS = frozenset("(,=:[!&|?{};+-*%<>~^")
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    text: str
+    language: str
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.bytes_saved // ESTIMATED_BYTES_PER_TOKEN
+
+
+# ------------------------------------------------------------------------------
+# Python (module tokenize)
+# ------------------------------------------------------------------------------
+
+def compact_python(text: str) -> str:
+    """
+    Retire commentaires, docstrings, lignes vides et espaces de fin de ligne.
+
+    Les positions viennent de `tokenize` : un commentaire n'est jamais
+    confondu avec un '#' de chaîne, et les lignes appartenant à une chaîne
+    multi-lignes sont laissées intactes. Un corps réduit à sa docstring
+    devient `...` pour rester du Python valide. Une source invalide est
+    retournée telle quelle.
+    """
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(text).readline))
+        tree = ast.parse(text)
+    except (tokenize.TokenError, SyntaxError, ValueError):
+        return text
+
+    lines = text.split("\n")
+    comment_columns: dict[int, int] = {}
+    keep_trailing_space: set[int] = set()  # Lignes dont la fin appartient à une chaîne
+    inside_string: set[int] = set()  # Lignes entièrement ou partiellement dans une chaîne
+    open_strings: list[tuple[int, int]] = []  # f-strings ouvertes (imbriquées) : jeton de fin attendu, ligne
+    for token in tokens:
+        if token.type == tokenize.COMMENT:
+            comment_columns[token.start[0]] = token.start[1]
+            continue
+        if token.type in _INTERPOLATED_STRING_BOUNDS:
+            open_strings.append((_INTERPOLATED_STRING_BOUNDS[token.type], token.start[0]))
+            continue
+        if open_strings and token.type == open_strings[-1][0]:
+            first_row = open_strings.pop()[1]
+        elif token.type == tokenize.STRING:
+            first_row = token.start[0]
+        else:
+            continue
+        if token.end[0] > first_row:
+            keep_trailing_space.update(range(first_row, token.end[0]))
+            inside_string.update(range(first_row + 1, token.end[0] + 1))
+
+    removed_rows: set[int] = set()
+    replacements: dict[int, str] = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) or not node.body:
+            continue
+        docstring = node.body[0]
+        if not (isinstance(docstring, ast.Expr) and isinstance(docstring.value, ast.Constant)
+                and isinstance(docstring.value.value, str)):
+            continue
+        first_line = lines[docstring.lineno - 1].encode("utf-8")
+        last_line = lines[docstring.end_lineno - 1].encode("utf-8")
+        before = first_line[:docstring.col_offset].decode("utf-8", errors="ignore")
+        after = last_line[docstring.end_col_offset:].decode("utf-8", errors="ignore").strip()
+        if before.strip() or (after and not after.startswith("#")):
+            continue  # La docstring partage sa ligne avec du code : on la conserve
+        removed_rows.update(range(docstring.lineno, docstring.end_lineno + 1))
+        if len(node.body) == 1 and not isinstance(node, ast.Module):
+            replacements[docstring.lineno] = before + "..."
+
+    compacted: list[str] = []
+    for row, line in enumerate(lines, start=1):
+        if row in removed_rows:
+            if row in replacements:
+                compacted.append(replacements[row])
+            continue
+        if row in comment_columns:
+            line = line[:comment_columns[row]]
+        if row not in keep_trailing_space:
+            line = line.rstrip()
+        if line.strip() or row in inside_string:
+            compacted.append(line)
+    return "\n".join(compacted)
+
+
+# ------------------------------------------------------------------------------
+# JavaScript / TypeScript / CSS (analyseur lexical minimal)
+# ------------------------------------------------------------------------------
+
+def _skip_quoted(text: str, start: int, quote: str) -> int:
+    """Position qui suit la chaîne commençant en `start` (guillemet inclus)."""
+    i, n = start + 1, len(text)
+    while i < n:
+        char = text[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == quote or (char == "\n" and quote != "`"):
+            return i + 1
+        i += 1
+    return n
+
+
+def _skip_regex(text: str, start: int) -> int | None:
+    """Position qui suit le littéral /regex/flags en `start`, None si ce n'en est pas un."""
+    i, n, in_class = start + 1, len(text), False
+    while i < n:
+        char = text[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "\n":
+            return None
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            while i < n and (text[i].isalnum() or text[i] == "_"):
+                i += 1
+            return i
+        i += 1
+    return None
+
+
+def _strip_c_like(text: str, line_comments: bool, jsx: bool = False) -> str:
+    """
+    Retire les commentaires /* */ (et // si `line_comments`) et compacte les
+    espaces hors littéraux. Gère les chaînes '...', "...", les gabarits `...`
+    avec leurs expressions ${...} imbriquées et, en JS/TS, les expressions
+    régulières littérales.
+
+    Avec `jsx`, les éléments JSX sont suivis : le texte entre les balises est
+    recopié tel quel (un « // » ou une apostrophe n'y ont rien de spécial),
+    tandis que les attributs et les expressions {...} sont traités comme du
+    code, commentaires compris.
+    """
+    out: list[str] = []
+    i, n = 0, len(text)
+    template_depths: list[int] = []  # Profondeur d'accolades de chaque ${ ouvert
+    brace_depth = 0
+    previous = ""  # Dernier caractère significatif émis (hors espaces)
+    previous_word = ""  # Dernier mot émis, s'il est le dernier élément significatif
+    in_word = False
+    at_line_start = True
+    # Contextes JSX imbriqués : "tag" (<a ...>), "closing" (</a>), "text" (entre
+    # les balises) ou "code" (expression {...}, avec la profondeur de son "{").
+    jsx_contexts: list[tuple[str, int]] = []
+    protected_newline = _protected_newline(text)
+
+    def emit_literal(literal: str) -> None:
+        out.append(literal.replace("\n", protected_newline))
+
+    while i < n:
+        char = text[i]
+        next_char = text[i + 1] if i + 1 < n else ""
+        context = jsx_contexts[-1][0] if jsx_contexts else "code"
+
+        if context == "text":
+            if char == "<":
+                jsx_contexts.append(("closing" if next_char == "/" else "tag", brace_depth))
+            elif char == "{":
+                jsx_contexts.append(("code", brace_depth))
+                brace_depth += 1
+            else:
+                end = i
+                while end < n and text[end] not in "<{":
+                    end += 1
+                out.append(text[i:end])
+                i, at_line_start = end, False
+                continue
+            out.append(char)
+            i, previous, previous_word, in_word, at_line_start = i + 1, char, "", False, False
+            continue
+
+        if context in ("tag", "closing") and (char == ">" or (char == "/" and next_char == ">")):
+            end = i + 1 if char == ">" else i + 2
+            jsx_contexts.pop()
+            if context == "closing" and jsx_contexts:
+                jsx_contexts.pop()  # Fin de l'élément : on quitte son texte
+            elif char == ">" and context == "tag":
+                jsx_contexts.append(("text", brace_depth))
+            out.append(text[i:end])
+            i, previous, previous_word, in_word, at_line_start = end, ">", "", False, False
+            continue
+
+        if char == "/" and next_char == "*":
+            end = text.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            out.append("\n" if "\n" in text[i:end] else " ")
+            i = end
+            continue
+        if line_comments and char == "/" and next_char == "/":
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            continue
+
+        if char in "'\"" or (line_comments and char == "`"):
+            end = _skip_quoted(text, i, char) if char != "`" else _skip_template(text, i)
+            if char == "`" and end < n and text[end - 2:end] == "${":
+                template_depths.append(brace_depth)
+                brace_depth += 1
+            emit_literal(text[i:end])
+            i, previous, previous_word, in_word, at_line_start = end, char, "", False, False
+            continue
+
+        if line_comments and char == "}" and template_depths and brace_depth - 1 == template_depths[-1]:
+            # Fin d'une expression ${...} : reprise du gabarit
+            template_depths.pop()
+            brace_depth -= 1
+            end = _skip_template(text, i)
+            if end < n and text[end - 2:end] == "${":
+                template_depths.append(brace_depth)
+                brace_depth += 1
+            emit_literal(text[i:end])
+            i, previous, previous_word, in_word, at_line_start = end, "`", "", False, False
+            continue
+
+        if jsx and char == "<" and context == "code" and (
+            not previous or previous in _JSX_PRECEDING_CHARS or previous_word in _REGEX_PRECEDING_KEYWORDS
+        ) and _opens_jsx(text, i):
+            jsx_contexts.append(("tag", brace_depth))
+            out.append(char)
+            i, previous, previous_word, in_word, at_line_start = i + 1, char, "", False, False
+            continue
+
+        if line_comments and char == "/" and context == "code" and (
+            not previous or previous in _REGEX_PRECEDING_CHARS or previous_word in _REGEX_PRECEDING_KEYWORDS
+        ):
+            end = _skip_regex(text, i)
+            if end is not None:
+                emit_literal(text[i:end])
+                i, previous, previous_word, in_word, at_line_start = end, "/", "", False, False
+                continue
+
+        if char in " \t":
+            end = i
+            while end < n and text[end] in " \t":
+                end += 1
+            # Indentation conservée, espaces internes réduits à un seul
+            out.append(text[i:end] if at_line_start else " ")
+            i, in_word = end, False
+            continue
+
+        if char == "\n":
+            at_line_start, in_word = True, False
+        else:
+            at_line_start = False
+            if char == "{":
+                if context != "code":
+                    jsx_contexts.append(("code", brace_depth))  # Attribut {...} d'une balise
+                brace_depth += 1
+            elif char == "}":
+                brace_depth -= 1
+                if jsx_contexts and jsx_contexts[-1] == ("code", brace_depth):
+                    jsx_contexts.pop()
+            if char.isalnum() or char in "_$":
+                previous_word = previous_word + char if in_word else char
+                in_word = True
+            else:
+                previous_word, in_word = "", False
+            previous = char
+        out.append(char)
+        i += 1
+
+    return _drop_blank_lines("".join(out), protected_newline)
+
+
+def _protected_newline(text: str) -> str:
+    """Caractère absent de `text`, qui y remplacera les sauts de ligne protégés."""
+    return next(chr(code) for code in _PROTECTED_NEWLINE_CANDIDATES if chr(code) not in text)
+
+
+def _opens_jsx(text: str, start: int) -> bool:
+    """Vrai si le "<" en `start` ouvre un élément JSX et non des paramètres de type."""
+    match = _JSX_TAG_START.match(text, start)
+    return match is not None and match.group(1) is None
+
+
+def _skip_template(text: str, start: int) -> int:
+    """Position qui suit un segment de gabarit (jusqu'au ` fermant ou après `${`)."""
+    i, n = start + 1, len(text)
+    while i < n:
+        char = text[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "`":
+            return i + 1
+        if char == "$" and i + 1 < n and text[i + 1] == "{":
+            return i + 2
+        i += 1
+    return n
+
+
+def _drop_blank_lines(text: str, protected_newline: str) -> str:
+    lines = (line.rstrip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line.strip()).replace(protected_newline, "\n")
+
+
+def compact_script(text: str) -> str:
+    return _strip_c_like(text, line_comments=True)
+
+
+def compact_jsx(text: str) -> str:
+    return _strip_c_like(text, line_comments=True, jsx=True)
+
+
+def compact_css(text: str) -> str:
+    return _strip_c_like(text, line_comments=False)
+
+
+# ------------------------------------------------------------------------------
+# HTML
+# ------------------------------------------------------------------------------
+
+_HTML_RAW_BLOCK = re.compile(r"(<(script|style|pre|textarea)\b([^>]*)>)(.*?)(</\2\s*>)", re.IGNORECASE | re.DOTALL)
+_HTML_COMMENT = re.compile(r"<!--(?!\[if|<!|>).*?-->", re.DOTALL)
+_SCRIPT_TYPE = re.compile(r"""\btype\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+
+
+def _compact_markup(markup: str) -> str:
+    markup = _HTML_COMMENT.sub("", markup)
+    markup = re.sub(r"[ \t]+\n", "\n", markup)
+    return re.sub(r"\n(?:[ \t]*\n)+", "\n", markup)
+
+
+def compact_html(text: str) -> str:
+    """
+    Retire les commentaires HTML et les lignes vides du balisage ; le contenu
+    des balises <script> et <style> est compacté comme du JS/CSS, celui des
+    balises <pre> et <textarea> est laissé intact.
+    """
+    parts: list[str] = []
+    position = 0
+    for match in _HTML_RAW_BLOCK.finditer(text):
+        parts.append(_compact_markup(text[position:match.start()]))
+        opening, tag, attributes, body, closing = match.group(1, 2, 3, 4, 5)
+        tag = tag.lower()
+        if tag == "style":
+            body = compact_css(body)
+        elif tag == "script":
+            script_type = _SCRIPT_TYPE.search(attributes)
+            if not script_type or "javascript" in script_type.group(1).lower() or script_type.group(1).lower() == "module":
+                body = compact_script(body)
+        parts.append(opening + body + closing)
+        position = match.end()
+    parts.append(_compact_markup(text[position:]))
+    return "".join(parts).strip("\n")
+
+
+_COMPACTORS = {
+    **{language: compact_python for language in _PYTHON_LANGUAGES},
+    **{language: compact_script for language in _SCRIPT_LANGUAGES},
+    **{language: compact_jsx for language in _JSX_LANGUAGES},
+    "CSS": compact_css,
+    "HTML": compact_html,
+}
+
+
+def supports_language(language: str) -> bool:
+    return language in _COMPACTORS
+
+
+def compact_source(language: str, text: str) -> CompactionResult:
+    """Compacte `text` selon le langage (valeur de `get_language_from_filename`)."""
+    compactor = _COMPACTORS.get(language)
+    compacted = compactor(text) if compactor else text
+    return CompactionResult(compacted, language, len(text.encode("utf-8")), len(compacted.encode("utf-8")))
+
+
+# ------------------------------------------------------------------------------
+# Exécution en parallèle
+# ------------------------------------------------------------------------------
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Pool partagé par toutes les requêtes, créé à la première utilisation."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # forkserver : les processus ne sont pas forkés depuis un serveur multi-threadé
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _executor = ProcessPoolExecutor(COMPACTION_WORKERS, mp_context=multiprocessing.get_context(start_method))
+        return _executor
+
+
+def _reset_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+class CompactionTask:
+    """Compactage d'un bloc soumis au pool ; `block()` attend et assemble le résultat."""
+
+    def __init__(self, language: str, text: str, prefix: str, suffix: str) -> None:
+        self.language = language
+        self._text = text
+        self._prefix = prefix
+        self._suffix = suffix
+        self.size = len(text)
+        self._result: CompactionResult | None = None
+        try:
+            self._future: Future | None = _get_executor().submit(compact_source, language, text)
+        except (BrokenProcessPool, RuntimeError, OSError):
+            _reset_executor()
+            self._future = None
+
+    def done(self) -> bool:
+        """Le résultat est-il disponible sans attendre ?"""
+        return self._result is not None or self._future is None or self._future.done()
+
+    def result(self) -> CompactionResult:
+        if self._result is None:
+            try:
+                self._result = self._future.result() if self._future else None
+            except BrokenProcessPool:
+                _reset_executor()
+            if self._result is None:
+                self._result = compact_source(self.language, self._text)  # Repli sur place
+            self._text = ""
+        return self._result
+
+    def block(self) -> str:
+        return f"{self._prefix}{self.result().text}{self._suffix}"
+
+
+class CompactionReport:
+    """Bilan cumulé du compactage, par langage."""
+
+    def __init__(self) -> None:
+        self.by_language: dict[str, list[int]] = defaultdict(lambda: [0, 0])  # [fichiers, octets économisés]
+
+    def add(self, result: CompactionResult) -> None:
+        entry = self.by_language[result.language]
+        entry[0] += 1
+        entry[1] += result.bytes_saved
+
+    @property
+    def bytes_saved(self) -> int:
+        return sum(saved for _, saved in self.by_language.values())
+
+    def summary_block(self) -> str:
+        lines = [
+            f"--- COMPACTAGE : {self.bytes_saved} octets économisés "
+            f"(~{self.bytes_saved // ESTIMATED_BYTES_PER_TOKEN} tokens) ---"
+        ]
+        for language, (files, saved) in sorted(self.by_language.items()):
+            lines.append(f"{language} : {files} fichier(s), {saved} octets (~{saved // ESTIMATED_BYTES_PER_TOKEN} tokens)")
+        return "\n".join(lines)
@@ -0,0 +1,114 @@
+# codetotext_core/processing/content_sniffing.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import codecs
+from dataclasses import dataclass
+
+# Taille de l'échantillon inspecté en tête de chaque membre (en octets).
+SNIFF_SIZE: int = 8 * 1024
+
+# Taille maximale (non compressée) d'un fichier inliné dans les consolidations.
+# Au-delà, le fichier est résumé au lieu d'être décompressé en entier.
+DEFAULT_MAX_FILE_SIZE: int = 1 * 1024 * 1024
+
+# Nombre de lignes de l'échantillon conservées dans le résumé d'un fichier volumineux.
+OVERSIZED_PREVIEW_LINES: int = 20
+
+# Proportion minimale d'octets "texte" dans l'échantillon pour le considérer textuel.
+MIN_PRINTABLE_RATIO: float = 0.85
+
+# BOM -> encodage. L'ordre compte : les BOM UTF-32 commencent comme les BOM UTF-16.
+_BOMS: tuple[tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Proportion maximale d'octets >= 0x80 tolérée pour un texte qui n'est pas de l'UTF-8.
+MAX_NON_UTF8_HIGH_RATIO: float = 0.30
+
+# Encodage de repli pour les fichiers texte qui ne sont pas de l'UTF-8 valide.
+FALLBACK_ENCODING: str = "cp1252"
+
+# Octets de contrôle couramment présents dans du texte (tab, LF, FF, CR, ESC, BS).
+_TEXT_CONTROL_BYTES: frozenset[int] = frozenset({0x08, 0x09, 0x0A, 0x0C, 0x0D, 0x1B})
+_NON_TEXT_CONTROL_BYTES: bytes = bytes(b for b in range(0x20) if b not in _TEXT_CONTROL_BYTES) + b"\x7f"
+_HIGH_BYTES: bytes = bytes(range(0x80, 0x100))
+
+
+@dataclass(frozen=True)
+class SniffResult:
+    """Verdict de l'inspection de l'en-tête d'un fichier."""
+
+    is_binary: bool
+    encoding: str | None = None
+    reason: str = ""
+
+
+def _printable_ratio(sample: bytes) -> float:
+    """Calcule la proportion d'octets plausibles dans un fichier texte."""
+    if not sample:
+        return 1.0
+    # bytes.translate(None, delete) est exécuté en C : on supprime les octets
+    # de contrôle "non textuels" et on compare les longueurs.
+    remaining = sample.translate(None, _NON_TEXT_CONTROL_BYTES)
+    return len(remaining) / len(sample)
+
+
+def sniff_content(head: bytes) -> SniffResult:
+    """
+    Détermine, à partir des premiers Ko d'un fichier, s'il est binaire et
+    quel encodage utiliser pour le décoder.
+
+    Args:
+        head: Les premiers octets du fichier (typiquement SNIFF_SIZE octets).
+
+    Returns:
+        Un SniffResult indiquant si le fichier est binaire et, sinon,
+        l'encodage à utiliser ("utf-8", "utf-8-sig", "utf-16", ...).
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return SniffResult(is_binary=False, encoding=encoding, reason=f"BOM {encoding}")
+
+    if b"\x00" in head:
+        return SniffResult(is_binary=True, reason="octet NUL")
+
+    if _printable_ratio(head) < MIN_PRINTABLE_RATIO:
+        return SniffResult(is_binary=True, reason="ratio de caractères imprimables trop faible")
+
+    # Décodage incrémental : une séquence multi-octets coupée en fin
+    # d'échantillon ne doit pas faire échouer la détection.
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+    except UnicodeDecodeError:
+        high_bytes = len(head) - len(head.translate(None, _HIGH_BYTES))
+        if high_bytes / len(head) > MAX_NON_UTF8_HIGH_RATIO:
+            return SniffResult(is_binary=True, reason="octets non ASCII trop nombreux")
+        return SniffResult(is_binary=False, encoding=FALLBACK_ENCODING, reason="UTF-8 invalide")
+
+    return SniffResult(is_binary=False, encoding="utf-8")
+
+
+def decode_content(content: bytes, encoding: str | None) -> str:
+    """Décode le contenu d'un fichier texte avec l'encodage détecté."""
+    return content.decode(encoding or "utf-8", errors="replace")
+
+
+def build_oversized_summary(head: bytes, encoding: str | None, file_size: int, max_file_size: int) -> str:
+    """
+    Construit le résumé inliné à la place d'un fichier dépassant la taille maximale.
+
+    Seul l'échantillon déjà lu est utilisé : le reste du fichier n'est jamais décompressé.
+    """
+    preview_text = decode_content(head, encoding)
+    preview_lines = preview_text.splitlines()[:OVERSIZED_PREVIEW_LINES]
+    return (
+        f"[FICHIER VOLUMINEUX RÉSUMÉ : {file_size} octets, limite {max_file_size} octets]\n"
+        f"[Aperçu des {len(preview_lines)} premières lignes]\n"
+        + "\n".join(preview_lines)
+    )
@@ -0,0 +1,91 @@
+# codetotext_core/processing/deduplication.py
+# [Version 1.2]
+
+from __future__ import annotations
+
+import hashlib
+
+from codetotext_core.processing.block_store import MEMORY_CONTENT_LIMIT
+
+# Volume total des premières occurrences gardées telles quelles en mémoire ; au-delà,
+# seule leur empreinte est conservée.
+RETAINED_CONTENT_LIMIT: int = MEMORY_CONTENT_LIMIT
+
+
+def _digest(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class _Original:
+    """Première occurrence d'un contenu : son chemin et, au choix, le contenu ou son empreinte."""
+
+    __slots__ = ("path", "content", "digest")
+
+    def __init__(self, path: str, content: bytes | None, digest: bytes | None) -> None:
+        self.path = path
+        self.content = content
+        self.digest = digest
+
+    def matches(self, content: bytes, digest: bytes | None) -> bool:
+        if self.content is not None:
+            return self.content == content
+        return self.digest == digest
+
+
+class DuplicateTracker:
+    """
+    Détecte les fichiers au contenu identique au sein d'une même archive.
+
+    La clé de premier niveau est le couple (CRC32, taille) lu dans le répertoire
+    central du ZIP : il ne coûte rien et élimine la quasi-totalité des faux
+    positifs. Un fichier dont la clé n'a jamais été vue est enregistré sans
+    aucun calcul : l'égalité n'est vérifiée qu'en cas de clé commune, par
+    comparaison directe avec le contenu gardé de l'original. Passé
+    RETAINED_CONTENT_LIMIT octets gardés, les originaux suivants ne sont plus
+    conservés que par leur empreinte BLAKE2b.
+    """
+
+    def __init__(self, retained_content_limit: int = RETAINED_CONTENT_LIMIT) -> None:
+        # (crc, taille) -> premières occurrences des contenus distincts de cette clé
+        self._seen: dict[tuple[int, int], list[_Original]] = {}
+        self._retained_content_limit = retained_content_limit
+        self._retained_bytes = 0
+        self.duplicate_count: int = 0
+        self.bytes_saved: int = 0
+
+    def find_original(self, crc: int, size: int, content: bytes, path: str) -> str | None:
+        """
+        Enregistre un fichier et retourne le chemin de sa première occurrence s'il
+        s'agit d'un doublon, None sinon.
+
+        Args:
+            crc: Le CRC32 du membre, tel que déclaré dans le répertoire central.
+            size: La taille non compressée du membre.
+            content: Le contenu brut (non décodé) du fichier.
+            path: Le chemin d'affichage du fichier.
+        """
+        if size == 0:
+            return None  # Un fichier vide n'économise rien à être référencé
+        candidates = self._seen.setdefault((crc, size), [])
+        digest = None
+        if candidates:
+            if any(original.content is None for original in candidates):
+                digest = _digest(content)
+            for original in candidates:
+                if original.matches(content, digest):
+                    self.duplicate_count += 1
+                    self.bytes_saved += size
+                    return original.path
+        if self._retained_bytes + size <= self._retained_content_limit:
+            self._retained_bytes += size
+            candidates.append(_Original(path, content, None))
+        else:
+            candidates.append(_Original(path, None, digest if digest is not None else _digest(content)))
+        return None
+
+    def summary_block(self) -> str:
+        """Bloc récapitulatif ajouté en fin de `__code_complet.txt`."""
+        return (
+            f"--- DEDUPLICATION : {self.duplicate_count} doublon(s), "
+            f"{self.bytes_saved} octets économisés ---\n"
+        )
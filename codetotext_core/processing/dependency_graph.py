@@ -0,0 +1,301 @@
+# codetotext_core/processing/dependency_graph.py
+# [Version 1.0]
+
+# Sélection par dépendances : graphe des imports (Python, ES/CommonJS) construit
+# sur les contenus déjà décodés, puis fermeture transitive à partir de fichiers
+# d'entrée, bornée en profondeur et en taille.
+
+from __future__ import annotations
+
+import ast
+import posixpath
+import re
+from collections import deque
+from dataclasses import dataclass, field
+
+DEPENDENCIES_FILENAME: str = "__code_dependances.txt"
+
+_PYTHON_EXTENSIONS = (".py", ".pyi")
+_SCRIPT_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+# Ordre d'essai des extensions pour un import ES sans extension (`./api` -> `./api.ts`, `./api/index.ts`)
+_SCRIPT_RESOLUTION_SUFFIXES: tuple[str, ...] = _SCRIPT_EXTENSIONS + (".d.ts",)
+
+# `import x from "m"`, `import {a,\n b} from "m"`, `export * from "m"` (sur plusieurs lignes)
+_ES_FROM = re.compile(r"""\b(?:import|export)\b[^'";]*?\bfrom\s*(['"])([^'"\n]+)\1""")
+# `import "m"` (effet de bord), `import("m")`, `require("m")`
+_ES_BARE = re.compile(r"""(?:^|[;\s])import\s*(['"])([^'"\n]+)\1""", re.MULTILINE)
+_ES_CALL = re.compile(r"""\b(?:require|import)\s*\(\s*(['"])([^'"\n]+)\1\s*\)""")
+# Alias de chemin courants des projets front (`@/…`, `~/…`) : dossier `src` du projet
+_ES_SOURCE_ALIASES: tuple[str, ...] = ("@/", "~/")
+
+
+@dataclass(frozen=True)
+class DependencySelection:
+    """
+    Fichiers à suivre et bornes de la sélection.
+
+    Attributes:
+        entry_points: Chemins des fichiers d'entrée (relatifs à la racine de
+                      l'archive ; un suffixe de chemin non ambigu suffit).
+        max_depth: Nombre maximal d'imports suivis depuis une entrée (None = illimité).
+        max_bytes: Taille maximale des blocs retenus ; les entrées sont toujours
+                   retenues, les dépendances qui dépasseraient le budget non.
+    """
+
+    entry_points: tuple[str, ...]
+    max_depth: int | None = None
+    max_bytes: int | None = None
+
+
+@dataclass
+class DependencyClosure:
+    """Résultat d'une sélection : fichiers retenus (avec leur profondeur) et écarts."""
+
+    selected: list[tuple[str, int]]
+    missing_entries: list[str] = field(default_factory=list)
+    over_budget: list[str] = field(default_factory=list)
+    depth_limited: int = 0
+    selected_bytes: int = 0
+
+    def summary_block(self, selection: DependencySelection, file_count: int) -> str:
+        depth = "illimitée" if selection.max_depth is None else str(selection.max_depth)
+        budget = "aucun" if selection.max_bytes is None else f"{selection.max_bytes} octets"
+        lines = [
+            "--- SELECTION PAR DEPENDANCES ---",
+            f"Points d'entrée : {', '.join(selection.entry_points)}",
+            f"Profondeur maximale : {depth} | Budget : {budget}",
+            f"{len(self.selected)} fichier(s) retenu(s) sur {file_count}, {self.selected_bytes} octets",
+        ]
+        lines += [f"  [{depth}] {path}" for path, depth in self.selected]
+        if self.over_budget:
+            lines.append(f"Hors budget ({len(self.over_budget)}) : {', '.join(self.over_budget)}")
+        if self.depth_limited:
+            lines.append(f"Imports non suivis (profondeur atteinte) : {self.depth_limited}")
+        if self.missing_entries:
+            lines.append(f"Points d'entrée introuvables : {', '.join(self.missing_entries)}")
+        lines.append("--- FIN DE LA SELECTION ---")
+        return "\n".join(lines)
+
+
+def _python_imports(text: str) -> list[tuple[int, str, tuple[str, ...]]]:
+    """Imports d'un module Python : (niveau relatif, module, noms importés)."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return []
+    imports: list[tuple[int, str, tuple[str, ...]]] = []
+    for node in ast.walk(tree):  # Y compris les imports locaux aux fonctions
+        if isinstance(node, ast.Import):
+            imports.extend((0, alias.name, ()) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append((node.level, node.module or "", tuple(alias.name for alias in node.names)))
+    return imports
+
+
+def _script_specifiers(text: str) -> list[str]:
+    """Spécificateurs importés par un fichier TS/JS (ES modules et CommonJS)."""
+    specifiers: list[str] = []
+    for pattern in (_ES_FROM, _ES_BARE, _ES_CALL):
+        specifiers.extend(match.group(2) for match in pattern.finditer(text))
+    return specifiers
+
+
+def _module_parts(path: str) -> tuple[str, ...] | None:
+    """Nom de module d'un chemin Python (`a/b/__init__.py` -> ("a", "b")), None sinon."""
+    for extension in _PYTHON_EXTENSIONS:
+        if path.endswith(extension):
+            parts = tuple(path[:-len(extension)].split("/"))
+            return parts[:-1] if parts[-1] == "__init__" else parts
+    return None
+
+
+def _common_prefix_length(left: str, right: str) -> int:
+    count = 0
+    for a, b in zip(left.split("/"), right.split("/")):
+        if a != b:
+            break
+        count += 1
+    return count
+
+
+class DependencyGraph:
+    """
+    Graphe des imports d'une archive, alimenté fichier par fichier pendant le
+    passage de traitement : les imports sont extraits sur le contenu décodé,
+    la résolution (qui demande la liste complète des chemins) est faite à la
+    fermeture.
+
+    Un import Python absolu est cherché depuis la racine de l'archive, puis
+    comme suffixe de chemin (projets dont le code vit sous `backend/` ou
+    `src/`) ; entre plusieurs candidats, le plus proche de l'importateur
+    l'emporte. Les imports ES relatifs et les alias `@/`/`~/` (dossier `src`)
+    sont résolus avec les extensions et fichiers `index` usuels ; les paquets
+    externes sont ignorés.
+    """
+
+    def __init__(self) -> None:
+        self._python_imports: dict[str, list[tuple[int, str, tuple[str, ...]]]] = {}
+        self._script_imports: dict[str, list[str]] = {}
+        self.paths: list[str] = []
+        self._path_set: set[str] = set()
+        self._modules: dict[tuple[str, ...], str] = {}
+        self._module_suffixes: dict[tuple[str, ...], list[str]] | None = None
+        self._edges: dict[str, list[str]] | None = None
+
+    def add_file(self, path: str, text: str) -> None:
+        if path in self._path_set:
+            return
+        self.paths.append(path)
+        self._path_set.add(path)
+        self._edges = None
+        module_parts = _module_parts(path)
+        if module_parts is not None:
+            self._modules[module_parts] = path
+            self._module_suffixes = None
+            self._python_imports[path] = _python_imports(text)
+        elif path.lower().endswith(_SCRIPT_EXTENSIONS):
+            self._script_imports[path] = _script_specifiers(text)
+
+    # --- Résolution Python ---
+
+    def _suffix_index(self) -> dict[tuple[str, ...], list[str]]:
+        if self._module_suffixes is None:
+            index: dict[tuple[str, ...], list[str]] = {}
+            for parts, path in self._modules.items():
+                for start in range(1, len(parts)):
+                    index.setdefault(parts[start:], []).append(path)
+            self._module_suffixes = index
+        return self._module_suffixes
+
+    def _find_module(self, parts: tuple[str, ...], importer: str, absolute: bool) -> str | None:
+        if not parts:
+            return None
+        path = self._modules.get(parts)
+        if path is not None or not absolute:
+            return path
+        candidates = self._suffix_index().get(parts)
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        return max(candidates, key=lambda candidate: (_common_prefix_length(candidate, importer), -len(candidate)))
+
+    def _resolve_python(self, importer: str, level: int, module: str, names: tuple[str, ...]) -> list[str]:
+        module_parts = tuple(module.split(".")) if module else ()
+        if level:
+            package = tuple(importer.split("/")[:-1])
+            if level > 1:
+                package = package[:-(level - 1)] if level - 1 <= len(package) else None
+            if package is None:
+                return []
+            base = package + module_parts
+        else:
+            base = module_parts
+        resolved: list[str] = []
+        # `from paquet import sous_module` : chaque nom peut être un module
+        for name in names:
+            if name != "*":
+                target = self._find_module(base + (name,), importer, absolute=not level)
+                if target is not None:
+                    resolved.append(target)
+        target = self._find_module(base, importer, absolute=not level)
+        if target is not None and target not in resolved:
+            resolved.append(target)
+        return resolved
+
+    # --- Résolution ES ---
+
+    def _resolve_script_base(self, base: str) -> str | None:
+        if base in self._path_set:
+            return base
+        stem, extension = posixpath.splitext(base)
+        if extension in (".js", ".jsx", ".mjs", ".cjs"):
+            # Import ESM d'un fichier TS compilé : `./api.js` désigne `./api.ts`
+            for suffix in (".ts", ".tsx", ".mts", ".cts"):
+                if stem + suffix in self._path_set:
+                    return stem + suffix
+        for suffix in _SCRIPT_RESOLUTION_SUFFIXES:
+            if base + suffix in self._path_set:
+                return base + suffix
+        for suffix in _SCRIPT_RESOLUTION_SUFFIXES:
+            if f"{base}/index{suffix}" in self._path_set:
+                return f"{base}/index{suffix}"
+        return None
+
+    def _resolve_script(self, importer: str, specifier: str) -> str | None:
+        if specifier.startswith("."):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))
+            return None if base.startswith("..") else self._resolve_script_base(base)
+        for alias in _ES_SOURCE_ALIASES:
+            if specifier.startswith(alias):
+                # Dossier `src` le plus proche de l'importateur, puis celui de la racine
+                components = importer.split("/")[:-1]
+                roots = ["/".join(components[:i + 1]) for i in range(len(components) - 1, -1, -1) if components[i] == "src"]
+                for root in roots + ["src"]:
+                    target = self._resolve_script_base(f"{root}/{specifier[len(alias):]}")
+                    if target is not None:
+                        return target
+                return None
+        return None  # Paquet externe (node_modules)
+
+    def edges(self) -> dict[str, list[str]]:
+        """Dépendances résolues de chaque fichier, dans l'ordre des imports."""
+        if self._edges is None:
+            edges: dict[str, list[str]] = {}
+            for importer, imports in self._python_imports.items():
+                targets: list[str] = []
+                for level, module, names in imports:
+                    targets.extend(self._resolve_python(importer, level, module, names))
+                edges[importer] = list(dict.fromkeys(t for t in targets if t != importer))
+            for importer, specifiers in self._script_imports.items():
+                targets = [self._resolve_script(importer, specifier) for specifier in specifiers]
+                edges[importer] = list(dict.fromkeys(t for t in targets if t is not None and t != importer))
+            self._edges = edges
+        return self._edges
+
+    def find_entry(self, entry: str) -> str | None:
+        """Chemin désigné par un point d'entrée : chemin exact, sinon suffixe de chemin non ambigu."""
+        entry = entry.strip().replace("\\", "/").removeprefix("./")
+        if entry in self._path_set:
+            return entry
+        matches = [path for path in self.paths if path.endswith("/" + entry)]
+        return matches[0] if len(matches) == 1 else None
+
+    def closure(self, selection: DependencySelection, sizes: dict[str, int]) -> DependencyClosure:
+        """
+        Fermeture transitive en largeur depuis les points d'entrée : les
+        dépendances directes d'abord, puis les suivantes. Une dépendance qui
+        ferait dépasser le budget est écartée (et ses propres imports ne sont
+        pas suivis), mais les suivantes, plus petites, peuvent encore entrer.
+        """
+        edges = self.edges()
+        result = DependencyClosure(selected=[])
+        queue: deque[tuple[str, int]] = deque()
+        visited: set[str] = set()
+        for entry in selection.entry_points:
+            path = self.find_entry(entry)
+            if path is None:
+                result.missing_entries.append(entry)
+            elif path not in visited:
+                visited.add(path)
+                queue.append((path, 0))
+                result.selected.append((path, 0))
+                result.selected_bytes += sizes.get(path, 0)
+
+        while queue:
+            path, depth = queue.popleft()
+            if selection.max_depth is not None and depth >= selection.max_depth:
+                result.depth_limited += sum(1 for target in edges.get(path, ()) if target not in visited)
+                continue
+            for target in edges.get(path, ()):
+                if target in visited:
+                    continue
+                visited.add(target)
+                size = sizes.get(target, 0)
+                if selection.max_bytes is not None and result.selected_bytes + size > selection.max_bytes:
+                    result.over_budget.append(target)
+                    continue
+                result.selected.append((target, depth + 1))
+                result.selected_bytes += size
+                queue.append((target, depth + 1))
+        return result
@@ -0,0 +1,208 @@
+# codetotext_core/processing/diff_mode.py
+# [Version 1.4]
+
+# Mode différentiel : ne produit que ce qui a changé entre deux archives ZIP
+# d'un même projet (instantané de référence et nouvel envoi).
+
+from __future__ import annotations
+
+import difflib
+import io
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
+from codetotext_core.processing.content_sniffing import (
+    DEFAULT_MAX_FILE_SIZE,
+    SNIFF_SIZE,
+    build_oversized_summary,
+    decode_content,
+    sniff_content,
+)
+from codetotext_core.processing.output_writer import DEFAULT_OUTPUT_FORMAT, OutputFormat, open_archive_writer
+from codetotext_core.processing.pipeline import ZIP_EXTENSIONS, accepts_path
+from codetotext_core.processing.resource_budget import (
+    DEFAULT_RESOURCE_LIMITS,
+    BudgetedArchiveWriter,
+    ResourceLimits,
+    check_central_directory,
+    check_entry_count,
+    job_budget,
+)
+from codetotext_core.profiles.base import AnalysisProfile, ConsolidationBlock
+from codetotext_core.utils.entry_table import EntryTable, ZipEntry
+from codetotext_core.utils.file_utils import get_language_from_filename
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+logger = logging.getLogger(__name__)
+
+DIFF_FILENAME: str = "__code_diff.txt"
+# Lignes de contexte autour de chaque modification dans les diffs unifiés.
+DIFF_CONTEXT_LINES: int = 3
+
+
+@dataclass
+class ArchiveDiff:
+    """Chemins (relatifs à la racine commune) classés par nature de changement."""
+
+    added: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    unchanged_count: int = 0
+
+    def summary_line(self) -> str:
+        return (
+            f"--- DIFF : {len(self.added)} ajouté(s), {len(self.modified)} modifié(s), "
+            f"{len(self.removed)} supprimé(s), {self.unchanged_count} inchangé(s) ---"
+        )
+
+
+def _accepted_entries(
+    reader: CentralDirectoryReader,
+    profile: AnalysisProfile,
+    keep_original_extension: bool,
+    limits: ResourceLimits | None,
+) -> dict[str, ZipEntry]:
+    """Fichiers retenus par les filtres, indexés par chemin relatif à la racine commune."""
+    if limits is not None:
+        check_entry_count(reader.entry_count, limits)
+    entry_table = EntryTable.from_records(reader.iter_records())
+    if limits is not None:
+        check_central_directory(entry_table.entries, limits)
+    root_node = entry_table.common_root()
+    accepted: dict[str, ZipEntry] = {}
+    for item in entry_table.entries:
+        path_components = entry_table.components(item.node, root_node)
+        path = "/".join(path_components)
+        if accepts_path(profile, keep_original_extension, path, path_components):
+            accepted[path] = item
+    return accepted
+
+
+def _read_text(reader: CentralDirectoryReader, item: ZipEntry, max_file_size: int) -> str | None:
+    """Contenu décodé d'un membre, résumé s'il est volumineux, None s'il est binaire."""
+    with reader.open(item) as member:
+        head = member.read(SNIFF_SIZE)
+        sniff = sniff_content(head)
+        if sniff.is_binary:
+            return None
+        if item.file_size > max_file_size:
+            return build_oversized_summary(head, sniff.encoding, item.file_size, max_file_size)
+        return decode_content(head + member.read(), sniff.encoding)
+
+
+def _diff_filename(consolidated_filename: str) -> str:
+    """Nom d'un fichier consolidé du profil, décliné pour le mode différentiel."""
+    if consolidated_filename.startswith("__code_"):
+        return "__code_diff_" + consolidated_filename[len("__code_"):]
+    return "__diff" + consolidated_filename
+
+
+def process_zip_diff(
+    baseline_zip_stream: BinaryIO,
+    input_zip_stream: BinaryIO,
+    uploaded_filename: str,
+    keep_original_extension: bool,
+    profile: AnalysisProfile,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    output_format: OutputFormat = DEFAULT_OUTPUT_FORMAT,
+    limits: ResourceLimits | None = DEFAULT_RESOURCE_LIMITS,
+) -> tuple[io.BytesIO, str, ArchiveDiff]:
+    """
+    Compare deux archives ZIP d'un même projet et ne produit que les changements.
+
+    Les fichiers ajoutés, supprimés et modifiés sont déterminés à partir du
+    seul répertoire central (CRC32 et taille) : les fichiers inchangés ne sont
+    jamais décompressés. Les filtres du profil s'appliquent aux deux archives.
+
+    La sortie contient `__code_diff.txt` (blocs complets des fichiers ajoutés,
+    diffs unifiés des fichiers modifiés, liste des suppressions) et les
+    fichiers consolidés du profil, calculés sur ces seuls blocs et préfixés
+    `__code_diff_`. Un fichier ajouté ou modifié dont la nouvelle version est
+    binaire est compté et signalé (« binaire ») dans `__code_diff.txt`, sans
+    contenu ni diff, et reste hors des consolidations.
+
+    `limits` s'applique à chacune des deux archives (répertoire central) et
+    au traitement (durée, mémoire, taille de la sortie).
+
+    Returns:
+        Le flux de sortie, le nom du fichier de sortie et le bilan des changements.
+    """
+    diff = ArchiveDiff()
+    diff_blocks: list[str] = []
+    categorized_files: list[tuple[ConsolidationBlock, set[str]]] = []
+
+    with job_budget(limits) as budget:
+        with CentralDirectoryReader(baseline_zip_stream) as baseline, CentralDirectoryReader(input_zip_stream) as current:
+            baseline_entries = _accepted_entries(baseline, profile, keep_original_extension, limits)
+            current_entries = _accepted_entries(current, profile, keep_original_extension, limits)
+            diff.removed = sorted(path for path in baseline_entries if path not in current_entries)
+
+            for path, item in current_entries.items():
+                previous = baseline_entries.get(path)
+                if previous is not None and (previous.crc, previous.file_size) == (item.crc, item.file_size):
+                    diff.unchanged_count += 1
+                    continue
+                if budget is not None:
+                    budget.check()
+
+                new_text = _read_text(current, item, max_file_size)
+                language = get_language_from_filename(path.rsplit("/", 1)[-1])
+
+                if new_text is None:
+                    # Compté et signalé comme les autres changements, mais sans contenu ni diff
+                    logger.info(f"Fichier binaire non comparé : {item.filename}")
+                    status = "ajouté" if previous is None else "modifié"
+                    (diff.added if previous is None else diff.modified).append(path)
+                    diff_blocks.append(
+                        f"-- DEBUT DU FICHIER --\nChemin: {path}\nLangage: {language}\nStatut: {status} (binaire)\n"
+                        f"-- FIN DU FICHIER --\n"
+                    )
+                    continue
+                if previous is None:
+                    diff.added.append(path)
+                    file_block = (
+                        f"-- DEBUT DU FICHIER --\nChemin: {path}\nLangage: {language}\nStatut: ajouté\n"
+                        f"-- CONTENU DU CODE --\n{new_text}\n-- FIN DU FICHIER --\n"
+                    )
+                else:
+                    old_text = _read_text(baseline, previous, max_file_size)
+                    diff.modified.append(path)
+                    unified_diff = "\n".join(difflib.unified_diff(
+                        (old_text or "").splitlines(), new_text.splitlines(),
+                        fromfile=f"a/{path}", tofile=f"b/{path}", n=DIFF_CONTEXT_LINES, lineterm="",
+                    ))
+                    file_block = (
+                        f"-- DEBUT DU FICHIER --\nChemin: {path}\nLangage: {language}\nStatut: modifié\n"
+                        f"-- DIFF --\n{unified_diff}\n-- FIN DU FICHIER --\n"
+                    )
+
+                # Condition P_4 : les documents d'architecture restent hors des consolidations
+                if AnalysisProfile.is_always_included(path, path.split("/")):
+                    continue
+                diff_blocks.append(file_block)
+                categorized_files.append((ConsolidationBlock(file_block, path), profile.categorize_file(path)))
+
+        if not diff_blocks and not diff.removed:
+            raise ValueError("Aucune différence entre les deux archives après filtrage.")
+
+        parts = [diff.summary_line()] + diff_blocks
+        if diff.removed:
+            parts.append("--- FICHIERS SUPPRIMÉS ---\n" + "\n".join(f"- {path}" for path in diff.removed) + "\n")
+
+        output_stream = io.BytesIO()
+        with open_archive_writer(output_stream, output_format) as writer:
+            zout = BudgetedArchiveWriter(writer, budget) if budget is not None else writer
+            zout.writestr(DIFF_FILENAME, "\n".join(parts).encode("utf-8"))
+            for filename, content in profile.generate_consolidated_files(categorized_files).items():
+                if content.strip():
+                    zout.writestr(_diff_filename(filename), content.encode("utf-8"))
+
+    logger.info(diff.summary_line())
+    output_stream.seek(0)
+
+    name_base = uploaded_filename
+    if name_base.lower().endswith(ZIP_EXTENSIONS):
+        name_base = os.path.splitext(name_base)[0]
+    return output_stream, f"{name_base}_diff{output_format.extension}", diff
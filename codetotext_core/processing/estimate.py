@@ -0,0 +1,206 @@
+# codetotext_core/processing/estimate.py
+# [Version 1.2]
+
+# Estimation à blanc : taille et nombre de tokens de chaque fichier produit
+# (`__code_complet.txt`, consolidations du profil), à partir du seul
+# répertoire central de l'archive ZIP, sans décompresser un seul membre.
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
+from codetotext_core.processing.block_store import PLACEHOLDER, PLACEHOLDER_PATTERN
+from codetotext_core.processing.content_sniffing import DEFAULT_MAX_FILE_SIZE, OVERSIZED_PREVIEW_LINES, SNIFF_SIZE
+from codetotext_core.processing.deduplication import DuplicateTracker
+from codetotext_core.processing.pipeline import accepts_path
+from codetotext_core.profiles.base import AnalysisProfile, ConsolidationBlock
+from codetotext_core.utils.entry_table import EntryTable
+from codetotext_core.utils.file_utils import get_language_from_filename
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+# Ratio moyen octets / token des tokeniseurs BPE courants sur du code source.
+DEFAULT_BYTES_PER_TOKEN: float = 4.0
+DEFAULT_TOP_CONTRIBUTORS: int = 10
+# Longueur supposée d'une ligne d'aperçu d'un fichier résumé (l'échantillon lu borne l'aperçu).
+_PREVIEW_LINE_BYTES = 80
+
+
+def estimate_tokens(byte_count: int, bytes_per_token: float = DEFAULT_BYTES_PER_TOKEN) -> int:
+    return math.ceil(byte_count / bytes_per_token)
+
+
+@dataclass
+class OutputEstimate:
+    """Taille prévue d'un fichier produit et ses plus gros contributeurs."""
+
+    name: str
+    size: int
+    tokens: int
+    file_count: int
+    largest: list[tuple[str, int]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "name": self.name, "bytes": self.size, "tokens": self.tokens, "files": self.file_count,
+            "largest": [{"path": path, "bytes": size} for path, size in self.largest],
+        }
+
+
+@dataclass
+class ArchiveEstimate:
+    """Estimation d'un traitement : fichiers produits, catégories du profil et plus gros fichiers."""
+
+    profile_id: str
+    entry_count: int
+    file_count: int
+    outputs: list[OutputEstimate]
+    categories: dict[str, tuple[int, int, int]]  # catégorie -> (fichiers, octets, tokens)
+    largest: list[tuple[str, int]]
+    duplicate_count: int
+    oversized_count: int
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "profile": self.profile_id,
+            "entries": self.entry_count,
+            "files": self.file_count,
+            "duplicates": self.duplicate_count,
+            "oversized": self.oversized_count,
+            "outputs": [output.to_dict() for output in self.outputs],
+            "categories": {
+                category: {"files": files, "bytes": size, "tokens": tokens}
+                for category, (files, size, tokens) in sorted(self.categories.items())
+            },
+            "largest": [{"path": path, "bytes": size} for path, size in self.largest],
+        }
+
+    def summary_lines(self) -> list[str]:
+        lines = [
+            f"Profil « {self.profile_id} » : {self.file_count} fichier(s) retenu(s) sur {self.entry_count} entrée(s), "
+            f"{self.duplicate_count} doublon(s) probable(s), {self.oversized_count} fichier(s) résumé(s)"
+        ]
+        for output in self.outputs:
+            lines.append(f"{output.name:<44} {output.size:>12} octets  ~{output.tokens:>10} tokens  ({output.file_count} fichier(s))")
+        lines.append("Catégories :")
+        for category, (files, size, tokens) in sorted(self.categories.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {category:<30} {files:>6} fichier(s) {size:>12} octets  ~{tokens:>10} tokens")
+        lines.append("Plus gros contributeurs :")
+        lines.extend(f"  {size:>12} octets  {path}" for path, size in self.largest)
+        return lines
+
+
+def _block_size(path: str, language: str, content_size: int) -> int:
+    """Taille (UTF-8) du bloc de consolidation d'un fichier dont le contenu fait `content_size` octets."""
+    header = f"-- DEBUT DU FICHIER --\nChemin: {path}\nLangage: {language}\n-- CONTENU DU CODE --\n"
+    return len(header.encode("utf-8")) + content_size + len("\n-- FIN DU FICHIER --\n")
+
+
+def _oversized_content_size(file_size: int, max_file_size: int) -> int:
+    """Résumé d'un fichier volumineux : en-têtes et aperçu de ses premières lignes."""
+    header = (
+        f"[FICHIER VOLUMINEUX RÉSUMÉ : {file_size} octets, limite {max_file_size} octets]\n"
+        f"[Aperçu des {OVERSIZED_PREVIEW_LINES} premières lignes]\n"
+    )
+    return len(header.encode("utf-8")) + min(SNIFF_SIZE, file_size, OVERSIZED_PREVIEW_LINES * _PREVIEW_LINE_BYTES)
+
+
+def _estimate_joined(name: str, content: str, sizes: list[int], paths: list[str], top: int, bytes_per_token: float) -> OutputEstimate:
+    """Taille d'une consolidation produite à partir de marqueurs : séparateurs réels + tailles des blocs."""
+    indices = [int(index) for index in PLACEHOLDER_PATTERN.findall(content)]
+    separators = len(PLACEHOLDER_PATTERN.sub("", content).encode("utf-8"))
+    size = separators + sum(sizes[i] for i in indices)
+    largest = sorted(((paths[i], sizes[i]) for i in set(indices)), key=lambda item: -item[1])[:top]
+    return OutputEstimate(name, size, estimate_tokens(size, bytes_per_token), len(set(indices)), largest)
+
+
+def estimate_zip(
+    source: bytes | BinaryIO,
+    profile: AnalysisProfile,
+    keep_original_extension: bool = False,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    top: int = DEFAULT_TOP_CONTRIBUTORS,
+    bytes_per_token: float = DEFAULT_BYTES_PER_TOKEN,
+) -> ArchiveEstimate:
+    """
+    Applique les filtres (gatekeeper, profil, règles génériques) et
+    `categorize_file` aux seuls chemins, puis additionne les tailles
+    annoncées par le répertoire central pour chaque fichier produit.
+
+    Les doublons sont repérés sur (CRC32, taille) comme dans le traitement ;
+    les fichiers volumineux comptent pour leur résumé. Les fichiers binaires
+    ne sont pas repérables sans décompression : ils sont comptés, ce qui fait
+    de l'estimation un majorant. Les tokens sont estimés à `bytes_per_token`
+    octets par token.
+    """
+    with CentralDirectoryReader(source) as reader:
+        entry_table = EntryTable.from_records(reader.iter_records())
+    tree_content = entry_table.render_tree()
+    root_node = entry_table.common_root()
+    entry_count = len(entry_table.entries)
+
+    paths: list[str] = []
+    sizes: list[int] = []
+    sans_css: list[bool] = []
+    categorized: list[tuple[ConsolidationBlock, set[str]]] = []
+    seen_contents: dict[tuple[int, int], str] = {}
+    duplicates = DuplicateTracker()  # Seuls ses compteurs servent : le bilan ajouté à __code_complet.txt
+    oversized_count = 0
+    for item in entry_table.entries:
+        path_components = entry_table.components(item.node, root_node)
+        path = "/".join(path_components)
+        if not accepts_path(profile, keep_original_extension, path, path_components):
+            continue
+        if AnalysisProfile.is_always_included(path, path_components):
+            continue  # Documents d'architecture : copiés, jamais consolidés
+        basename = path_components[-1]
+        language = get_language_from_filename(basename)
+        if item.file_size > max_file_size:
+            oversized_count += 1
+            size = _block_size(path, language, _oversized_content_size(item.file_size, max_file_size))
+        elif item.file_size and (item.crc, item.file_size) in seen_contents:  # Fichiers vides jamais dédupliqués
+            duplicates.duplicate_count += 1
+            duplicates.bytes_saved += item.file_size
+            original = seen_contents[(item.crc, item.file_size)]
+            size = len(
+                f"-- DEBUT DU FICHIER --\nChemin: {path}\nLangage: {language}\n-- DOUBLON DE {original} --\n-- FIN DU FICHIER --\n"
+                .encode("utf-8")
+            )
+        else:
+            seen_contents[(item.crc, item.file_size)] = path
+            size = _block_size(path, language, item.file_size)
+        # Marqueur porteur du chemin : les profils aiguillent les blocs d'après leur chemin
+        categorized.append((ConsolidationBlock(PLACEHOLDER.format(len(paths)), path), profile.categorize_file(path)))
+        paths.append(path)
+        sizes.append(size)
+        sans_css.append(not basename.lower().endswith(".css"))
+
+    tree_block = f"--- DEBUT DE L'ARBORESCENCE ---\n{tree_content}\n--- FIN DE L'ARBORESCENCE ---\n"
+    placeholders = [placeholder for placeholder, _ in categorized]
+    tree_size = len(tree_content.encode("utf-8"))
+    outputs = [
+        OutputEstimate("__arborescence.txt", tree_size, estimate_tokens(tree_size, bytes_per_token), 0),
+        _estimate_joined(
+            "__code_complet.txt",
+            "\n".join([tree_block] + placeholders + ([duplicates.summary_block()] if duplicates.duplicate_count else [])),
+            sizes, paths, top, bytes_per_token,
+        ),
+        _estimate_joined(
+            "__code_complet_sans_CSS.txt", "\n".join(p for p, keep in zip(placeholders, sans_css) if keep),
+            sizes, paths, top, bytes_per_token,
+        ),
+    ]
+    for name, content in profile.generate_consolidated_files(categorized).items():
+        outputs.append(_estimate_joined(name, content, sizes, paths, top, bytes_per_token))
+
+    categories: dict[str, tuple[int, int, int]] = {}
+    for (_, file_categories), size in zip(categorized, sizes):
+        for category in file_categories:
+            files, total, _ = categories.get(category, (0, 0, 0))
+            categories[category] = (files + 1, total + size, estimate_tokens(total + size, bytes_per_token))
+
+    largest = sorted(zip(paths, sizes), key=lambda item: -item[1])[:top]
+    return ArchiveEstimate(
+        profile.profile_id, entry_count, len(paths), outputs, categories, largest, duplicates.duplicate_count, oversized_count,
+    )
@@ -0,0 +1,154 @@
+# codetotext_core/processing/outline.py
+# [Version 1.0]
+
+# Mode plan : remplace, dans les consolidations, le contenu des gros fichiers
+# (ou de catégories choisies) par leur structure — classes, fonctions avec
+# signatures et première ligne de docstring — sans les corps.
+
+from __future__ import annotations
+
+import ast
+import os
+import re
+from dataclasses import dataclass, field
+
+from codetotext_core.processing.code_index import extract_symbols, python_signature
+
+# Au-delà de cette taille (octets), un fichier est rendu sous forme de plan.
+DEFAULT_OUTLINE_THRESHOLD: int = 32 * 1024
+DEFAULT_OUTLINE_CATEGORIES: frozenset[str] = frozenset({"BACKEND_UTIL", "OTHER"})
+# Catégories dont le contenu reste toujours intégral.
+DEFAULT_FULL_CATEGORIES: frozenset[str] = frozenset({"BACKEND_CODE_CRITICAL", "BACKEND_SERVICES_CRITICAL"})
+
+_PYTHON_EXTENSIONS = (".py", ".pyi")
+_SCRIPT_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+# Méthode de classe TS/JS : `  async nom<T>(args): Type {` (hors mots-clés de contrôle)
+_JS_METHOD = re.compile(
+    r"^(\s+)(?:(?:public|private|protected|static|async|readonly|override|abstract|get|set)\s+)*"
+    r"(#?[A-Za-z_$][\w$]*)\s*(?:<[^>]*>)?\s*\([^;]*$"
+)
+_JS_STRING = re.compile(r"""(["'`])(?:\\.|(?!\1).)*\1""")
+_JS_CONTROL_KEYWORDS = frozenset({"if", "for", "while", "switch", "catch", "return", "function", "with", "else"})
+
+
+@dataclass(frozen=True)
+class OutlineOptions:
+    """
+    Quand remplacer un fichier par son plan.
+
+    Attributes:
+        size_threshold: Taille (octets) au-delà de laquelle tout fichier
+                        Python/TS/JS est rendu en plan (None = jamais sur la taille).
+        categories: Catégories de profil toujours rendues en plan.
+        full_categories: Catégories toujours conservées intégralement (prioritaires).
+    """
+
+    size_threshold: int | None = DEFAULT_OUTLINE_THRESHOLD
+    categories: frozenset[str] = field(default_factory=lambda: DEFAULT_OUTLINE_CATEGORIES)
+    full_categories: frozenset[str] = field(default_factory=lambda: DEFAULT_FULL_CATEGORIES)
+
+    def applies_to(self, path: str, file_size: int, categories: set[str]) -> bool:
+        if not path.lower().endswith(_PYTHON_EXTENSIONS + _SCRIPT_EXTENSIONS):
+            return False
+        if categories & self.full_categories:
+            return False
+        if categories & self.categories:
+            return True
+        return self.size_threshold is not None and file_size > self.size_threshold
+
+
+def _docstring_first_line(node: ast.AST) -> str | None:
+    docstring = ast.get_docstring(node, clean=True)
+    if not docstring:
+        return None
+    return docstring.strip().splitlines()[0]
+
+
+def outline_python(text: str) -> str | None:
+    """Plan d'un module Python (via `ast`), None si la source est invalide."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return None
+
+    lines: list[str] = []
+    module_doc = _docstring_first_line(tree)
+    if module_doc:
+        lines.append(f'"""{module_doc}"""')
+
+    def visit(body: list[ast.stmt], indent: str) -> None:
+        for node in body:
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                for decorator in node.decorator_list:
+                    lines.append(f"{indent}@{ast.unparse(decorator)}")
+                is_class = isinstance(node, ast.ClassDef)
+                lines.append(f"{indent}{python_signature(node)}:{'' if is_class else ' ...'}  # L{node.lineno}")
+                doc = _docstring_first_line(node)
+                if doc:
+                    lines.append(f'{indent}    """{doc}"""')
+                if is_class:
+                    visit(node.body, indent + "    ")  # Les fonctions imbriquées restent des détails du corps
+            elif not indent and isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                names = [t.id for t in targets if isinstance(t, ast.Name) and t.id.isupper()]
+                if names:
+                    annotation = f": {ast.unparse(node.annotation)}" if isinstance(node, ast.AnnAssign) else ""
+                    lines.append(f"{' = '.join(names)}{annotation} = ...  # L{node.lineno}")
+
+    visit(tree.body, "")
+    return "\n".join(lines)
+
+
+def outline_script(path: str, text: str) -> str:
+    """Plan d'un fichier TS/TSX/JS : définitions de premier niveau et méthodes de classe."""
+    definitions = {line: (kind, signature) for _, _, kind, line, signature in extract_symbols(path, text)}
+    lines: list[str] = []
+    depth = 0
+    class_depths: list[int] = []  # Profondeur d'accolades à l'ouverture de chaque classe
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        code = _JS_STRING.sub("''", line)
+        line_depth = depth
+        depth += code.count("{") - code.count("}")
+        while class_depths and depth <= class_depths[-1]:
+            class_depths.pop()  # Fin du corps de la classe
+
+        definition = definitions.get(line_number)
+        kind = None
+        if definition is not None:
+            kind, signature = definition
+            signature = line[:len(line) - len(line.lstrip())] + signature
+            if kind == "class" and depth > line_depth:
+                class_depths.append(line_depth)
+        else:
+            match = _JS_METHOD.match(line)
+            if (not match or match.group(2) in _JS_CONTROL_KEYWORDS
+                    or not class_depths or line_depth != class_depths[-1] + 1):
+                continue
+            signature = line.rstrip()
+        # Le corps est omis : la ligne est coupée à l'accolade ouvrante
+        signature = signature.rstrip()
+        if signature.endswith("{"):
+            signature = signature[:-1].rstrip() + ("" if kind == "class" else " { … }")
+        lines.append(f"{signature}  // L{line_number}")
+    return "\n".join(lines)
+
+
+def build_outline(path: str, text: str) -> str | None:
+    """
+    Plan d'un fichier source. None si le langage n'est pas pris en charge, si
+    la source est invalide ou si le plan n'apporte rien (vide ou pas plus
+    court que le fichier) : le contenu intégral est alors conservé.
+    """
+    _, ext = os.path.splitext(path.lower())
+    if ext in _PYTHON_EXTENSIONS:
+        outline = outline_python(text)
+    elif ext in _SCRIPT_EXTENSIONS:
+        outline = outline_script(path, text)
+    else:
+        return None
+    if not outline:
+        return None
+    line_count = text.count("\n") + 1
+    rendered = f"(plan : {line_count} lignes, {len(text.encode('utf-8'))} octets ; corps omis)\n{outline}"
+    return rendered if len(rendered) < len(text) else None
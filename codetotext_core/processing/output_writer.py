@@ -0,0 +1,231 @@
+# codetotext_core/processing/output_writer.py
+# [Version 1.3]
+
+from __future__ import annotations
+
+import io
+import tarfile
+import time
+import zipfile
+import zlib
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from codetotext_core.processing.parallel_deflate import DEFAULT_BLOCK_SIZE, ParallelDeflater
+
+_ZIP_COMPRESSIONS: dict[str, int] = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+_TAR_COMPRESSIONS: dict[str, str] = {"none": "", "gz": "gz", "bz2": "bz2", "xz": "xz"}
+# Taille à partir de laquelle un membre deflate est compressé par blocs en parallèle
+PARALLEL_DEFLATE_MIN_SIZE: int = 4 * DEFAULT_BLOCK_SIZE
+# Attribut de ZipInfo portant le niveau de compression : public depuis Python
+# 3.13, privé avant (c'est celui que renseigne `ZipFile.writestr`). None si
+# zipfile n'expose ni l'un ni l'autre : l'écriture par morceaux est alors
+# remplacée par `writestr`.
+_ZIPINFO_LEVEL_ATTRIBUTE: str | None = next(
+    (name for name in ("compress_level", "_compresslevel") if name in getattr(zipfile.ZipInfo, "__slots__", ())),
+    None,
+)
+_ZLIB_COMPRESSOR_TYPE: type = type(zlib.compressobj())
+
+
+@dataclass(frozen=True)
+class OutputFormat:
+    """
+    Format de l'archive de sortie : conteneur, algorithme, niveau et contenu.
+
+    Attributes:
+        container: "zip" ou "tar".
+        compression: Pour "zip" : stored, deflated, bzip2, lzma.
+                     Pour "tar" : none, gz, bz2, xz.
+        level: Niveau de compression (None = défaut de l'algorithme).
+        include_individual_files: Inclure la copie de chaque fichier retenu.
+        include_combined_files: Inclure `__code_complet.txt` et sa variante sans CSS.
+        deflate_workers: Threads de compression des gros membres deflate
+                         (1 = compression en un seul flux, comme zipfile).
+    """
+
+    container: str = "zip"
+    compression: str = "deflated"
+    level: int | None = None
+    include_individual_files: bool = True
+    include_combined_files: bool = True
+    deflate_workers: int = 1
+
+    def __post_init__(self) -> None:
+        if self.container not in ("zip", "tar"):
+            raise ValueError(f"Conteneur de sortie inconnu : {self.container}.")
+        compressions = _ZIP_COMPRESSIONS if self.container == "zip" else _TAR_COMPRESSIONS
+        if self.compression not in compressions:
+            raise ValueError(f"Compression '{self.compression}' invalide pour le conteneur {self.container}.")
+        if self.level is not None and not 0 <= self.level <= 9:
+            raise ValueError("Le niveau de compression doit être compris entre 0 et 9.")
+        if self.deflate_workers < 1:
+            raise ValueError("Le nombre de threads de compression doit être au moins 1.")
+
+    @property
+    def extension(self) -> str:
+        if self.container == "zip":
+            return ".zip"
+        suffix = _TAR_COMPRESSIONS[self.compression]
+        return f".tar.{suffix}" if suffix else ".tar"
+
+
+# Préréglages proposés dans le formulaire : identifiant -> (libellé, format).
+OUTPUT_FORMAT_PRESETS: dict[str, tuple[str, OutputFormat]] = {
+    "zip": ("ZIP (deflate, niveau par défaut)", OutputFormat()),
+    "zip_rapide": ("ZIP rapide (deflate niveau 1)", OutputFormat(compression="deflated", level=1)),
+    "zip_stocke": ("ZIP sans compression (latence minimale)", OutputFormat(compression="stored")),
+    "zip_max": ("ZIP compact (deflate niveau 9)", OutputFormat(compression="deflated", level=9)),
+    "zip_lzma": ("ZIP LZMA (taille minimale)", OutputFormat(compression="lzma")),
+    "tar_gz": ("TAR.GZ", OutputFormat(container="tar", compression="gz")),
+    "tar_xz": ("TAR.XZ (taille minimale)", OutputFormat(container="tar", compression="xz")),
+}
+DEFAULT_OUTPUT_FORMAT: OutputFormat = OUTPUT_FORMAT_PRESETS["zip"][1]
+
+
+class ArchiveWriter:
+    """Interface commune d'écriture des membres de l'archive de sortie."""
+
+    def writestr(self, name: str, data: bytes | str) -> None:
+        raise NotImplementedError
+
+    def write_chunks(self, name: str, chunks: Iterable[bytes], size: int) -> None:
+        """Écrit un membre de `size` octets fourni par morceaux (par défaut : assemblé puis `writestr`)."""
+        self.writestr(name, b"".join(chunks))
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class ZipArchiveWriter(ArchiveWriter):
+    def __init__(self, stream: io.BufferedIOBase, output_format: OutputFormat) -> None:
+        level = output_format.level
+        if level == 0 and output_format.compression == "bzip2":
+            level = 1  # bzip2 n'accepte que les niveaux 1 à 9
+        self._zip = zipfile.ZipFile(
+            stream, "w", _ZIP_COMPRESSIONS[output_format.compression], compresslevel=level
+        )
+        self._deflate_workers = output_format.deflate_workers if output_format.compression == "deflated" else 1
+        self._deflate_executor: ThreadPoolExecutor | None = None
+
+    def writestr(self, name: str, data: bytes | str) -> None:
+        if self._deflate_workers > 1 and len(data) >= PARALLEL_DEFLATE_MIN_SIZE:
+            data = data.encode("utf-8") if isinstance(data, str) else data
+            self.write_chunks(name, (data,), len(data))
+        else:
+            self._zip.writestr(name, data)
+
+    def write_chunks(self, name: str, chunks: Iterable[bytes], size: int) -> None:
+        """
+        Membre écrit comme par `ZipFile.writestr` (en-têtes, CRC, ZIP64), mais
+        par morceaux ; au-delà de PARALLEL_DEFLATE_MIN_SIZE, le compresseur
+        zlib est remplacé par un `ParallelDeflater`.
+
+        Ces deux mécanismes reposent sur des détails internes de zipfile
+        (niveau porté par ZipInfo, attribut `_compressor` du flux d'écriture) :
+        ils sont vérifiés avant usage. À défaut, le membre est écrit en un seul
+        flux (compresseur de zipfile), voire assemblé puis passé à `writestr`.
+        """
+        if _ZIPINFO_LEVEL_ATTRIBUTE is None:
+            self._zip.writestr(name, b"".join(chunks))
+            return
+        zinfo = zipfile.ZipInfo(name, time.localtime(time.time())[:6])
+        zinfo.compress_type = self._zip.compression
+        setattr(zinfo, _ZIPINFO_LEVEL_ATTRIBUTE, self._zip.compresslevel)
+        zinfo.external_attr = 0o600 << 16
+        zinfo.file_size = size
+        with self._zip.open(zinfo, "w") as dest:
+            if self._deflate_workers > 1 and size >= PARALLEL_DEFLATE_MIN_SIZE and self._can_swap_compressor(dest):
+                if self._deflate_executor is None:
+                    self._deflate_executor = ThreadPoolExecutor(self._deflate_workers, thread_name_prefix="deflate")
+                dest._compressor = ParallelDeflater(self._deflate_executor, self._zip.compresslevel)
+            for chunk in chunks:
+                dest.write(chunk)
+
+    @staticmethod
+    def _can_swap_compressor(dest: io.BufferedIOBase) -> bool:
+        """Le flux d'écriture compresse-t-il par un `zlib.compressobj` exposé en `_compressor` ?"""
+        return isinstance(getattr(dest, "_compressor", None), _ZLIB_COMPRESSOR_TYPE)
+
+    def close(self) -> None:
+        try:
+            self._zip.close()
+        finally:
+            if self._deflate_executor is not None:
+                self._deflate_executor.shutdown()
+
+
+class _ChunkReader(io.RawIOBase):
+    """Flux de lecture sur une suite de morceaux (contenu d'un membre TAR écrit par morceaux)."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._chunk = b""
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        parts: list[bytes] = []
+        remaining = size
+        while size < 0 or remaining > 0:
+            if self._position >= len(self._chunk):
+                self._chunk, self._position = next(self._chunks, b""), 0
+                if not self._chunk:
+                    break
+            end = len(self._chunk) if size < 0 else min(len(self._chunk), self._position + remaining)
+            parts.append(self._chunk[self._position:end])
+            remaining -= end - self._position
+            self._position = end
+        return b"".join(parts)
+
+
+class TarArchiveWriter(ArchiveWriter):
+    def __init__(self, stream: io.BufferedIOBase, output_format: OutputFormat) -> None:
+        suffix = _TAR_COMPRESSIONS[output_format.compression]
+        kwargs: dict[str, int] = {}
+        if output_format.level is not None and suffix in ("gz", "bz2"):
+            kwargs["compresslevel"] = max(output_format.level, 1)
+        elif output_format.level is not None and suffix == "xz":
+            kwargs["preset"] = output_format.level
+        self._tar = tarfile.open(fileobj=stream, mode=f"w:{suffix}" if suffix else "w", **kwargs)
+        self._mtime = time.time()
+
+    def writestr(self, name: str, data: bytes | str) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self._mtime
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def write_chunks(self, name: str, chunks: Iterable[bytes], size: int) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = self._mtime
+        info.mode = 0o644
+        self._tar.addfile(info, _ChunkReader(chunks))
+
+    def close(self) -> None:
+        self._tar.close()
+
+
+def open_archive_writer(stream: io.BufferedIOBase, output_format: OutputFormat) -> ArchiveWriter:
+    """Ouvre l'écrivain correspondant au conteneur demandé."""
+    if output_format.container == "tar":
+        return TarArchiveWriter(stream, output_format)
+    return ZipArchiveWriter(stream, output_format)
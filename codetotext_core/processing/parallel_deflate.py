@@ -0,0 +1,84 @@
+# codetotext_core/processing/parallel_deflate.py
+# [Version 1.0]
+
+# Compression deflate par blocs en parallèle (à la manière de pigz) : le flux
+# est découpé en blocs compressés sur des threads (zlib relâche le GIL), chaque
+# bloc amorcé avec les 32 Ko qui le précèdent comme dictionnaire, puis les
+# blocs sont mis bout à bout en un seul flux deflate valide.
+
+from __future__ import annotations
+
+import os
+import zlib
+from concurrent.futures import Executor
+
+DEFAULT_BLOCK_SIZE: int = 256 * 1024
+# Fenêtre deflate : un bloc ne peut référencer que les 32 Ko qui le précèdent
+_WINDOW_SIZE: int = 32 * 1024
+# Threads de compression par défaut (application et CLI)
+DEFAULT_DEFLATE_WORKERS: int = min(4, os.cpu_count() or 1)
+
+
+def _deflate_block(block: memoryview, dictionary: memoryview | None, level: int, final: bool) -> bytes:
+    """
+    Compresse un bloc en deflate brut. Un bloc intermédiaire se termine par
+    Z_SYNC_FLUSH (alignement sur l'octet, sans bit de fin) : les blocs se
+    concatènent tels quels ; seul le dernier termine le flux (Z_FINISH).
+    """
+    if dictionary is not None and len(dictionary):
+        compressor = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, dictionary,
+        )
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelDeflater:
+    """
+    Équivalent de `zlib.compressobj(level, DEFLATED, -15)` (`compress` puis
+    `flush`) dont les blocs sont compressés par `executor`.
+
+    Le résultat n'est pas identique octet pour octet à une compression en un
+    seul flux (quelques octets par bloc, et aucune correspondance plus
+    lointaine que le dictionnaire), mais se décompresse à l'identique.
+    """
+
+    def __init__(self, executor: Executor, level: int | None = None, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        if block_size < _WINDOW_SIZE:
+            raise ValueError(f"Taille de bloc trop petite : {block_size} (minimum {_WINDOW_SIZE}).")
+        self._executor = executor
+        self._level = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        self._block_size = block_size
+        self._pending = b""
+        self._history = b""  # Derniers 32 Ko déjà compressés : dictionnaire du bloc suivant
+
+    def _deflate(self, data: bytes, final: bool) -> bytes:
+        view = memoryview(data)
+        starts = range(0, len(data), self._block_size) if data else range(1)
+        futures = []
+        for start in starts:
+            if start == 0:
+                dictionary = memoryview(self._history) if self._history else None
+            else:
+                dictionary = view[max(0, start - _WINDOW_SIZE):start]
+            last = start == starts[-1]
+            futures.append(self._executor.submit(
+                _deflate_block, view[start:start + self._block_size], dictionary, self._level, final and last,
+            ))
+        self._history = (self._history + bytes(view[-_WINDOW_SIZE:]))[-_WINDOW_SIZE:]
+        return b"".join(future.result() for future in futures)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresse les blocs complets ; le dernier (éventuellement partiel) attend `flush`."""
+        data = self._pending + bytes(data) if self._pending else bytes(data)
+        ready = max(0, (len(data) - 1) // self._block_size) * self._block_size
+        self._pending = data[ready:]
+        if not ready:
+            return b""
+        return self._deflate(data[:ready], final=False)
+
+    def flush(self) -> bytes:
+        """Compresse le reste et termine le flux."""
+        data, self._pending = self._pending, b""
+        return self._deflate(data, final=True)
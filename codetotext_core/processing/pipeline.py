@@ -0,0 +1,638 @@
+# codetotext_core/processing/pipeline.py
+# [Version 1.15]
+
+# Pipeline de transformation d'une archive ZIP en sortie "aplatie".
+# Extrait de app.py pour être utilisable sans Flask (CLI, workers).
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import tarfile
+import zlib
+from collections import deque
+from collections.abc import Callable
+from typing import Any, BinaryIO
+
+from codetotext_core.processing.block_store import MEMORY_CONTENT_LIMIT, BlockRecord, BlockStore
+from codetotext_core.processing.bundle import BundleBuilder
+from codetotext_core.processing.code_index import INDEX_FILENAME, CodeIndexBuilder
+from codetotext_core.processing.compaction import (
+    COMPACTION_WORKERS,
+    CompactionReport,
+    CompactionTask,
+    supports_language,
+)
+from codetotext_core.processing.content_sniffing import (
+    DEFAULT_MAX_FILE_SIZE,
+    SNIFF_SIZE,
+    build_oversized_summary,
+    decode_content,
+    sniff_content,
+)
+from codetotext_core.processing.deduplication import DuplicateTracker
+from codetotext_core.processing.dependency_graph import DEPENDENCIES_FILENAME, DependencyGraph, DependencySelection
+from codetotext_core.processing.outline import OutlineOptions, build_outline
+from codetotext_core.processing.output_writer import (
+    DEFAULT_OUTPUT_FORMAT,
+    ArchiveWriter,
+    OutputFormat,
+    open_archive_writer,
+)
+from codetotext_core.processing.resource_budget import (
+    DEFAULT_RESOURCE_LIMITS,
+    BudgetedArchiveWriter,
+    JobBudget,
+    ResourceLimits,
+    check_central_directory,
+    check_entry_count,
+    job_budget,
+)
+from codetotext_core.profiles.base import AnalysisProfile, ConsolidationBlock
+from codetotext_core.profiles.rule_trace import RULES_TRACE_FILENAME, RuleTracer
+from codetotext_core.utils.entry_table import EntryTable
+from codetotext_core.utils.file_utils import generate_zip_tree, get_language_from_filename
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+logger = logging.getLogger(__name__)
+
+# Extensions d'archives acceptées en entrée, retirées du nom pour nommer la sortie.
+ZIP_EXTENSIONS: tuple[str, ...] = (".zip",)
+TAR_EXTENSIONS: tuple[str, ...] = (".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz", ".tar")
+ARCHIVE_EXTENSIONS: tuple[str, ...] = ZIP_EXTENSIONS + TAR_EXTENSIONS
+# Compactages en cours par passage : de quoi occuper le pool sans retenir plus
+# de MEMORY_CONTENT_LIMIT de texte décodé en attente de son résultat.
+MAX_PENDING_COMPACTIONS: int = 4 * COMPACTION_WORKERS
+
+
+def archive_kind(filename: str) -> str | None:
+    """Retourne "zip" ou "tar" selon l'extension du fichier, None si non supportée."""
+    filename_lower = filename.lower()
+    if filename_lower.endswith(ZIP_EXTENSIONS):
+        return "zip"
+    if filename_lower.endswith(TAR_EXTENSIONS):
+        return "tar"
+    return None
+
+
+def accepts_path(
+    profile: AnalysisProfile, keep_original_extension: bool, path_for_filtering: str, path_components: list[str]
+) -> bool:
+    """Indique si un fichier franchit les filtres (gatekeeper, profil, règles génériques)."""
+    filename_basename = path_components[-1]
+
+    # --- ÉTAPE 1 : GATEKEEPER P_1 (Exclusion Impérative) ---
+    if AnalysisProfile.is_always_ignored(path_for_filtering, path_components):
+        return False  # Skip précoce des fichiers "garbage"
+    # --- FIN DU GATEKEEPER ---
+
+    # --- ÉTAPE 2 : LOGIQUE MÉTIER DU PROFIL ---
+    if profile.is_file_ignored(path_for_filtering, path_components):
+        return False  # Filtrage spécifique au projet
+    # --- FIN LOGIQUE MÉTIER ---
+
+    # Logique de filtrage générique restante
+    if filename_basename.startswith(".") and filename_basename != '.replit':
+        return False
+    if not keep_original_extension and filename_basename.lower().endswith(".txt"):
+        return False
+    return True
+
+
+class FlatteningPass:
+    """
+    État d'un passage de traitement sur les membres d'une archive.
+
+    Applique les filtres (gatekeeper, profil, règles génériques), détecte le
+    contenu, écrit les copies individuelles et accumule les blocs destinés aux
+    consolidations. Partagé par le traitement des ZIP (accès aléatoire) et des
+    TAR (flux séquentiel).
+
+    Les blocs sont écrits une fois dans un magasin sur disque (`BlockStore`) :
+    seuls leurs enregistrements restent en mémoire, et les consolidations sont
+    recopiées du magasin vers les membres de sortie.
+    """
+
+    def __init__(
+        self,
+        zout: ArchiveWriter,
+        profile: AnalysisProfile,
+        keep_original_extension: bool,
+        max_file_size: int,
+        output_format: OutputFormat,
+        build_index: bool = False,
+        compact: bool = False,
+        outline: OutlineOptions | None = None,
+        budget: JobBudget | None = None,
+        selection: DependencySelection | None = None,
+        trace_rules: bool = False,
+        build_bundle: bool = False,
+    ) -> None:
+        self.zout = BudgetedArchiveWriter(zout, budget) if budget is not None else zout
+        self.budget = budget
+        self.profile = profile
+        self.keep_original_extension = keep_original_extension
+        self.max_file_size = max_file_size
+        self.output_format = output_format
+        # Blocs dans l'ordre des fichiers : enregistrement du magasin, ou compactage
+        # en cours dans le pool de processus (avec chemin et catégories), enregistré
+        # dès qu'il se termine ou que trop de compactages sont en attente
+        self.block_store = BlockStore()
+        self.blocks: list[BlockRecord | tuple[CompactionTask, str, set[str]]] = []
+        self.compact = compact
+        self.compaction_report: CompactionReport | None = CompactionReport() if compact else None
+        self.pending_compactions: deque[int] = deque()  # Positions dans `blocks`, dans l'ordre de soumission
+        self.pending_compaction_size = 0
+        self.outline = outline
+        self.outlined_files = 0
+        self.outline_bytes_saved = 0
+        self.duplicate_tracker = DuplicateTracker()
+        self.seen_basenames: set[str] = set()
+        self.code_index: CodeIndexBuilder | None = CodeIndexBuilder() if build_index else None
+        # Sélection par dépendances : imports extraits au fil du passage
+        self.selection = selection
+        self.dependency_graph: DependencyGraph | None = DependencyGraph() if selection is not None else None
+        # Traçage des règles du profil (filtres et catégorisation), rapporté dans __rules_trace.json
+        self.rule_tracer: RuleTracer | None = RuleTracer(profile) if trace_rules else None
+        # Bundle à accès direct : contenus intégraux et table des positions
+        self.bundle: BundleBuilder | None = BundleBuilder() if build_bundle else None
+
+    def accepts(self, path_for_filtering: str, path_components: list[str]) -> bool:
+        """Indique si un fichier franchit les filtres, sur la seule base de son chemin."""
+        return self._apply_rules(
+            path_for_filtering, accepts_path, self.profile, self.keep_original_extension, path_for_filtering,
+            path_components,
+        )
+
+    def _apply_rules(self, path: str, function: Callable[..., Any], *args: Any) -> Any:
+        """Appelle une fonction de règles, tracée au titre du fichier `path` si le traçage est demandé."""
+        if self.rule_tracer is None:
+            return function(*args)
+        return self.rule_tracer.call(path, function, *args)
+
+    def add_file(
+        self,
+        member: BinaryIO,
+        path_for_filtering: str,
+        path_components: list[str],
+        file_size: int,
+        crc: int | None,
+        flatten_name: bool,
+        full_path_in_zip: str,
+    ) -> None:
+        """
+        Traite un fichier accepté par `accepts`.
+
+        Args:
+            member: Flux de lecture du contenu (décompressé) du fichier.
+            file_size: Taille non compressée annoncée par l'archive.
+            crc: CRC32 annoncé par l'archive, ou None s'il doit être calculé.
+            flatten_name: Nommer la copie individuelle d'après le chemin complet
+                          (nom de base ambigu) plutôt que le nom de base.
+            full_path_in_zip: Chemin brut dans l'archive (pour les journaux).
+        """
+        if self.budget is not None:
+            self.budget.check()  # Durée et mémoire, entre deux fichiers
+        filename_basename = path_components[-1]
+        filename_basename_lower = filename_basename.lower()
+        max_file_size = self.max_file_size
+        self.seen_basenames.add(filename_basename)
+
+        # --- ÉTAPE 2b : DÉTECTION DU CONTENU (binaire, encodage, taille) ---
+        # Seuls les premiers Ko sont décompressés avant de décider du sort du fichier.
+        is_oversized = file_size > max_file_size
+        head = member.read(SNIFF_SIZE)
+        sniff = sniff_content(head)
+        if sniff.is_binary:
+            logger.info(f"Fichier binaire ignoré : {full_path_in_zip} ({sniff.reason})")
+            return
+        content = head if is_oversized else head + member.read()
+
+        # Doublon détecté sur le contenu brut : clé (CRC32, taille) puis empreinte
+        duplicate_of = None
+        if not is_oversized and not AnalysisProfile.is_always_included(path_for_filtering, path_components):
+            if crc is None:
+                crc = zlib.crc32(content)
+            duplicate_of = self.duplicate_tracker.find_original(crc, file_size, content, path_for_filtering)
+
+        if is_oversized:
+            file_content_str = build_oversized_summary(head, sniff.encoding, file_size, max_file_size)
+        else:
+            file_content_str = decode_content(content, sniff.encoding)
+            if sniff.encoding != "utf-8":
+                content = file_content_str.encode("utf-8")  # Transcodage de la copie individuelle
+        # --- FIN DÉTECTION DU CONTENU ---
+
+        path_for_display = path_for_filtering
+
+        new_filename_base = path_for_display.replace('/', '.') if flatten_name else filename_basename
+
+        # AC-3 + P_2 : Liste blanche des extensions critiques
+        # Assure la conservation des extensions même en mode textifié
+        extensions_to_keep = {".tsx", ".css", ".html", ".js", ".json", ".py", ".md"}
+        _, ext = os.path.splitext(filename_basename_lower)
+
+        if self.keep_original_extension or ext in extensions_to_keep or filename_basename_lower in ["package.json"]:
+            new_filename_in_zip = new_filename_base
+        else:
+            new_filename_in_zip = new_filename_base + ".txt"
+
+        if filename_basename_lower == "synthèse_développement.md":
+            new_filename_in_zip = new_filename_base
+        elif filename_basename_lower == ".replit":
+            new_filename_in_zip = "replit.txt"
+
+        # Un fichier volumineux n'est pas recopié : seul son résumé figure dans les consolidations
+        if not is_oversized and self.output_format.include_individual_files:
+            self.zout.writestr(new_filename_in_zip, content)
+
+        # --- ÉTAPE 3 : CONTRÔLE DE CONCATÉNATION P_4 ---
+        # Exclut les documents d'architecture des consolidations
+        is_architecture_doc = self._apply_rules(
+            path_for_filtering, AnalysisProfile.is_always_included, path_for_filtering, path_components,
+        )
+        if not is_architecture_doc:  # Condition P_4
+            try:
+                language = get_language_from_filename(filename_basename)
+                # Délégation au profil pour la catégorisation (seulement si pas un doc d'architecture)
+                categories = self._apply_rules(path_for_filtering, self.profile.categorize_file, path_for_filtering)
+                outline_text = None
+                if (self.outline is not None and duplicate_of is None and not is_oversized
+                        and self.outline.applies_to(path_for_filtering, file_size, categories)):
+                    outline_text = build_outline(path_for_filtering, file_content_str)
+
+                file_block: str | None = None
+                if duplicate_of is not None:
+                    file_block = f"-- DEBUT DU FICHIER --\nChemin: {path_for_display}\nLangage: {language}\n-- DOUBLON DE {duplicate_of} --\n-- FIN DU FICHIER --\n"
+                elif outline_text is not None:
+                    # Mode plan : structure seule (signatures, premières lignes de docstring)
+                    file_block = f"-- DEBUT DU FICHIER --\nChemin: {path_for_display}\nLangage: {language}\n-- PLAN DU CODE --\n{outline_text}\n-- FIN DU FICHIER --\n"
+                    self.outlined_files += 1
+                    self.outline_bytes_saved += len(file_content_str.encode("utf-8")) - len(outline_text.encode("utf-8"))
+                elif self.compact and not is_oversized and supports_language(language):
+                    # Compactage (commentaires, docstrings, lignes vides) hors du thread courant
+                    task = CompactionTask(
+                        language, file_content_str,
+                        f"-- DEBUT DU FICHIER --\nChemin: {path_for_display}\nLangage: {language}\n-- CONTENU DU CODE --\n",
+                        "\n-- FIN DU FICHIER --\n",
+                    )
+                    self.pending_compactions.append(len(self.blocks))
+                    self.pending_compaction_size += task.size
+                    self.blocks.append((task, path_for_display, categories))
+                    self._collect_compactions()
+                else:
+                    file_block = f"-- DEBUT DU FICHIER --\nChemin: {path_for_display}\nLangage: {language}\n-- CONTENU DU CODE --\n{file_content_str}\n-- FIN DU FICHIER --\n"
+                if file_block is not None:
+                    self.add_block(file_block, path_for_display, categories)
+
+                # Indexation plein texte et symboles, sur le contenu déjà décodé
+                if self.code_index is not None and duplicate_of is None:
+                    self.code_index.add_file(path_for_display, language, categories, file_content_str)
+                if self.dependency_graph is not None:
+                    self.dependency_graph.add_file(path_for_display, file_content_str)
+                if self.bundle is not None:
+                    self.bundle.add_file(path_for_display, language, categories, file_content_str, duplicate_of)
+
+            except Exception as e:
+                logger.error(f"Erreur préparation contenu de {full_path_in_zip}: {e}")
+        # --- FIN CONTRÔLE P_4 ---
+
+    def add_block(self, block: str, path: str, categories: set[str]) -> BlockRecord:
+        """Écrit le bloc de consolidation d'un fichier dans le magasin, à la suite des précédents."""
+        record = self.block_store.add(block, path, categories)
+        self.blocks.append(record)
+        return record
+
+    def finalize(self, tree_content: str) -> None:
+        """Écrit l'arborescence, les fichiers combinés et les consolidations du profil."""
+        if not self.blocks:
+            raise ValueError("Le fichier ZIP ne contenait aucun fichier traitable après filtrage.")
+
+        zout = self.zout
+        store = self.block_store
+        records = self._resolve_compacted_blocks()
+        zout.writestr("__arborescence.txt", tree_content.encode('utf-8'))
+        tree_block_for_code_complet = f"--- DEBUT DE L'ARBORESCENCE ---\n{tree_content}\n--- FIN DE L'ARBORESCENCE ---\n"
+        final_full_code_content = [tree_block_for_code_complet] + [record.placeholder for record in records]
+        duplicate_tracker = self.duplicate_tracker
+        if duplicate_tracker.duplicate_count:
+            final_full_code_content.append(duplicate_tracker.summary_block())
+            logger.info(
+                f"Déduplication : {duplicate_tracker.duplicate_count} doublon(s), "
+                f"{duplicate_tracker.bytes_saved} octets économisés"
+            )
+        if self.compaction_report is not None and self.compaction_report.by_language:
+            final_full_code_content.append(self.compaction_report.summary_block())
+            logger.info(self.compaction_report.summary_block())
+        if self.outlined_files:
+            final_full_code_content.append(
+                f"--- PLAN : {self.outlined_files} fichier(s) réduit(s) à leur structure, "
+                f"{self.outline_bytes_saved} octets économisés ---"
+            )
+        if self.output_format.include_combined_files:
+            store.write_member(zout, "__code_complet.txt", "\n".join(final_full_code_content))
+            store.write_member(
+                zout, "__code_complet_sans_CSS.txt",
+                "\n".join(record.placeholder for record in records if record.in_sans_css),
+            )
+
+        # Délégation au profil pour les fichiers consolidés (gabarits de marqueurs, recopiés depuis le magasin)
+        consolidated_files = self.profile.generate_consolidated_files(
+            [(ConsolidationBlock(record.placeholder, record.path), record.categories) for record in records]
+        )
+        for filename, template in consolidated_files.items():
+            store.write_member(zout, filename, template)
+
+        if self.rule_tracer is not None:
+            zout.writestr(RULES_TRACE_FILENAME, self.rule_tracer.to_json())
+
+        if self.bundle is not None:
+            logger.info(f"Bundle : {len(self.bundle.entries)} fichier(s)")
+            self.bundle.write(zout)
+
+        if self.code_index is not None:
+            code_index, self.code_index = self.code_index, None
+            logger.info(f"Index : {code_index.file_count} fichier(s), {code_index.symbol_count} symbole(s)")
+            zout.writestr(INDEX_FILENAME, code_index.finish())
+
+        if self.dependency_graph is not None:
+            self._write_dependency_selection(records)
+
+    def _write_dependency_selection(self, records: list[BlockRecord]) -> None:
+        """Consolidation limitée à la fermeture des imports depuis les points d'entrée."""
+        graph, self.dependency_graph = self.dependency_graph, None
+        blocks = {record.path: record for record in records}
+        sizes = {path: record.length for path, record in blocks.items()}
+        closure = graph.closure(self.selection, sizes)
+        logger.info(
+            f"Sélection par dépendances : {len(closure.selected)} fichier(s) sur {len(blocks)}, "
+            f"{closure.selected_bytes} octets"
+        )
+        parts = [closure.summary_block(self.selection, len(blocks))]
+        parts += [blocks[path].placeholder for path, _ in closure.selected]
+        self.block_store.write_member(self.zout, DEPENDENCIES_FILENAME, "\n".join(parts))
+
+    def _store_compaction(self, position: int) -> None:
+        """Enregistre dans le magasin le bloc d'un compactage (en attendant son résultat) et le compte au bilan."""
+        task, path, categories = self.blocks[position]
+        self.blocks[position] = self.block_store.add(task.block(), path, categories)
+        self.compaction_report.add(task.result())
+        self.pending_compaction_size -= task.size
+
+    def _collect_compactions(self) -> None:
+        """
+        Enregistre les compactages terminés, dans l'ordre de soumission ; attend
+        le plus ancien tant que les compactages en attente dépassent
+        MAX_PENDING_COMPACTIONS ou MEMORY_CONTENT_LIMIT caractères.
+        """
+        pending = self.pending_compactions
+        while pending and (
+            len(pending) > MAX_PENDING_COMPACTIONS
+            or self.pending_compaction_size > MEMORY_CONTENT_LIMIT
+            or self.blocks[pending[0]][0].done()
+        ):
+            self._store_compaction(pending.popleft())
+
+    def _resolve_compacted_blocks(self) -> list[BlockRecord]:
+        """Enregistre les compactages encore en attente : tous les blocs sont alors dans le magasin."""
+        while self.pending_compactions:
+            self._store_compaction(self.pending_compactions.popleft())
+        return self.blocks
+
+    def discard(self) -> None:
+        """Libère les ressources temporaires du passage (magasins de blocs et du bundle, index inachevé)."""
+        self.block_store.close()
+        if self.bundle is not None:
+            self.bundle.discard()
+        if self.code_index is not None:
+            self.code_index.discard()
+            self.code_index = None
+
+
+def _output_filename(uploaded_filename: str, keep_original_extension: bool, output_format: OutputFormat) -> str:
+    for archive_extension in ARCHIVE_EXTENSIONS:
+        if uploaded_filename.lower().endswith(archive_extension):
+            original_name_base = uploaded_filename[:-len(archive_extension)]
+            break
+    else:
+        original_name_base, _ = os.path.splitext(uploaded_filename)
+    suffix = ("_flat_orig_ext" if keep_original_extension else "_flat_textified") + output_format.extension
+    return f"{original_name_base}{suffix}"
+
+
+def process_zip_file(
+    input_zip_stream: io.BytesIO,
+    uploaded_filename: str,
+    keep_original_extension: bool,
+    tree_content: str,
+    profile: AnalysisProfile,  # Le profil est maintenant un paramètre
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    output_format: OutputFormat = DEFAULT_OUTPUT_FORMAT,
+    build_index: bool = False,
+    compact: bool = False,
+    outline: OutlineOptions | None = None,
+    limits: ResourceLimits | None = DEFAULT_RESOURCE_LIMITS,
+    selection: DependencySelection | None = None,
+    trace_rules: bool = False,
+    build_bundle: bool = False,
+) -> tuple[io.BytesIO, str]:
+    """
+    Traite un fichier ZIP en utilisant le profil d'analyse fourni.
+
+    Les fichiers binaires (détectés sur leurs premiers Ko) sont ignorés, les
+    fichiers non UTF-8 sont transcodés et les fichiers dépassant
+    `max_file_size` sont résumés sans être décompressés en entier. Les copies
+    identiques d'un même contenu ne sont inlinées qu'une fois dans les
+    consolidations ; les suivantes deviennent une référence `-- DOUBLON DE --`.
+
+    `output_format` choisit le conteneur (ZIP ou TAR), l'algorithme et le niveau
+    de compression, et permet d'omettre les copies individuelles ou les
+    fichiers combinés (`__code_complet*.txt`).
+
+    Avec `build_index`, une base SQLite `__index.sqlite` (index plein texte FTS5
+    et table des symboles) est construite pendant le même passage et ajoutée à
+    la sortie.
+
+    Avec `compact`, les blocs Python, JS/TS, CSS et HTML des consolidations
+    sont compactés (commentaires, docstrings, lignes vides) par un pool de
+    processus ; les copies individuelles et l'index restent intégraux.
+
+    Avec `outline`, les fichiers Python/TS/JS volumineux ou des catégories
+    choisies n'apparaissent dans les consolidations que par leur plan
+    (classes, signatures, premières lignes de docstring).
+
+    `limits` (None = aucune) est vérifié sur le répertoire central avant toute
+    décompression, puis suivi pendant le traitement ; un dépassement lève
+    `BudgetExceeded` (sous-classe de ValueError).
+
+    Avec `selection`, un fichier `__code_dependances.txt` ne consolide que les
+    fichiers atteints par les imports (Python, ES/CommonJS) depuis les points
+    d'entrée choisis, dans la limite de profondeur et de taille.
+
+    Avec `trace_rules`, les règles du profil (filtres et catégorisation) sont
+    tracées et leur bilan (déclenchements, temps, fichiers décidés) est écrit
+    dans `__rules_trace.json`.
+
+    Avec `build_bundle`, le contenu intégral de chaque fichier consolidé est
+    mis bout à bout dans `__bundle.dat`, avec sa table des positions
+    `__bundle_index.json` (lecture directe : `processing.bundle.Bundle`).
+    """
+    output_zip_stream = io.BytesIO()
+    with (
+        CentralDirectoryReader(input_zip_stream) as zin,
+        open_archive_writer(output_zip_stream, output_format) as zout,
+        job_budget(limits) as budget,
+    ):
+        if limits is not None:
+            check_entry_count(zin.entry_count, limits)  # Avant même de parcourir le répertoire central
+        # Table compacte des entrées, lue directement dans le répertoire central
+        # (sans objets ZipInfo) : segments internés, index en tableaux, un seul
+        # enregistrement à slots par fichier. Seuls les fichiers retenus par les
+        # filtres sont ouverts ensuite.
+        entry_table = EntryTable.from_records(zin.iter_records())
+        if limits is not None:
+            check_central_directory(entry_table.entries, limits)
+        root_node = entry_table.common_root()  # Répertoire racine commun retiré des chemins
+
+        basename_counts = entry_table.basename_counts()
+        flattening = FlatteningPass(
+            zout, profile, keep_original_extension, max_file_size, output_format, build_index, compact, outline,
+            budget, selection, trace_rules, build_bundle,
+        )
+
+        try:
+            for item in entry_table.entries:
+                path_components = entry_table.components(item.node, root_node)
+                path_for_filtering = "/".join(path_components)
+                if not flattening.accepts(path_for_filtering, path_components):
+                    continue
+                with zin.open(item) as member:
+                    flattening.add_file(
+                        member, path_for_filtering, path_components, item.file_size, item.crc,
+                        flatten_name=basename_counts[entry_table.segment[item.node]] > 1,
+                        full_path_in_zip=item.filename,
+                    )
+
+            flattening.finalize(tree_content)
+        finally:
+            flattening.discard()
+
+    output_zip_stream.seek(0)
+    return output_zip_stream, _output_filename(uploaded_filename, keep_original_extension, output_format)
+
+
+def process_tar_stream(
+    input_stream: BinaryIO,
+    uploaded_filename: str,
+    keep_original_extension: bool,
+    profile: AnalysisProfile,
+    max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    output_format: OutputFormat = DEFAULT_OUTPUT_FORMAT,
+    build_index: bool = False,
+    compact: bool = False,
+    outline: OutlineOptions | None = None,
+    limits: ResourceLimits | None = DEFAULT_RESOURCE_LIMITS,
+    selection: DependencySelection | None = None,
+    trace_rules: bool = False,
+    build_bundle: bool = False,
+) -> tuple[io.BytesIO, str, str]:
+    """
+    Traite une archive TAR (éventuellement gz/bz2/xz) lue en flux séquentiel.
+
+    Chaque membre est filtré, décodé et écrit dès qu'il est lu : le traitement
+    se fait pendant que le corps de la requête arrive. L'arborescence est
+    construite au fil du même flux.
+
+    Contrairement au ZIP, la liste complète des chemins n'est pas connue à
+    l'avance : le répertoire racine commun est déduit du premier membre, et un
+    nom de base déjà utilisé par une copie individuelle bascule sur le nom
+    "chemin.complet" pour les occurrences suivantes.
+
+    Returns:
+        Le flux de sortie, le nom du fichier de sortie et l'arborescence textuelle.
+    """
+    output_stream = io.BytesIO()
+    entry_table = EntryTable()
+    root_prefix: str | None = None
+
+    try:
+        tar = tarfile.open(fileobj=input_stream, mode="r|*")
+    except tarfile.TarError as e:
+        raise ValueError(f"Archive TAR invalide : {e}")
+
+    with tar, open_archive_writer(output_stream, output_format) as zout, job_budget(limits) as budget:
+        flattening = FlatteningPass(
+            zout, profile, keep_original_extension, max_file_size, output_format, build_index, compact, outline,
+            budget, selection, trace_rules, build_bundle,
+        )
+        try:
+            for tar_member in tar:
+                name = tar_member.name.replace('\\', '/')
+                if name.startswith("./"):
+                    name = name[2:]
+                if budget is not None:
+                    budget.add_entry(tar_member.size)  # Limites du « répertoire central », au fil du flux
+                entry_table.add(name, tar_member.isdir(), file_size=tar_member.size)
+                if not tar_member.isfile():
+                    continue
+
+                if root_prefix is None:
+                    first_component, separator, _ = name.partition('/')
+                    root_prefix = first_component + '/' if separator else ""
+                path_for_filtering = name[len(root_prefix):] if root_prefix and name.startswith(root_prefix) else name
+                path_components = [part for part in path_for_filtering.split('/') if part]
+                if not path_components:
+                    continue
+                path_for_filtering = "/".join(path_components)
+                if not flattening.accepts(path_for_filtering, path_components):
+                    continue  # Les données du membre sont sautées par tarfile au membre suivant
+
+                member = tar.extractfile(tar_member)
+                if member is None:
+                    continue
+                with member:
+                    flattening.add_file(
+                        member, path_for_filtering, path_components, tar_member.size, None,
+                        flatten_name=path_components[-1] in flattening.seen_basenames,
+                        full_path_in_zip=tar_member.name,
+                    )
+            entry_table.freeze()
+            tree_content = entry_table.render_tree()
+            flattening.finalize(tree_content)
+        except tarfile.TarError as e:
+            raise ValueError(f"Archive TAR invalide : {e}")
+        finally:
+            flattening.discard()
+
+    output_stream.seek(0)
+    return output_stream, _output_filename(uploaded_filename, keep_original_extension, output_format), tree_content
+
+
+def process_archive_path(
+    archive_path: str,
+    uploaded_filename: str,
+    keep_original_extension: bool,
+    profile: AnalysisProfile,
+    kind: str | None = None,
+    **options,
+) -> tuple[io.BytesIO, str, str]:
+    """
+    Traite une archive déjà sur disque : ZIP en accès aléatoire, TAR lu en flux.
+
+    Tous les arguments sont sérialisables : la fonction peut s'exécuter dans
+    un processus de travail (`ProcessPoolExecutor`). `kind` ("zip" ou "tar")
+    l'emporte sur l'extension de `uploaded_filename` ; `options` est transmis
+    à `process_zip_file` ou `process_tar_stream`.
+
+    Returns:
+        Le flux de sortie, le nom du fichier de sortie et l'arborescence textuelle.
+    """
+    with open(archive_path, "rb") as f:
+        if (kind or archive_kind(uploaded_filename)) == "tar":
+            return process_tar_stream(f, uploaded_filename, keep_original_extension, profile, **options)
+        tree_content = generate_zip_tree(f)
+        output_stream, output_filename = process_zip_file(
+            f, uploaded_filename, keep_original_extension, tree_content, profile, **options,
+        )
+    return output_stream, output_filename, tree_content
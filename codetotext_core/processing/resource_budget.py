@@ -0,0 +1,239 @@
+# codetotext_core/processing/resource_budget.py
+# [Version 1.2]
+
+# Gouvernance des ressources d'un traitement : limites vérifiées d'emblée sur
+# le répertoire central (nombre d'entrées, taille décompressée, ratio) et
+# budgets suivis pendant le traitement (durée, octets écrits, mémoire).
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from codetotext_core.processing.output_writer import ArchiveWriter
+from codetotext_core.utils.entry_table import ZipEntry
+from codetotext_core.utils.zip_reader import CentralDirectoryReader, CentralDirectoryRecord
+
+
+class BudgetExceeded(ValueError):
+    """
+    Un traitement dépasse une limite de ressources. Hérite de ValueError :
+    les appelants existants le présentent comme une erreur de l'archive.
+    """
+
+    def __init__(self, limit: str, message: str) -> None:
+        super().__init__(message)
+        self.limit = limit
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Limites d'un traitement (None = pas de limite).
+
+    Attributes:
+        max_entries: Nombre d'entrées de l'archive.
+        max_total_uncompressed: Taille décompressée cumulée annoncée (octets).
+        max_compression_ratio: Ratio taille décompressée / compressée de
+                               l'archive et de chaque entrée, vérifié au-delà
+                               de `ratio_check_min_size` octets décompressés
+                               (un petit fichier très répétitif est inoffensif).
+        max_wall_seconds: Durée du traitement.
+        max_output_bytes: Octets (non compressés) écrits dans la sortie.
+        max_memory_growth: Croissance de la mémoire résidente du processus
+                           depuis le début du traitement (octets). La mesure
+                           vaut pour tout le processus : elle n'est faite que
+                           pour un traitement resté seul dans le processus du
+                           début à la fin.
+    """
+
+    max_entries: int | None = 100_000
+    max_total_uncompressed: int | None = 2 * 1024 ** 3
+    max_compression_ratio: float | None = 200.0
+    ratio_check_min_size: int = 64 * 1024 * 1024
+    max_wall_seconds: float | None = 300.0
+    max_output_bytes: int | None = 1024 ** 3
+    max_memory_growth: int | None = 1024 ** 3
+
+
+DEFAULT_RESOURCE_LIMITS: ResourceLimits = ResourceLimits()
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Budgets en cours qui surveillent la mémoire, dans ce processus. Références
+# faibles : un budget abandonné sans close() ne bloque pas les suivants.
+_memory_budgets: weakref.WeakSet[JobBudget] = weakref.WeakSet()
+_memory_budgets_lock = threading.Lock()
+
+
+def _resident_memory() -> int | None:
+    """Mémoire résidente actuelle du processus, None si indisponible (hors Linux)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _format_size(size: float) -> str:
+    return f"{size / (1024 * 1024):.1f} Mo"
+
+
+def check_entry_count(entry_count: int, limits: ResourceLimits) -> None:
+    """Vérification la plus précoce : le nombre d'entrées annoncé par la fin du répertoire central."""
+    if limits.max_entries is not None and entry_count > limits.max_entries:
+        raise BudgetExceeded(
+            "max_entries", f"L'archive contient {entry_count} entrées (limite : {limits.max_entries})."
+        )
+
+
+def check_central_directory(entries: Iterable[ZipEntry | CentralDirectoryRecord], limits: ResourceLimits) -> None:
+    """
+    Vérifie, avant toute décompression, les tailles annoncées par le
+    répertoire central : taille décompressée totale et ratios de compression.
+    """
+    total_uncompressed = total_compressed = count = 0
+    for entry in entries:
+        count += 1
+        total_uncompressed += entry.file_size
+        total_compressed += entry.compress_size
+        if (limits.max_compression_ratio is not None and entry.file_size > limits.ratio_check_min_size
+                and entry.file_size > limits.max_compression_ratio * max(entry.compress_size, 1)):
+            raise BudgetExceeded(
+                "max_compression_ratio",
+                f"Ratio de compression suspect pour {entry.filename} "
+                f"({_format_size(entry.file_size)} pour {entry.compress_size} octets compressés).",
+            )
+    check_entry_count(count, limits)
+    if limits.max_total_uncompressed is not None and total_uncompressed > limits.max_total_uncompressed:
+        raise BudgetExceeded(
+            "max_total_uncompressed",
+            f"Taille décompressée annoncée trop grande : {_format_size(total_uncompressed)} "
+            f"(limite : {_format_size(limits.max_total_uncompressed)}).",
+        )
+    if (limits.max_compression_ratio is not None and total_uncompressed > limits.ratio_check_min_size
+            and total_uncompressed > limits.max_compression_ratio * max(total_compressed, 1)):
+        raise BudgetExceeded(
+            "max_compression_ratio",
+            f"Ratio de compression de l'archive suspect : {total_uncompressed / max(total_compressed, 1):.0f}:1 "
+            f"(limite : {limits.max_compression_ratio:.0f}:1).",
+        )
+
+
+def check_zip_archive(source: bytes | BinaryIO, limits: ResourceLimits) -> None:
+    """Contrôle d'admission d'une archive ZIP, sur son seul répertoire central."""
+    with CentralDirectoryReader(source) as reader:
+        check_entry_count(reader.entry_count, limits)
+        check_central_directory(reader.iter_records(), limits)
+
+
+class JobBudget:
+    """
+    Budgets suivis pendant un traitement. `check()` est appelé entre deux
+    fichiers et à chaque écriture : le dépassement interrompt le traitement
+    par une exception `BudgetExceeded`.
+
+    Pour les flux séquentiels (TAR), dont la liste des entrées n'est pas
+    connue d'avance, `add_entry()` applique au fil de l'eau les limites du
+    répertoire central.
+
+    La mémoire résidente est celle de tout le processus : dès que deux
+    traitements s'y chevauchent, elle ne dit plus rien de chacun, et leur
+    contrôle mémoire est abandonné (les autres limites restent appliquées).
+    `close()`, appelé par `job_budget()`, signale la fin du traitement.
+    """
+
+    def __init__(self, limits: ResourceLimits = DEFAULT_RESOURCE_LIMITS) -> None:
+        self.limits = limits
+        self.started_at = time.monotonic()
+        self.output_bytes = 0
+        self.entry_count = 0
+        self.uncompressed_bytes = 0
+        self._baseline_memory: int | None = None
+        if limits.max_memory_growth is not None:
+            with _memory_budgets_lock:
+                if _memory_budgets:
+                    for other in _memory_budgets:
+                        other._baseline_memory = None  # Mesure désormais partagée avec ce traitement
+                else:
+                    self._baseline_memory = _resident_memory()
+                _memory_budgets.add(self)
+
+    def close(self) -> None:
+        with _memory_budgets_lock:
+            _memory_budgets.discard(self)
+
+    def add_entry(self, file_size: int) -> None:
+        self.entry_count += 1
+        self.uncompressed_bytes += file_size
+        limits = self.limits
+        check_entry_count(self.entry_count, limits)
+        if limits.max_total_uncompressed is not None and self.uncompressed_bytes > limits.max_total_uncompressed:
+            raise BudgetExceeded(
+                "max_total_uncompressed",
+                f"Taille décompressée trop grande (limite : {_format_size(limits.max_total_uncompressed)}).",
+            )
+
+    def add_output(self, size: int) -> None:
+        self.output_bytes += size
+        limits = self.limits
+        if limits.max_output_bytes is not None and self.output_bytes > limits.max_output_bytes:
+            raise BudgetExceeded(
+                "max_output_bytes",
+                f"La sortie dépasse la taille autorisée ({_format_size(limits.max_output_bytes)}).",
+            )
+
+    def check(self) -> None:
+        limits = self.limits
+        elapsed = time.monotonic() - self.started_at
+        if limits.max_wall_seconds is not None and elapsed > limits.max_wall_seconds:
+            raise BudgetExceeded(
+                "max_wall_seconds", f"Traitement interrompu après {elapsed:.0f} s (limite : {limits.max_wall_seconds:.0f} s)."
+            )
+        if self._baseline_memory is not None:
+            current = _resident_memory()
+            if current is not None and current - self._baseline_memory > limits.max_memory_growth:
+                raise BudgetExceeded(
+                    "max_memory_growth",
+                    f"Traitement interrompu : mémoire consommée supérieure à {_format_size(limits.max_memory_growth)}.",
+                )
+
+
+@contextmanager
+def job_budget(limits: ResourceLimits | None) -> Iterator[JobBudget | None]:
+    """Budget d'un traitement, fermé à sa sortie ; None sans limites."""
+    if limits is None:
+        yield None
+        return
+    budget = JobBudget(limits)
+    try:
+        yield budget
+    finally:
+        budget.close()
+
+
+class BudgetedArchiveWriter(ArchiveWriter):
+    """Écrivain de sortie qui impute chaque membre écrit au budget du traitement."""
+
+    def __init__(self, writer: ArchiveWriter, budget: JobBudget) -> None:
+        self._writer = writer
+        self._budget = budget
+
+    def writestr(self, name: str, data: bytes | str) -> None:
+        self._budget.add_output(len(data))
+        self._budget.check()
+        self._writer.writestr(name, data)
+
+    def write_chunks(self, name: str, chunks: Iterable[bytes], size: int) -> None:
+        self._budget.add_output(size)
+        self._budget.check()
+        self._writer.write_chunks(name, chunks, size)
+
+    def close(self) -> None:
+        self._writer.close()
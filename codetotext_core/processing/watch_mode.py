@@ -0,0 +1,317 @@
+# codetotext_core/processing/watch_mode.py
+# [Version 1.1]
+
+# Mode surveillance : tient à jour, dans un dossier de sortie, la version
+# aplatie d'un dossier de projet local. Seuls les fichiers modifiés sont relus ;
+# les consolidations sont recomposées à partir des blocs déjà calculés.
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from codetotext_core.processing.content_sniffing import DEFAULT_MAX_FILE_SIZE
+from codetotext_core.processing.outline import OutlineOptions
+from codetotext_core.processing.output_writer import DEFAULT_OUTPUT_FORMAT, ArchiveWriter
+from codetotext_core.processing.pipeline import FlatteningPass, accepts_path
+from codetotext_core.profiles.base import AnalysisProfile
+from codetotext_core.utils.entry_table import EntryTable
+
+logger = logging.getLogger(__name__)
+
+# Dossiers jamais parcourus, en plus des dossiers ignorés par le profil (IGNORED_DIRS_OR_COMPONENTS).
+_PRUNED_DIRECTORIES: frozenset[str] = frozenset({".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv"})
+
+DEFAULT_POLL_INTERVAL: float = 0.2
+# Délai sans nouvel événement avant d'appliquer une rafale de modifications.
+DEFAULT_DEBOUNCE: float = 0.05
+
+# (mtime en ns, taille) de chaque fichier du dossier, par chemin relatif
+Snapshot = dict[str, tuple[int, int]]
+
+
+@dataclass
+class _RenderedFile:
+    """Résultat du traitement d'un seul fichier : copies individuelles et bloc de consolidation."""
+
+    members: dict[str, bytes]
+    block: str | None = None
+    categories: set[str] = field(default_factory=set)
+    flatten_name: bool = False
+
+
+@dataclass
+class WatchUpdate:
+    """Bilan d'une mise à jour incrémentale."""
+
+    added: list[str]
+    modified: list[str]
+    removed: list[str]
+    rewritten_outputs: int
+    elapsed_ms: float
+
+    def summary_line(self) -> str:
+        return (
+            f"{len(self.added)} ajouté(s), {len(self.modified)} modifié(s), {len(self.removed)} supprimé(s) "
+            f"-> {self.rewritten_outputs} sortie(s) réécrite(s) en {self.elapsed_ms:.1f} ms"
+        )
+
+
+class _RecordingWriter(ArchiveWriter):
+    """Capture les membres écrits par une passe limitée à un fichier."""
+
+    def __init__(self) -> None:
+        self.members: dict[str, bytes] = {}
+
+    def writestr(self, name: str, data: bytes | str) -> None:
+        self.members[name] = data.encode("utf-8") if isinstance(data, str) else data
+
+    def close(self) -> None:
+        pass
+
+
+class DirectoryOutputWriter(ArchiveWriter):
+    """
+    Écrit les membres de sortie comme fichiers d'un dossier, en ne touchant
+    que ceux dont le contenu a changé (empreinte du dernier contenu écrit).
+
+    Entre `begin()` et `end()`, tout membre ni écrit ni conservé (`keep`) est
+    supprimé : une consolidation devenue vide ou la copie d'un fichier
+    supprimé disparaissent de la sortie.
+    """
+
+    def __init__(self, output_dir: str) -> None:
+        self.output_dir = output_dir
+        self._digests: dict[str, bytes] = {}
+        self._touched: set[str] = set()
+        self.rewritten = 0
+
+    def begin(self) -> None:
+        self._touched = set()
+        self.rewritten = 0
+
+    def keep(self, name: str) -> None:
+        self._touched.add(name)
+
+    def writestr(self, name: str, data: bytes | str) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._touched.add(name)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if self._digests.get(name) == digest:
+            return
+        path = os.path.join(self.output_dir, name)
+        # Renommage atomique sans fsync : la sortie se régénère, la latence prime
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._digests[name] = digest
+        self.rewritten += 1
+
+    def end(self) -> None:
+        for name in [name for name in self._digests if name not in self._touched]:
+            del self._digests[name]
+            try:
+                os.remove(os.path.join(self.output_dir, name))
+            except FileNotFoundError:
+                pass
+            self.rewritten += 1
+
+    def close(self) -> None:
+        pass
+
+
+class DirectoryFlattener:
+    """
+    Version aplatie d'un dossier local, maintenue de façon incrémentale.
+
+    L'état conserve, pour chaque fichier retenu, ses copies individuelles et
+    son bloc de consolidation. Une mise à jour ne relit que les fichiers
+    ajoutés ou modifiés (et ceux dont le nom de copie change parce qu'un nom
+    de base devient ambigu ou ne l'est plus), puis recompose les fichiers
+    combinés et les consolidations du profil ; seules les sorties dont le
+    contenu change sont réécrites.
+
+    Contrairement au traitement d'une archive, les doublons ne sont pas
+    détectés : chaque fichier est rendu indépendamment des autres.
+    """
+
+    def __init__(
+        self,
+        source_dir: str,
+        output_dir: str,
+        profile: AnalysisProfile,
+        keep_original_extension: bool = False,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        outline: OutlineOptions | None = None,
+    ) -> None:
+        self.source_dir = os.path.abspath(source_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.profile = profile
+        self.keep_original_extension = keep_original_extension
+        self.max_file_size = max_file_size
+        self.outline = outline
+        self.writer = DirectoryOutputWriter(self.output_dir)
+        self.snapshot: Snapshot = {}
+        self.rendered: dict[str, _RenderedFile] = {}
+        self.tree_content = ""
+        self._basename_counts: Counter[str] = Counter()
+        self._pruned = _PRUNED_DIRECTORIES | frozenset(getattr(profile, "IGNORED_DIRS_OR_COMPONENTS", ()))
+
+    def scan(self) -> Snapshot:
+        """Parcourt le dossier (sans lire les fichiers) : (mtime, taille) par chemin relatif."""
+        snapshot: Snapshot = {}
+        pending = [(self.source_dir, "")]
+        while pending:
+            directory, prefix = pending.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self._pruned and entry.path != self.output_dir:
+                                pending.append((entry.path, f"{prefix}{entry.name}/"))
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            snapshot[prefix + entry.name] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue  # Fichier supprimé pendant le parcours
+        return snapshot
+
+    def update(self, snapshot: Snapshot | None = None) -> WatchUpdate | None:
+        """Applique les changements depuis le dernier état ; None si rien n'a changé."""
+        started_at = time.perf_counter()
+        if snapshot is None:
+            snapshot = self.scan()
+        previous = self.snapshot
+        added = sorted(path for path in snapshot if path not in previous)
+        removed = sorted(path for path in previous if path not in snapshot)
+        modified = sorted(path for path in snapshot if path in previous and previous[path] != snapshot[path])
+        if not (added or removed or modified) and previous:
+            return None
+
+        to_render = set(added) | set(modified)
+        if added or removed:
+            # Un nom de base qui devient ambigu (ou ne l'est plus) renomme les copies existantes
+            self._basename_counts = Counter(path.rsplit("/", 1)[-1] for path in snapshot)
+            for path, rendered in self.rendered.items():
+                if rendered.flatten_name != (self._basename_counts[path.rsplit("/", 1)[-1]] > 1):
+                    to_render.add(path)
+            self.tree_content = self._render_tree(snapshot)
+        for path in removed:
+            self.rendered.pop(path, None)
+        for path in sorted(to_render):
+            self._render(path)
+        self.snapshot = snapshot
+
+        rewritten = self._write_outputs(to_render)
+        return WatchUpdate(added, modified, removed, rewritten, (time.perf_counter() - started_at) * 1000)
+
+    def _render_tree(self, snapshot: Snapshot) -> str:
+        entry_table = EntryTable()
+        root_name = os.path.basename(self.source_dir) or self.source_dir
+        for path, (_, size) in snapshot.items():
+            entry_table.add(f"{root_name}/{path}", False, file_size=size)
+        entry_table.freeze()
+        return entry_table.render_tree()
+
+    def _render(self, path: str) -> None:
+        """(Re)traite un seul fichier avec les règles du pipeline, par une passe dédiée."""
+        self.rendered.pop(path, None)
+        path_components = path.split("/")
+        if not accepts_path(self.profile, self.keep_original_extension, path, path_components):
+            return
+        recorder = _RecordingWriter()
+        flattening = FlatteningPass(
+            recorder, self.profile, self.keep_original_extension, self.max_file_size, DEFAULT_OUTPUT_FORMAT,
+            outline=self.outline,
+        )
+        flatten_name = self._basename_counts[path_components[-1]] > 1
+        try:
+            with open(os.path.join(self.source_dir, *path_components), "rb") as member:
+                flattening.add_file(
+                    member, path, path_components, os.fstat(member.fileno()).st_size, None,
+                    flatten_name=flatten_name, full_path_in_zip=path,
+                )
+            rendered = _RenderedFile(recorder.members, flatten_name=flatten_name)
+            if flattening.blocks:
+                record = flattening.blocks[0]
+                rendered.block = flattening.block_store.read_text(record)
+                rendered.categories = record.categories
+        except OSError as e:
+            logger.info(f"Fichier illisible ignoré : {path} ({e})")
+            return
+        finally:
+            flattening.discard()
+        self.rendered[path] = rendered
+
+    def _write_outputs(self, rendered_paths: set[str]) -> int:
+        """
+        Écrit les sorties à partir des blocs mémorisés, via une passe de
+        consolidation. Les copies individuelles des fichiers non retraités
+        sont conservées telles quelles, sans être recomparées.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        writer = self.writer
+        writer.begin()
+        consolidation = FlatteningPass(
+            writer, self.profile, self.keep_original_extension, self.max_file_size, DEFAULT_OUTPUT_FORMAT,
+        )
+        for path in sorted(self.rendered):
+            rendered = self.rendered[path]
+            for name, data in rendered.members.items():
+                if path in rendered_paths:
+                    writer.writestr(name, data)
+                else:
+                    writer.keep(name)
+            if rendered.block is not None:
+                consolidation.add_block(rendered.block, path, rendered.categories)
+        try:
+            consolidation.finalize(self.tree_content)
+        except ValueError as e:
+            logger.warning(str(e))  # Aucun fichier retenu : seule l'arborescence est écrite
+            writer.writestr("__arborescence.txt", self.tree_content)
+        finally:
+            consolidation.discard()
+        writer.end()
+        return writer.rewritten
+
+
+def watch_directory(
+    flattener: DirectoryFlattener,
+    on_update: Callable[[WatchUpdate], None],
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE,
+    stop_event: threading.Event | None = None,
+) -> None:
+    """
+    Surveille le dossier par scrutation (bibliothèque standard seule) jusqu'à
+    `stop_event`. Une rafale d'événements (enregistrement par un éditeur,
+    checkout) n'est appliquée qu'une fois le dossier stable pendant `debounce`.
+    """
+    stop_event = stop_event or threading.Event()
+    update = flattener.update()
+    if update is not None:
+        on_update(update)
+    while not stop_event.wait(poll_interval):
+        snapshot = flattener.scan()
+        if snapshot == flattener.snapshot:
+            continue
+        while not stop_event.wait(debounce):
+            settled = flattener.scan()
+            if settled == snapshot:
+                break
+            snapshot = settled
+        update = flattener.update(snapshot)
+        if update is not None:
+            on_update(update)
@@ -1,5 +1,5 @@
 # codetotext_core/profiles/base.py
-# [Version 2.3]
+# [Version 2.6]
 
 from __future__ import annotations
 
@@ -8,6 +8,22 @@ from collections.abc import Iterable
 import os
 
 
+class ConsolidationBlock(str):
+    """
+    Bloc de consolidation d'un fichier (ou marqueur qui le remplace) remis à
+    `generate_consolidated_files` : une chaîne, à joindre telle quelle, qui
+    porte aussi le chemin du fichier. Un aiguillage d'après le fichier doit se
+    faire sur `path`, jamais sur le texte, qui peut n'être qu'un marqueur opaque.
+    """
+
+    __slots__ = ("path",)
+
+    def __new__(cls, block: str, path: str) -> ConsolidationBlock:
+        instance = super().__new__(cls, block)
+        instance.path = path
+        return instance
+
+
 class AnalysisProfile(abc.ABC):
     """
     Classe de base abstraite pour un profil d'analyse de projet.
@@ -79,6 +95,12 @@ class AnalysisProfile(abc.ABC):
         "dump.rdb", # Explicite au cas où l'extension manque
     }
 
+    # SIGNATURES DE CHEMINS pour la détection automatique du profil : chemin
+    # exact (relatif à la racine du projet) ou préfixe de dossier s'il se
+    # termine par "/", avec son poids. Sans signature, un profil n'est jamais
+    # détecté (il peut rester le profil de repli).
+    PATH_SIGNATURES: dict[str, float] = {}
+
     @staticmethod
     def is_always_included(path_in_zip: str, path_components: list[str]) -> bool:
         """
@@ -166,15 +188,18 @@ class AnalysisProfile(abc.ABC):
 
     @abc.abstractmethod
     def generate_consolidated_files(
-        self, categorized_files: list[tuple[str, set[str]]]
+        self, categorized_files: list[tuple[ConsolidationBlock, set[str]]]
     ) -> dict[str, str]:
         """
         Génère le contenu des fichiers consolidés spécifiques à ce profil.
 
         Args:
             categorized_files: Une liste de tuples, où chaque tuple contient
-                               le bloc de contenu d'un fichier et l'ensemble de
-                               ses catégories.
+                               le bloc d'un fichier et l'ensemble de ses
+                               catégories. Le pipeline passe des marqueurs
+                               opaques à la place du texte des blocs (magasin
+                               de blocs) : leur contenu ne doit pas servir à
+                               les trier, seul leur chemin (`block.path`) le peut.
 
         Returns:
             Un dictionnaire où les clés sont les noms des fichiers à générer
@@ -0,0 +1,117 @@
+# codetotext_core/profiles/detection.py
+# [Version 1.0]
+
+# Détection automatique du profil d'analyse : chaque profil enregistré est
+# évalué sur la seule liste des chemins de l'archive (répertoire central),
+# d'après les signatures qu'il déclare (`AnalysisProfile.PATH_SIGNATURES`).
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from codetotext_core.profiles.base import AnalysisProfile
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+# Identifiant proposé dans le formulaire, l'API et la CLI à la place d'un profil.
+AUTO_PROFILE_ID: str = "auto"
+AUTO_PROFILE_NAME: str = "Détection automatique"
+FALLBACK_PROFILE_ID: str = "complet"
+# Score minimal pour retenir un profil plutôt que le profil de repli.
+MIN_DETECTION_SCORE: float = 1.0
+
+
+@dataclass(frozen=True)
+class ProfileDetection:
+    """Profil retenu, son score et les scores de tous les profils dotés de signatures."""
+
+    profile_id: str
+    score: float
+    scores: dict[str, float]
+
+    @property
+    def is_fallback(self) -> bool:
+        return self.score < MIN_DETECTION_SCORE
+
+    def summary_line(self) -> str:
+        if self.is_fallback:
+            return f"Profil détecté : aucun projet reconnu, repli sur « {self.profile_id} »."
+        return f"Profil détecté : « {self.profile_id} » (score {self.score:g})."
+
+
+def _common_root_prefix(paths: list[str]) -> str:
+    """Dossier de premier niveau commun à tous les chemins (ex: "mon_projet/"), "" s'il n'y en a pas."""
+    if not paths:
+        return ""
+    first, separator, _ = paths[0].partition("/")
+    prefix = first + separator
+    if not separator or not all(path.startswith(prefix) for path in paths):
+        return ""
+    return prefix
+
+
+def detect_profile(
+    paths: Iterable[str],
+    profiles: Mapping[str, AnalysisProfile],
+    fallback_profile_id: str = FALLBACK_PROFILE_ID,
+) -> ProfileDetection:
+    """
+    Évalue chaque profil sur la liste des chemins de l'archive.
+
+    Chaque signature compte une fois, dès qu'un chemin la vérifie. Les
+    dossiers ne sont examinés qu'une fois, quel que soit leur nombre de
+    fichiers : le coût reste proportionnel au nombre de dossiers distincts.
+    Plutôt que de retirer la racine commune de chaque chemin, elle est
+    ajoutée aux signatures (qui restent aussi cherchées telles quelles, au
+    cas où la racine commune fait partie du projet).
+    """
+    paths = list(paths)
+    root = _common_root_prefix(paths)
+    exact: dict[str, list[tuple[str, str, float]]] = {}
+    prefixes: dict[str, list[tuple[str, str, float]]] = {}
+    for profile_id, profile in profiles.items():
+        for signature, weight in profile.PATH_SIGNATURES.items():
+            index = prefixes if signature.endswith("/") else exact
+            for key in {signature, root + signature}:
+                index.setdefault(key, []).append((profile_id, signature, weight))
+
+    matched: set[tuple[str, str, float]] = set()
+    seen_directories: set[str] = set()
+    for path in paths:
+        hits = exact.get(path)
+        if hits:
+            matched.update(hits)
+        directory_end = path.rfind("/")
+        if directory_end < 0 or not prefixes:
+            continue
+        directory = path[:directory_end + 1]
+        if directory in seen_directories:
+            continue
+        seen_directories.add(directory)
+        position = directory.find("/")
+        while position >= 0:
+            hits = prefixes.get(directory[:position + 1])
+            if hits:
+                matched.update(hits)
+            position = directory.find("/", position + 1)
+
+    scores = {profile_id: 0.0 for profile_id, profile in profiles.items() if profile.PATH_SIGNATURES}
+    for profile_id, _, weight in matched:
+        scores[profile_id] += weight
+    best_id = max(scores, key=scores.__getitem__, default=None)  # Premier profil enregistré en cas d'égalité
+    best_score = scores[best_id] if best_id is not None else 0.0
+    if best_score < MIN_DETECTION_SCORE:
+        return ProfileDetection(fallback_profile_id, best_score, scores)
+    return ProfileDetection(best_id, best_score, scores)
+
+
+def detect_zip_profile(
+    source: bytes | BinaryIO,
+    profiles: Mapping[str, AnalysisProfile],
+    fallback_profile_id: str = FALLBACK_PROFILE_ID,
+) -> ProfileDetection:
+    """Détection sur le répertoire central d'une archive ZIP, sans rien décompresser."""
+    with CentralDirectoryReader(source) as reader:
+        paths = [record.filename.replace("\\", "/") for record in reader.iter_records()]
+    return detect_profile(paths, profiles, fallback_profile_id)
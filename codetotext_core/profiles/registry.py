@@ -0,0 +1,203 @@
+# codetotext_core/profiles/registry.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+
+from codetotext_core.profiles.base import AnalysisProfile
+
+# Groupe de points d'entrée permettant à un paquet tiers de déclarer ses profils :
+#   [project.entry-points."codetotext.profiles"]
+#   mon_profil = "mon_paquet.profils:MonProfil"
+ENTRY_POINT_GROUP: str = "codetotext.profiles"
+
+# Profils fournis avec l'application : identifiant -> "module:Classe".
+# L'ordre est celui du menu déroulant.
+BUILTIN_PROFILES: dict[str, str] = {
+    "admin_scolaire": "analysis_profiles:AdminScolaireProfile",
+    "scenario_builder": "analysis_profiles:ScenarioBuilderProfile",
+    "codetotext": "analysis_profiles:CodeToTextProfile",
+    "complet": "analysis_profiles:CompleteProfile",
+    "mermaid": "analysis_profiles:MermaidProfile",
+}
+
+# Version du format du cache disque ; à incrémenter si sa structure change.
+_CACHE_FORMAT_VERSION: int = 1
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR: str = os.environ.get(
+    "CODETOTEXT_CACHE_DIR", os.path.join(_PROJECT_ROOT, "instance", "cache")
+)
+
+
+@dataclass(frozen=True)
+class ProfileDescriptor:
+    """Description d'un profil, suffisante pour l'affichage sans l'importer."""
+
+    profile_id: str
+    profile_name: str
+    target: str  # "module:Classe"
+
+
+def _module_mtime(module_name: str) -> int | None:
+    """Date de modification du fichier source d'un module, sans l'exécuter."""
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return None
+    return os.stat(spec.origin).st_mtime_ns
+
+
+def _site_packages_fingerprint() -> list[list]:
+    """
+    Dates de modification des dossiers de paquets installés de sys.path : elles
+    changent à chaque installation ou désinstallation, donc à chaque ajout ou
+    retrait potentiel d'un point d'entrée.
+    """
+    fingerprint = []
+    for path in sys.path:
+        if os.path.basename(path) in ("site-packages", "dist-packages") and os.path.isdir(path):
+            fingerprint.append([path, os.stat(path).st_mtime_ns])
+    return fingerprint
+
+
+class ProfileRegistry(Mapping[str, AnalysisProfile]):
+    """
+    Registre paresseux des profils d'analyse.
+
+    Les profils sont découverts via `BUILTIN_PROFILES` et les points d'entrée
+    `ENTRY_POINT_GROUP`, mais un module de profils n'est importé, et un profil
+    construit, qu'au premier accès à cet identifiant. La table compilée
+    (identifiants, noms, cibles) est mise en cache sur disque entre deux
+    exécutions : la liste des profils s'affiche alors sans aucun import, tant
+    que les modules sources et les paquets installés n'ont pas changé.
+    """
+
+    def __init__(
+        self,
+        builtin_profiles: dict[str, str] | None = None,
+        entry_point_group: str | None = ENTRY_POINT_GROUP,
+        cache_dir: str | None = DEFAULT_CACHE_DIR,
+    ) -> None:
+        self._builtin_profiles = dict(BUILTIN_PROFILES if builtin_profiles is None else builtin_profiles)
+        self._entry_point_group = entry_point_group
+        self._cache_path = os.path.join(cache_dir, "profile_registry.json") if cache_dir else None
+        self._targets: dict[str, str] | None = None
+        self._descriptors: list[ProfileDescriptor] | None = None
+        self._instances: dict[str, AnalysisProfile] = {}
+
+    # --------------------------------------------------------------------------
+    # Découverte
+    # --------------------------------------------------------------------------
+
+    def _discover_targets(self) -> dict[str, str]:
+        targets = dict(self._builtin_profiles)
+        if self._entry_point_group:
+            from importlib.metadata import entry_points  # Coûteux : parcourt les paquets installés
+            for entry_point in entry_points(group=self._entry_point_group):
+                targets.setdefault(entry_point.name, entry_point.value)
+        return targets
+
+    @property
+    def targets(self) -> dict[str, str]:
+        """Identifiant -> "module:Classe" de chaque profil connu."""
+        if self._targets is None:
+            cached = self._load_cache()
+            if cached is not None:
+                self._targets = {d.profile_id: d.target for d in cached}
+                self._descriptors = cached
+            else:
+                self._targets = self._discover_targets()
+        return self._targets
+
+    def descriptors(self) -> list[ProfileDescriptor]:
+        """Descriptions de tous les profils, dans l'ordre d'enregistrement."""
+        if self._descriptors is None:
+            targets = self.targets
+            if self._descriptors is None:
+                self._descriptors = [
+                    ProfileDescriptor(profile_id, self[profile_id].profile_name, target)
+                    for profile_id, target in targets.items()
+                ]
+                self._save_cache(self._descriptors)
+        return self._descriptors
+
+    # --------------------------------------------------------------------------
+    # Cache disque
+    # --------------------------------------------------------------------------
+
+    def _fingerprint(self, targets: dict[str, str]) -> dict:
+        modules = sorted({target.split(":", 1)[0] for target in targets.values()})
+        return {
+            "version": _CACHE_FORMAT_VERSION,
+            "builtins": self._builtin_profiles,
+            "entry_point_group": self._entry_point_group,
+            "modules": {module: _module_mtime(module) for module in modules},
+            "site_packages": _site_packages_fingerprint() if self._entry_point_group else [],
+        }
+
+    def _load_cache(self) -> list[ProfileDescriptor] | None:
+        if not self._cache_path:
+            return None
+        try:
+            with open(self._cache_path, encoding="utf-8") as f:
+                payload = json.load(f)
+            descriptors = [ProfileDescriptor(**item) for item in payload["profiles"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if payload.get("fingerprint") != self._fingerprint({d.profile_id: d.target for d in descriptors}):
+            return None
+        return descriptors
+
+    def _save_cache(self, descriptors: list[ProfileDescriptor]) -> None:
+        if not self._cache_path:
+            return
+        payload = {
+            "fingerprint": self._fingerprint({d.profile_id: d.target for d in descriptors}),
+            "profiles": [d.__dict__ for d in descriptors],
+        }
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            # Écriture atomique : fichier temporaire puis renommage
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._cache_path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self._cache_path)
+        except OSError:
+            pass  # Le cache est une optimisation : son absence n'est pas une erreur
+
+    # --------------------------------------------------------------------------
+    # Interface Mapping
+    # --------------------------------------------------------------------------
+
+    def __getitem__(self, profile_id: str) -> AnalysisProfile:
+        profile = self._instances.get(profile_id)
+        if profile is None:
+            target = self.targets[profile_id]  # KeyError si le profil est inconnu
+            module_name, _, class_name = target.partition(":")
+            profile_class = getattr(importlib.import_module(module_name), class_name)
+            profile = self._instances[profile_id] = profile_class()
+        return profile
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.targets)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def __contains__(self, profile_id: object) -> bool:
+        return profile_id in self.targets
+
+
+# Registre global utilisé par l'application web et la CLI.
+PROFILES: ProfileRegistry = ProfileRegistry()
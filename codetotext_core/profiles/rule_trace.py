@@ -0,0 +1,236 @@
+# codetotext_core/profiles/rule_trace.py
+# [Version 1.0]
+
+# Traçage des règles d'un profil : pour chaque règle (`if` / `elif`) de
+# `is_always_ignored`, `is_always_included`, `is_file_ignored` et
+# `categorize_file`, nombre d'évaluations et de déclenchements, temps passé
+# dans la condition et fichiers dont elle a décidé le sort. Les règles sont
+# repérées dans le source des méthodes (ast) ; le suivi passe par sys.settrace,
+# limité aux seules méthodes de règles et aux appels tracés.
+
+from __future__ import annotations
+
+import ast
+import inspect
+import json
+import sys
+import textwrap
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import CodeType, FrameType
+from typing import Any
+
+from codetotext_core.profiles.base import AnalysisProfile
+
+RULES_TRACE_FILENAME: str = "__rules_trace.json"
+TRACED_METHODS: tuple[str, ...] = ("is_always_ignored", "is_always_included", "is_file_ignored", "categorize_file")
+# Fichiers cités en exemple par règle, et règles listées parmi les plus coûteuses
+DEFAULT_EXAMPLES: int = 5
+DEFAULT_SLOWEST: int = 10
+
+
+@dataclass(eq=False)
+class RuleStats:
+    """Une règle (`if` / `elif`) et son bilan : la condition s'étend sur `header`, le corps sur `body`."""
+
+    line: int
+    source: str
+    header: tuple[int, int]
+    body: tuple[int, int]
+    one_liner: bool
+    evaluations: int = 0
+    matches: int = 0
+    time_ns: int = 0
+    decided: int = 0
+    results: Counter[str] = field(default_factory=Counter)
+    examples: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "line": self.line, "source": self.source, "evaluations": self.evaluations, "matches": self.matches,
+            "time_ms": round(self.time_ns / 1e6, 3), "decided": self.decided, "results": dict(self.results),
+            "examples": self.examples,
+        }
+
+
+class MethodRules:
+    """Règles d'une méthode, repérées dans son source, et bilan de ses appels."""
+
+    def __init__(self, function: Callable[..., Any]) -> None:
+        self.label = function.__qualname__
+        self.calls = 0
+        self.time_ns = 0
+        self.undecided = 0  # Appels conclus sans qu'aucune règle ne se déclenche
+        self.rules: list[RuleStats] = []
+        self.header_rules: dict[int, RuleStats] = {}  # Ligne de condition -> règle
+        self.body_offsets: dict[int, RuleStats] = {}  # Instruction du corps d'une règle sur une ligne -> règle
+        try:
+            lines, first_line = inspect.getsourcelines(function)
+        except (OSError, TypeError):
+            return  # Source indisponible : seuls les appels sont comptés
+        offset = first_line - 1
+        indent = len(lines[0]) - len(lines[0].lstrip())
+        for node in ast.walk(ast.parse(textwrap.dedent("".join(lines)))):
+            if not isinstance(node, ast.If):
+                continue
+            header = (node.lineno + offset, node.test.end_lineno + offset)
+            body = (node.body[0].lineno + offset, node.body[-1].end_lineno + offset)
+            rule = RuleStats(
+                header[0], lines[node.lineno - 1].strip(), header, body, one_liner=body[0] == header[1],
+            )
+            self.rules.append(rule)
+            for line in range(header[0], header[1] + 1):
+                self.header_rules[line] = rule
+            if rule.one_liner:
+                self._index_body_offsets(function.__code__, rule, node, offset, indent)
+        self.rules.sort(key=lambda rule: rule.line)
+
+    def _index_body_offsets(self, code: CodeType, rule: RuleStats, node: ast.If, line_offset: int, indent: int) -> None:
+        """Un corps sur la ligne de sa condition n'a pas d'événement de ligne propre : il est suivi par instruction."""
+        first, last = node.body[0], node.body[-1]
+        # Les colonnes de co_positions portent sur le source non dédenté
+        start = (first.lineno + line_offset, first.col_offset + indent)
+        end = (last.end_lineno + line_offset, last.end_col_offset + indent)
+        for index, (line, end_line, column, end_column) in enumerate(code.co_positions()):
+            if None in (line, end_line, column, end_column):
+                continue
+            if (line, column) >= start and (end_line, end_column) <= end:
+                self.body_offsets[index * 2] = rule
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "calls": self.calls, "time_ms": round(self.time_ns / 1e6, 3), "undecided": self.undecided,
+            "rules": [rule.to_dict() for rule in self.rules],
+        }
+
+
+class _FrameTracer:
+    """
+    Suivi d'un appel d'une méthode de règles. Le temps écoulé entre deux
+    événements est imputé à la ligne précédente, donc à la règle dont elle
+    porte la condition ; une règle se déclenche quand son corps s'exécute.
+    """
+
+    def __init__(self, tracer: RuleTracer, method: MethodRules, frame: FrameType) -> None:
+        self.tracer = tracer
+        self.method = method
+        self.line: int | None = None
+        self.pending: RuleStats | None = None  # Règle sur une ligne dont le corps n'a pas encore été vu
+        self.matched: list[RuleStats] = []
+        if method.body_offsets:
+            frame.f_trace_opcodes = True
+        self.started_at = self.last_event_at = time.perf_counter_ns()
+
+    def _match(self, rule: RuleStats) -> None:
+        rule.matches += 1
+        self.matched.append(rule)
+        if len(rule.examples) < self.tracer.examples and self.tracer.path not in rule.examples:
+            rule.examples.append(self.tracer.path)
+
+    def trace(self, frame: FrameType, event: str, arg: object) -> Callable | None:
+        now = time.perf_counter_ns()
+        method = self.method
+        previous = self.line
+        if previous is not None and previous in method.header_rules:
+            method.header_rules[previous].time_ns += now - self.last_event_at
+
+        if event == "line":
+            line = frame.f_lineno
+            rule = method.header_rules.get(line)
+            if previous is not None:
+                previous_rule = method.header_rules.get(previous)
+                if (previous_rule is not None and not previous_rule.one_liner
+                        and previous_rule.body[0] <= line <= previous_rule.body[1]):
+                    self._match(previous_rule)
+            # Une condition sur plusieurs lignes peut revenir sur sa première ligne : une seule évaluation
+            if rule is not None and line == rule.line and not (
+                previous is not None and rule.header[0] <= previous <= rule.header[1]
+            ):
+                rule.evaluations += 1
+                self.pending = rule if rule.one_liner else None
+            self.line = line
+        elif event == "opcode":
+            rule = method.body_offsets.get(frame.f_lasti)
+            if rule is not None and rule is self.pending:
+                self.pending = None
+                self._match(rule)
+        elif event == "return":
+            self._finish(frame.f_lineno, arg, now)
+            return None
+        self.last_event_at = time.perf_counter_ns()  # Le coût du suivi lui-même n'est imputé à aucune règle
+        return self.trace
+
+    def _finish(self, line: int, result: object, now: int) -> None:
+        """Règle décisive : la dernière déclenchée dont le corps contient le `return`, sinon la dernière déclenchée."""
+        method = self.method
+        method.calls += 1
+        method.time_ns += now - self.started_at
+        decider = next((rule for rule in reversed(self.matched) if rule.body[0] <= line <= rule.body[1]), None)
+        if decider is None and self.matched:
+            decider = self.matched[-1]
+        if decider is None:
+            method.undecided += 1
+            return
+        decider.decided += 1
+        decider.results[",".join(sorted(result)) if isinstance(result, (set, frozenset)) else str(result)] += 1
+
+
+class RuleTracer:
+    """
+    Trace les règles d'un profil pendant les appels passés par `call`.
+
+    Les temps sont mesurés sous traçage : ils servent à comparer les règles
+    entre elles, pas à chiffrer le coût réel du filtrage.
+    """
+
+    def __init__(self, profile: AnalysisProfile, examples: int = DEFAULT_EXAMPLES) -> None:
+        self.profile = profile
+        self.examples = examples
+        self.path = ""
+        self.paths = 0
+        self.methods: dict[CodeType, MethodRules] = {}
+        for name in TRACED_METHODS:
+            function = inspect.unwrap(getattr(type(profile), name))
+            if function.__code__ not in self.methods:
+                self.methods[function.__code__] = MethodRules(function)
+
+    def _trace_call(self, frame: FrameType, event: str, arg: object) -> Callable | None:
+        method = self.methods.get(frame.f_code)
+        if method is None:
+            return None  # Hors des méthodes de règles : aucun suivi ligne à ligne
+        return _FrameTracer(self, method, frame).trace
+
+    def call(self, path: str, function: Callable[..., Any], *args: Any) -> Any:
+        """Appelle `function(*args)` en traçant les méthodes de règles qu'elle exécute, au titre du fichier `path`."""
+        if path != self.path:
+            self.path = path
+            self.paths += 1
+        previous = sys.gettrace()
+        sys.settrace(self._trace_call)
+        try:
+            return function(*args)
+        finally:
+            sys.settrace(previous)
+
+    def report(self, slowest: int = DEFAULT_SLOWEST) -> dict[str, object]:
+        """Bilan par méthode et par règle, règles jamais déclenchées et règles les plus coûteuses."""
+        methods = sorted(self.methods.values(), key=lambda method: method.label)
+        rules = [(method, rule) for method in methods for rule in method.rules]
+        return {
+            "profile": self.profile.profile_id,
+            "files": self.paths,
+            "note": "Temps mesurés sous traçage : à comparer entre règles, pas en valeur absolue.",
+            "methods": {method.label: method.to_dict() for method in methods},
+            "never_matched": [
+                f"{method.label}:{rule.line} {rule.source}" for method, rule in rules if method.calls and not rule.matches
+            ],
+            "slowest": [
+                {"rule": f"{method.label}:{rule.line}", "source": rule.source, "time_ms": round(rule.time_ns / 1e6, 3)}
+                for method, rule in sorted(rules, key=lambda item: -item[1].time_ns)[:slowest]
+            ],
+        }
+
+    def to_json(self) -> bytes:
+        return json.dumps(self.report(), ensure_ascii=False, indent=2).encode("utf-8")
@@ -0,0 +1,178 @@
+# codetotext_core/utils/chunked_upload.py
+# [Version 1.1]
+
+# Téléversements par morceaux, reprenables : l'archive est reconstituée sur
+# disque morceau par morceau (chacun vérifié par son empreinte SHA-256), sans
+# jamais dépasser la taille d'une requête ni tenir l'archive en mémoire.
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import BinaryIO
+
+from codetotext_core.utils.shared_store import SharedStore
+
+DEFAULT_CHUNK_SIZE: int = 8 * 1024 * 1024
+# Un téléversement non finalisé est abandonné (et son fichier supprimé) après ce délai.
+DEFAULT_UPLOAD_EXPIRY_SECONDS: float = 24 * 3600.0
+_COPY_BUFFER_SIZE = 1024 * 1024
+# Un morceau est vérifié dans un tampon (en mémoire jusqu'à cette taille, sur disque au-delà) avant d'être mis en place.
+_SPOOL_MEMORY_SIZE = 8 * 1024 * 1024
+
+
+class UploadError(ValueError):
+    """Requête de téléversement invalide (morceau hors bornes, empreinte fausse, archive incomplète...)."""
+
+
+@dataclass(frozen=True)
+class UploadSession:
+    """Téléversement en cours : taille annoncée et découpage en morceaux de `chunk_size` octets."""
+
+    upload_id: str
+    filename: str
+    total_size: int
+    chunk_size: int
+
+    @property
+    def chunk_count(self) -> int:
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def expected_chunk_size(self, chunk_index: int) -> int:
+        """Taille attendue d'un morceau : `chunk_size`, sauf pour le dernier (reste)."""
+        if not 0 <= chunk_index < self.chunk_count:
+            raise UploadError(f"Morceau {chunk_index} hors bornes (0 à {self.chunk_count - 1}).")
+        return min(self.chunk_size, self.total_size - chunk_index * self.chunk_size)
+
+
+def merge_ranges(chunks: list[tuple[int, int, str]], chunk_size: int) -> list[tuple[int, int]]:
+    """Plages d'octets reçues [début, fin), fusionnées, à partir des morceaux (index, taille, empreinte)."""
+    ranges: list[tuple[int, int]] = []
+    for chunk_index, size, _ in chunks:
+        start = chunk_index * chunk_size
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], start + size)
+        else:
+            ranges.append((start, start + size))
+    return ranges
+
+
+class ChunkedUploads:
+    """
+    Téléversements reprenables, partagés entre workers : les métadonnées
+    (morceaux reçus) vivent dans le `SharedStore`, les données dans un
+    fichier par téléversement sous `root_dir`.
+
+    Chaque morceau est écrit à sa position (index × taille de morceau) : les
+    morceaux peuvent arriver dans le désordre, en parallèle ou plusieurs fois.
+    Un morceau n'est écrit et enregistré comme reçu qu'une fois son empreinte vérifiée.
+    """
+
+    def __init__(
+        self,
+        store: SharedStore,
+        root_dir: str,
+        expiry_seconds: float = DEFAULT_UPLOAD_EXPIRY_SECONDS,
+    ) -> None:
+        self.store = store
+        self.root_dir = root_dir
+        self.expiry_seconds = expiry_seconds
+
+    def path_for(self, upload_id: str) -> str:
+        return os.path.join(self.root_dir, f"{upload_id}.part")
+
+    def initiate(self, filename: str, total_size: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> UploadSession:
+        if total_size <= 0 or chunk_size <= 0:
+            raise UploadError("La taille de l'archive et celle des morceaux doivent être positives.")
+        self.purge_expired()
+        upload_id = self.store.create_upload(filename, total_size, chunk_size)
+        os.makedirs(self.root_dir, exist_ok=True)
+        with open(self.path_for(upload_id), "wb") as f:
+            f.truncate(total_size)  # Fichier creux à la taille finale : chaque morceau s'écrit à sa place
+        return UploadSession(upload_id, filename, total_size, chunk_size)
+
+    def session(self, upload_id: str) -> UploadSession | None:
+        upload = self.store.get_upload(upload_id)
+        if upload is None:
+            return None
+        return UploadSession(upload["upload_id"], upload["filename"], upload["total_size"], upload["chunk_size"])
+
+    def write_chunk(self, session: UploadSession, chunk_index: int, stream: BinaryIO, sha256: str) -> None:
+        """
+        Copie un morceau depuis `stream` à sa position dans le fichier, par blocs.
+
+        Le morceau est d'abord reçu dans un tampon et vérifié (taille et
+        empreinte) : un envoi incorrect n'écrit rien dans le fichier, si bien
+        qu'un morceau déjà reçu ne peut être écrasé que par un morceau valide.
+        """
+        expected_size = session.expected_chunk_size(chunk_index)
+        digest = hashlib.sha256()
+        written = 0
+        with tempfile.SpooledTemporaryFile(_SPOOL_MEMORY_SIZE, dir=self.root_dir) as spool:
+            while written <= expected_size:
+                block = stream.read(min(_COPY_BUFFER_SIZE, expected_size + 1 - written))
+                if not block:
+                    break
+                written += len(block)
+                if written > expected_size:
+                    break  # Morceau trop long : refusé sans lire la suite
+                digest.update(block)
+                spool.write(block)
+            if written != expected_size:
+                raise UploadError(f"Morceau {chunk_index} : {written} octets reçus, {expected_size} attendus.")
+            if digest.hexdigest() != sha256.lower():
+                raise UploadError(f"Morceau {chunk_index} : empreinte SHA-256 incorrecte.")
+            spool.seek(0)
+            with open(self.path_for(session.upload_id), "r+b") as f:
+                f.seek(chunk_index * session.chunk_size)
+                shutil.copyfileobj(spool, f, _COPY_BUFFER_SIZE)
+        self.store.record_chunk(session.upload_id, chunk_index, written, digest.hexdigest())
+
+    def status(self, session: UploadSession) -> dict[str, object]:
+        chunks = self.store.upload_chunks(session.upload_id)
+        received = {chunk_index for chunk_index, _, _ in chunks}
+        return {
+            "upload_id": session.upload_id,
+            "filename": session.filename,
+            "total_size": session.total_size,
+            "chunk_size": session.chunk_size,
+            "chunk_count": session.chunk_count,
+            "received_bytes": sum(size for _, size, _ in chunks),
+            "received_ranges": merge_ranges(chunks, session.chunk_size),
+            "missing_chunks": [i for i in range(session.chunk_count) if i not in received],
+        }
+
+    def assemble(self, session: UploadSession, sha256: str | None = None) -> str:
+        """
+        Vérifie que tous les morceaux sont reçus et retourne le chemin de
+        l'archive reconstituée. `sha256` (facultatif) est l'empreinte de
+        l'archive entière, recalculée sur le fichier.
+        """
+        received = {chunk_index for chunk_index, _, _ in self.store.upload_chunks(session.upload_id)}
+        missing = [i for i in range(session.chunk_count) if i not in received]
+        if missing:
+            raise UploadError(f"Téléversement incomplet : {len(missing)} morceau(x) manquant(s), dont {missing[0]}.")
+        path = self.path_for(session.upload_id)
+        if sha256:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                while block := f.read(_COPY_BUFFER_SIZE):
+                    digest.update(block)
+            if digest.hexdigest() != sha256.lower():
+                raise UploadError("Empreinte SHA-256 de l'archive reconstituée incorrecte.")
+        return path
+
+    def discard(self, upload_id: str) -> None:
+        self.store.delete_upload(upload_id)
+        try:
+            os.remove(self.path_for(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self) -> None:
+        for upload_id in self.store.expired_uploads(time.time() - self.expiry_seconds):
+            self.discard(upload_id)
@@ -0,0 +1,218 @@
+# codetotext_core/utils/entry_table.py
+# [Version 1.1]
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+import sys
+import zipfile
+
+# Index réservé au nœud racine (le "répertoire" de l'archive elle-même).
+ROOT_NODE: int = 0
+# Valeur sentinelle des tableaux d'index ("pas de nœud", "pas d'entrée").
+NO_INDEX: int = -1
+
+
+class ZipEntry:
+    """
+    Métadonnées minimales d'un fichier de l'archive.
+
+    `__slots__` évite un dictionnaire par instance : sur une archive de plusieurs
+    centaines de milliers d'entrées, c'est l'essentiel du coût mémoire.
+    """
+
+    __slots__ = ("node", "filename", "header_offset", "compress_size", "file_size", "crc", "compress_type")
+
+    def __init__(
+        self,
+        node: int,
+        filename: str,
+        header_offset: int,
+        compress_size: int,
+        file_size: int,
+        crc: int,
+        compress_type: int,
+    ) -> None:
+        self.node = node
+        self.filename = filename  # Nom brut dans l'archive, nécessaire pour ouvrir le membre
+        self.header_offset = header_offset
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.crc = crc
+        self.compress_type = compress_type
+
+
+class EntryTable:
+    """
+    Représentation compacte de l'arborescence d'une archive.
+
+    Chaque segment de chemin est interné une seule fois (`segments`). Les nœuds
+    (répertoires et fichiers) sont stockés dans des tableaux `array` parallèles :
+    parent, segment, premier enfant, frère suivant et entrée associée. Seuls les
+    fichiers possèdent un `ZipEntry`. L'arbre textuel, les filtres des profils et
+    l'écriture de l'archive de sortie travaillent tous sur cette table.
+    """
+
+    def __init__(self) -> None:
+        self.segments: list[str] = []
+        self._segment_ids: dict[str, int] = {}
+        self.parent = array("i", [NO_INDEX])
+        self.segment = array("i", [NO_INDEX])
+        self.first_child = array("i", [NO_INDEX])
+        self.next_sibling = array("i", [NO_INDEX])
+        self.entry_index = array("i", [NO_INDEX])
+        self.entries: list[ZipEntry] = []
+        # Index de construction (parent, segment) -> nœud ; libéré par `freeze()`.
+        self._child_lookup: dict[tuple[int, int], int] | None = {}
+
+    # --------------------------------------------------------------------------
+    # Construction
+    # --------------------------------------------------------------------------
+
+    @classmethod
+    def from_records(cls, records: Iterable[tuple[str, bool, int, int, int, int, int]]) -> EntryTable:
+        """
+        Construit la table à partir d'enregistrements du répertoire central
+        (voir `zip_reader.CentralDirectoryRecord`), dans l'ordre de l'archive.
+        """
+        table = cls()
+        add = table.add
+        for record in records:
+            add(*record)
+        table.freeze()
+        return table
+
+    def _intern(self, name: str) -> int:
+        segment_id = self._segment_ids.get(name)
+        if segment_id is None:
+            segment_id = len(self.segments)
+            self.segments.append(sys.intern(name))
+            self._segment_ids[name] = segment_id
+        return segment_id
+
+    def _child(self, parent: int, name: str) -> int:
+        assert self._child_lookup is not None, "La table est figée"
+        segment_id = self._intern(name)
+        key = (parent, segment_id)
+        node = self._child_lookup.get(key)
+        if node is None:
+            node = len(self.parent)
+            self.parent.append(parent)
+            self.segment.append(segment_id)
+            self.first_child.append(NO_INDEX)
+            self.entry_index.append(NO_INDEX)
+            # Insertion en tête de la liste chaînée des enfants du parent
+            self.next_sibling.append(self.first_child[parent])
+            self.first_child[parent] = node
+            self._child_lookup[key] = node
+        return node
+
+    def add(
+        self,
+        filename: str,
+        is_dir: bool,
+        header_offset: int = 0,
+        compress_size: int = 0,
+        file_size: int = 0,
+        crc: int = 0,
+        compress_type: int = zipfile.ZIP_STORED,
+    ) -> None:
+        """Ajoute une entrée de l'archive (les segments vides sont ignorés)."""
+        node = ROOT_NODE
+        for part in filename.replace("\\", "/").split("/"):
+            if part:
+                node = self._child(node, part)
+        if is_dir or node == ROOT_NODE:
+            return
+        self.entry_index[node] = len(self.entries)
+        self.entries.append(
+            ZipEntry(node, filename, header_offset, compress_size, file_size, crc, compress_type)
+        )
+
+    def freeze(self) -> None:
+        """Libère l'index de construction une fois toutes les entrées ajoutées."""
+        self._child_lookup = None
+
+    # --------------------------------------------------------------------------
+    # Consultation
+    # --------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def name(self, node: int) -> str:
+        return self.segments[self.segment[node]]
+
+    def is_file(self, node: int) -> bool:
+        return self.entry_index[node] != NO_INDEX
+
+    def children(self, node: int) -> Iterator[int]:
+        child = self.first_child[node]
+        while child != NO_INDEX:
+            yield child
+            child = self.next_sibling[child]
+
+    def sorted_children(self, node: int) -> list[int]:
+        return sorted(self.children(node), key=self.name)
+
+    def components(self, node: int, start: int = ROOT_NODE) -> list[str]:
+        """Segments du chemin de `node`, relatifs au nœud `start`."""
+        parts: list[str] = []
+        while node != start and node != ROOT_NODE:
+            parts.append(self.segments[self.segment[node]])
+            node = self.parent[node]
+        parts.reverse()
+        return parts
+
+    def path(self, node: int, start: int = ROOT_NODE) -> str:
+        return "/".join(self.components(node, start))
+
+    def common_root(self) -> int:
+        """
+        Retourne le répertoire de premier niveau commun à tous les fichiers
+        (ex: "mon_projet/" d'une archive GitHub), ou ROOT_NODE s'il n'y en a pas.
+        """
+        common = NO_INDEX
+        for entry in self.entries:
+            node = entry.node
+            while self.parent[node] != ROOT_NODE:
+                node = self.parent[node]
+            if node == entry.node:
+                return ROOT_NODE  # Fichier directement à la racine
+            if common == NO_INDEX:
+                common = node
+            elif common != node:
+                return ROOT_NODE
+        return ROOT_NODE if common == NO_INDEX else common
+
+    def basename_counts(self) -> Counter[int]:
+        """Nombre de fichiers par nom de base, indexé par identifiant de segment."""
+        return Counter(self.segment[entry.node] for entry in self.entries)
+
+    # --------------------------------------------------------------------------
+    # Rendu de l'arborescence
+    # --------------------------------------------------------------------------
+
+    def render_tree(self) -> str:
+        """Génère la représentation textuelle de l'arborescence."""
+        if len(self.parent) == 1:
+            return "Le fichier ZIP est vide."
+
+        tree_lines: list[str] = []
+        top_level = list(self.children(ROOT_NODE))
+        if len(top_level) == 1 and self.first_child[top_level[0]] != NO_INDEX:
+            tree_lines.append(self.name(top_level[0]))
+            self._render_children(top_level[0], "│   ", tree_lines)
+        else:
+            self._render_children(ROOT_NODE, "", tree_lines)
+        return "\n".join(tree_lines)
+
+    def _render_children(self, node: int, prefix: str, lines: list[str]) -> None:
+        items = self.sorted_children(node)
+        for i, child in enumerate(items):
+            is_last = i == len(items) - 1
+            lines.append(f"{prefix}{'└── ' if is_last else '├── '}{self.name(child)}")
+            if self.first_child[child] != NO_INDEX:
+                self._render_children(child, prefix + ("    " if is_last else "│   "), lines)
@@ -0,0 +1,125 @@
+# codetotext_core/utils/precompressed.py
+# [Version 1.1]
+
+# Livraison des sorties : empreintes de contenu (ETag) et variantes
+# précompressées (gzip, brotli si disponible) des fichiers texte produits,
+# générées une seule fois à l'écriture pour être servies membre par membre.
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from codetotext_core.utils.shared_store import atomic_writer, write_file_atomic
+
+try:  # Dépendance facultative : sans elle, seules les variantes gzip sont produites
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_FILENAME: str = "manifest.json"
+# Membres servis individuellement : sorties texte du traitement (arborescence, consolidations, diff)
+_MEMBER_PREFIX = "__"
+_MEMBER_SUFFIX = ".txt"
+# Extension de fichier de chaque codage de contenu HTTP, par ordre de préférence
+ENCODING_SUFFIXES: dict[str, str] = {"br": ".br", "gzip": ".gz"}
+_GZIP_LEVEL = 9
+_BROTLI_QUALITY = 9  # 11 est plusieurs fois plus lent pour quelques pourcents
+_CHUNK_SIZE = 1024 * 1024
+
+
+def content_etag(data: bytes | memoryview) -> str:
+    """Empreinte du contenu, utilisée comme ETag fort."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_etag(path: str) -> str:
+    """`content_etag` d'un fichier, lu par morceaux."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_servable_member(name: str) -> bool:
+    return "/" not in name and name.startswith(_MEMBER_PREFIX) and name.endswith(_MEMBER_SUFFIX)
+
+
+def iter_text_members(archive_path: str, container: str) -> Iterator[tuple[str, BinaryIO]]:
+    """Membres servables (`__*.txt`) d'une archive de sortie ZIP ou TAR, ouverts en lecture."""
+    if container == "tar":
+        with tarfile.open(archive_path, mode="r:*") as tar:
+            for member in tar:
+                if member.isfile() and is_servable_member(member.name):
+                    with tar.extractfile(member) as stream:
+                        yield member.name, stream
+    else:
+        with zipfile.ZipFile(archive_path) as zin:
+            for info in zin.infolist():
+                if is_servable_member(info.filename):
+                    with zin.open(info) as stream:
+                        yield info.filename, stream
+
+
+def _precompress_member(stream: BinaryIO, path: str) -> dict[str, object]:
+    """
+    Recopie un membre dans `path` et ses variantes compressées à côté, par
+    morceaux : la mémoire utilisée ne dépend pas de la taille du membre.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    size = 0
+    with contextlib.ExitStack() as stack:
+        raw = stack.enter_context(atomic_writer(path))
+        gzip_file = stack.enter_context(atomic_writer(path + ENCODING_SUFFIXES["gzip"]))
+        gzip_stream = stack.enter_context(
+            gzip.GzipFile(filename="", mode="wb", fileobj=gzip_file, compresslevel=_GZIP_LEVEL, mtime=0)
+        )
+        brotli_file = stack.enter_context(atomic_writer(path + ENCODING_SUFFIXES["br"])) if brotli else None
+        compressor = brotli.Compressor(quality=_BROTLI_QUALITY) if brotli else None
+        while chunk := stream.read(_CHUNK_SIZE):
+            size += len(chunk)
+            digest.update(chunk)
+            raw.write(chunk)
+            gzip_stream.write(chunk)
+            if compressor is not None:
+                brotli_file.write(compressor.process(chunk))
+        gzip_stream.close()  # Avant la fermeture (et le renommage) du fichier
+        files = {"gzip": gzip_file}
+        if compressor is not None:
+            brotli_file.write(compressor.finish())
+            files["br"] = brotli_file
+        encodings = {encoding: f.tell() for encoding, f in files.items()}
+    return {"size": size, "etag": digest.hexdigest(), "encodings": encodings}
+
+
+def precompress_members(archive_path: str, container: str, directory: str) -> dict[str, object]:
+    """
+    Écrit dans `directory` chaque membre servable de l'archive `archive_path`,
+    brut et précompressé, ainsi qu'un manifeste (ETag de l'archive et de
+    chaque membre, tailles, codages). Les membres sont lus et compressés par
+    morceaux, sans jamais charger l'archive ni un membre entier en mémoire.
+    """
+    os.makedirs(directory, exist_ok=True)
+    members: dict[str, dict[str, object]] = {}
+    for name, stream in iter_text_members(archive_path, container):
+        members[name] = _precompress_member(stream, os.path.join(directory, name))
+    manifest = {"etag": file_etag(archive_path), "members": members}
+    write_file_atomic(os.path.join(directory, MANIFEST_FILENAME), json.dumps(manifest).encode("utf-8"))
+    return manifest
+
+
+def load_manifest(directory: str) -> dict | None:
+    """Manifeste d'une sortie, None si elle a été produite avant la précompression."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILENAME), "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
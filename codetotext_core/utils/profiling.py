@@ -0,0 +1,141 @@
+# codetotext_core/utils/profiling.py
+# [Version 1.0]
+
+# Profilage à la demande d'un traitement : profil déterministe (cProfile,
+# fichier .pstats) et piles échantillonnées au format « collapsed » (une ligne
+# `racine;...;feuille nombre` par pile), lisible par les outils de flamegraph.
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+PSTATS_SUFFIX: str = ".pstats"
+FOLDED_SUFFIX: str = ".folded.txt"
+DEFAULT_SAMPLE_INTERVAL: float = 0.005
+# Rotation : nombre de captures conservées et taille totale maximale du dossier
+DEFAULT_KEEP_PROFILES: int = 20
+DEFAULT_MAX_PROFILE_BYTES: int = 200 * 1024 * 1024
+
+# cProfile ne supporte qu'un profileur actif à la fois (global depuis Python 3.12)
+_PROFILER_LOCK = threading.Lock()
+
+
+@dataclass
+class ProfileCapture:
+    """Fichiers produits par une capture (None tant qu'elle n'est pas terminée, ou si elle a été sautée)."""
+
+    name: str
+    pstats_path: str | None = None
+    folded_path: str | None = None
+    samples: int = 0
+
+    def artifacts(self) -> dict[str, str]:
+        return {
+            kind: os.path.basename(path)
+            for kind, path in (("pstats", self.pstats_path), ("folded", self.folded_path))
+            if path is not None
+        }
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class _StackSampler(threading.Thread):
+    """Relève périodiquement la pile d'un thread (via `sys._current_frames`) et compte les piles identiques."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="profiling-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels: list[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+def rotate_profiles(directory: str, keep: int, max_bytes: int) -> None:
+    """Supprime les captures les plus anciennes au-delà de `keep` captures ou de `max_bytes` au total."""
+    captures: dict[str, list[os.DirEntry]] = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            for suffix in (PSTATS_SUFFIX, FOLDED_SUFFIX):
+                if entry.is_file() and entry.name.endswith(suffix):
+                    captures.setdefault(entry.name[:-len(suffix)], []).append(entry)
+    ordered = sorted(captures.values(), key=lambda files: max(f.stat().st_mtime for f in files), reverse=True)
+    total = 0
+    for index, files in enumerate(ordered):
+        total += sum(f.stat().st_size for f in files)
+        if index == 0 or (index < keep and total <= max_bytes):
+            continue  # La capture la plus récente est toujours conservée
+        for f in files:
+            try:
+                os.remove(f.path)
+            except FileNotFoundError:
+                pass
+
+
+@contextmanager
+def capture_profile(
+    directory: str,
+    name: str,
+    keep: int = DEFAULT_KEEP_PROFILES,
+    max_bytes: int = DEFAULT_MAX_PROFILE_BYTES,
+    sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+) -> Iterator[ProfileCapture]:
+    """
+    Profile le bloc exécuté dans le thread courant et écrit `<name>.pstats` et
+    `<name>.folded.txt` dans `directory`, puis applique la rotation.
+
+    Si une autre capture est déjà en cours (dans ce processus), le bloc
+    s'exécute sans profilage : la capture retournée reste vide.
+    """
+    capture = ProfileCapture(name)
+    if not _PROFILER_LOCK.acquire(blocking=False):
+        logger.warning(f"Profilage de {name} ignoré : une autre capture est en cours.")
+        yield capture
+        return
+    try:
+        profiler = cProfile.Profile()
+        sampler = _StackSampler(threading.get_ident(), sample_interval)
+        sampler.start()
+        profiler.enable()
+        try:
+            yield capture
+        finally:
+            profiler.disable()
+            sampler.stop()
+            os.makedirs(directory, exist_ok=True)
+            capture.pstats_path = os.path.join(directory, name + PSTATS_SUFFIX)
+            profiler.dump_stats(capture.pstats_path)
+            capture.folded_path = os.path.join(directory, name + FOLDED_SUFFIX)
+            with open(capture.folded_path, "w", encoding="utf-8") as f:
+                for stack, count in sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            capture.samples = sum(sampler.stacks.values())
+            rotate_profiles(directory, keep, max_bytes)
+    finally:
+        _PROFILER_LOCK.release()
@@ -0,0 +1,382 @@
+# codetotext_core/utils/shared_store.py
+# [Version 1.5]
+
+# Stockage partagé entre processus (workers gunicorn, conteneurs sur un même
+# volume) : une base SQLite en mode WAL pour les métadonnées (tâches, cache de
+# résultats) et des fichiers écrits par renommage atomique.
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_updated_at ON jobs (updated_at);
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    value TEXT,
+    lease_until REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS uploads (
+    upload_id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    total_size INTEGER NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS upload_chunks (
+    upload_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (upload_id, chunk_index)
+);
+CREATE TABLE IF NOT EXISTS slots (
+    slot_id TEXT PRIMARY KEY,
+    pool TEXT NOT NULL,
+    client TEXT NOT NULL,
+    lease_until REAL NOT NULL
+);
+"""
+
+JOB_RUNNING: str = "running"
+JOB_DONE: str = "done"
+JOB_FAILED: str = "failed"
+
+_CACHE_PENDING = "pending"
+_CACHE_READY = "ready"
+
+# Durée pendant laquelle un calcul en cours « réserve » une clé. Au-delà, le
+# calcul est considéré comme abandonné (processus tué) et la clé reprise.
+DEFAULT_LEASE_SECONDS: float = 300.0
+# Intervalle d'interrogation d'un processus qui attend le calcul d'un autre.
+DEFAULT_POLL_INTERVAL: float = 0.1
+# Durée de conservation d'une tâche après sa dernière mise à jour.
+DEFAULT_JOB_EXPIRY_SECONDS: float = 7 * 24 * 3600.0
+
+
+@contextmanager
+def atomic_writer(path: str) -> Iterator[BinaryIO]:
+    """
+    Fichier écrit via un fichier temporaire du même dossier, renommé en `path`
+    à la sortie du bloc (supprimé si le bloc échoue).
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_file_atomic(path: str, data: bytes | memoryview) -> None:
+    """Écrit un fichier via un fichier temporaire du même dossier puis un renommage."""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+def unique_filename(name_root: str, extension: str) -> str:
+    """Nom horodaté et unique entre processus : `racine_AA-MM-JJ_HHhMMmSS_xxxxxxxx.ext`."""
+    timestamp = datetime.now().strftime("%y-%m-%d_%Hh%Mm%S")
+    return f"{name_root}_{timestamp}_{uuid.uuid4().hex[:8]}{extension}"
+
+
+@dataclass(frozen=True)
+class CacheClaim:
+    """
+    Issue d'une demande de cache : soit la valeur déjà calculée (`value`), soit
+    la réservation de la clé pour le demandeur (`owner`), qui doit ensuite
+    appeler `SharedStore.cache_put` ou `SharedStore.cache_release`, soit ni
+    l'une ni l'autre : l'attente a pris fin alors qu'un autre calcul est en
+    cours, mené par la tâche `pending_job` (si elle est connue).
+    """
+
+    value: dict | None
+    owner: bool
+    pending_job: str | None = None
+
+
+class SharedStore:
+    """
+    Métadonnées partagées par tous les processus servant l'application.
+
+    - `jobs` : état de chaque traitement, consultable depuis n'importe quel
+      worker, conservé `job_expiry_seconds` après sa dernière mise à jour.
+    - `cache` : résultats par espace de noms et clé, avec protection contre les
+      calculs simultanés d'une même clé : le premier demandeur réserve la clé
+      (bail de `lease_seconds`), les suivants attendent son résultat.
+    - `uploads` : téléversements par morceaux en cours et morceaux reçus.
+    - `slots` : créneaux de traitement pour le contrôle d'admission.
+
+    SQLite en mode WAL permet des lectures concurrentes pendant une écriture ;
+    les transactions `BEGIN IMMEDIATE` sérialisent les réservations. Une
+    connexion est ouverte par thread.
+    """
+
+    def __init__(
+        self,
+        root_dir: str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        job_expiry_seconds: float = DEFAULT_JOB_EXPIRY_SECONDS,
+    ) -> None:
+        self.root_dir = root_dir
+        self.db_path = os.path.join(root_dir, "store.sqlite")
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.job_expiry_seconds = job_expiry_seconds
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(self.root_dir, exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # Durable au commit du WAL, sûr en cas de crash
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    # --------------------------------------------------------------------------
+    # Tâches
+    # --------------------------------------------------------------------------
+
+    def create_job(self, kind: str, params: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self.purge_jobs(now - self.job_expiry_seconds)
+        self._connection().execute(
+            "INSERT INTO jobs (job_id, kind, status, created_at, updated_at, params) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, JOB_RUNNING, now, now, json.dumps(params)),
+        )
+        return job_id
+
+    def purge_jobs(self, updated_before: float) -> int:
+        """
+        Supprime les tâches sans mise à jour depuis `updated_before`, y compris
+        celles restées « en cours » (processus tué). Retourne leur nombre.
+        """
+        return self._connection().execute("DELETE FROM jobs WHERE updated_at < ?", (updated_before,)).rowcount
+
+    def finish_job(self, job_id: str, result: dict) -> None:
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, updated_at = ? WHERE job_id = ?",
+            (JOB_DONE, json.dumps(result), time.time(), job_id),
+        )
+
+    def fail_job(self, job_id: str, error: str) -> None:
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+            (JOB_FAILED, error, time.time(), job_id),
+        )
+
+    def get_job(self, job_id: str) -> dict | None:
+        row = self._connection().execute(
+            "SELECT job_id, kind, status, created_at, updated_at, params, result, error FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, status, created_at, updated_at, params, result, error = row
+        return {
+            "job_id": job_id, "kind": kind, "status": status,
+            "created_at": created_at, "updated_at": updated_at,
+            "params": json.loads(params), "result": json.loads(result) if result else None, "error": error,
+        }
+
+    # --------------------------------------------------------------------------
+    # Cache de résultats (calcul unique par clé)
+    # --------------------------------------------------------------------------
+
+    def cache_claim(
+        self, namespace: str, key: str, timeout: float | None = None, job_id: str | None = None,
+    ) -> CacheClaim:
+        """
+        Retourne la valeur en cache, ou réserve la clé pour l'appelant (tâche
+        `job_id`, communiquée aux autres demandeurs).
+
+        Si un autre processus calcule déjà cette clé, attend sa valeur au plus
+        `timeout` secondes (par défaut la durée du bail) ; la clé est réservée
+        s'il a échoué ou si son bail a expiré. Au terme de l'attente, le calcul
+        n'est pas dupliqué : la demande retourne la tâche en cours
+        (`CacheClaim.pending_job`), à consulter plus tard.
+        """
+        deadline = time.monotonic() + (self.lease_seconds if timeout is None else timeout)
+        connection = self._connection()
+        while True:
+            now = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT status, value, lease_until FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+                ).fetchone()
+                if row is not None and row[0] == _CACHE_READY:
+                    connection.execute("COMMIT")
+                    return CacheClaim(json.loads(row[1]), owner=False)
+                if row is None or row[2] < now:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO cache (namespace, key, status, value, lease_until, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (namespace, key, _CACHE_PENDING, json.dumps({"job_id": job_id}), now + self.lease_seconds, now),
+                    )
+                    connection.execute("COMMIT")
+                    return CacheClaim(None, owner=True)
+                connection.execute("COMMIT")
+                if time.monotonic() >= deadline:
+                    return CacheClaim(None, owner=False, pending_job=json.loads(row[1] or "{}").get("job_id"))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            time.sleep(self.poll_interval)  # Un autre processus calcule cette clé
+
+    def cache_put(self, namespace: str, key: str, value: dict) -> None:
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, status, value, lease_until, updated_at) "
+            "VALUES (?, ?, ?, ?, 0, ?)",
+            (namespace, key, _CACHE_READY, json.dumps(value), now),
+        )
+
+    def cache_release(self, namespace: str, key: str) -> None:
+        """Libère une réservation sans valeur (échec du calcul) : un autre demandeur prendra la main."""
+        self._connection().execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ? AND status = ?", (namespace, key, _CACHE_PENDING)
+        )
+
+    def cache_invalidate(self, namespace: str, key: str) -> None:
+        self._connection().execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    # --------------------------------------------------------------------------
+    # Téléversements par morceaux (les données vivent sur disque, voir chunked_upload)
+    # --------------------------------------------------------------------------
+
+    def create_upload(self, filename: str, total_size: int, chunk_size: int) -> str:
+        upload_id = uuid.uuid4().hex
+        self._connection().execute(
+            "INSERT INTO uploads (upload_id, filename, total_size, chunk_size, created_at) VALUES (?, ?, ?, ?, ?)",
+            (upload_id, filename, total_size, chunk_size, time.time()),
+        )
+        return upload_id
+
+    def get_upload(self, upload_id: str) -> dict | None:
+        row = self._connection().execute(
+            "SELECT upload_id, filename, total_size, chunk_size, created_at FROM uploads WHERE upload_id = ?",
+            (upload_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        upload_id, filename, total_size, chunk_size, created_at = row
+        return {
+            "upload_id": upload_id, "filename": filename, "total_size": total_size,
+            "chunk_size": chunk_size, "created_at": created_at,
+        }
+
+    def record_chunk(self, upload_id: str, chunk_index: int, size: int, sha256: str) -> None:
+        """Enregistre un morceau écrit sur disque (un nouvel envoi du même morceau le remplace)."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO upload_chunks (upload_id, chunk_index, size, sha256) VALUES (?, ?, ?, ?)",
+            (upload_id, chunk_index, size, sha256),
+        )
+
+    def upload_chunks(self, upload_id: str) -> list[tuple[int, int, str]]:
+        """Morceaux reçus : (index, taille, empreinte SHA-256), par index croissant."""
+        return self._connection().execute(
+            "SELECT chunk_index, size, sha256 FROM upload_chunks WHERE upload_id = ? ORDER BY chunk_index",
+            (upload_id,),
+        ).fetchall()
+
+    def delete_upload(self, upload_id: str) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM upload_chunks WHERE upload_id = ?", (upload_id,))
+            connection.execute("DELETE FROM uploads WHERE upload_id = ?", (upload_id,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def expired_uploads(self, created_before: float) -> list[str]:
+        rows = self._connection().execute(
+            "SELECT upload_id FROM uploads WHERE created_at < ?", (created_before,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    # --------------------------------------------------------------------------
+    # Admission (créneaux de traitement partagés, répartition équitable)
+    # --------------------------------------------------------------------------
+
+    def acquire_slot(self, pool: str, client: str, capacity: int, lease_seconds: float | None = None) -> str | None:
+        """
+        Réserve un créneau de traitement pour `client`, ou retourne None.
+
+        Au plus `capacity` créneaux actifs par pool, tous processus confondus.
+        Répartition équitable : un client ne peut détenir plus de
+        `capacity // nombre de clients actifs` créneaux (au moins un), si bien
+        qu'un client seul peut occuper tout le serveur, mais cède sa part dès
+        que d'autres clients se présentent. Les créneaux d'un processus tué
+        expirent avec leur bail.
+
+        La répartition ne vaut qu'à l'admission : aucun traitement en cours
+        n'est interrompu. Un client qui arrive alors que le pool est plein
+        est refusé (l'appelant répond 429 avec Retry-After) et n'obtient sa
+        part qu'à mesure que les créneaux en cours se libèrent ; rien n'est
+        mis en file d'attente.
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM slots WHERE lease_until < ?", (now,))
+            rows = connection.execute("SELECT client FROM slots WHERE pool = ?", (pool,)).fetchall()
+            active_clients = {row[0] for row in rows} | {client}
+            client_slots = sum(1 for row in rows if row[0] == client)
+            fair_share = max(1, capacity // len(active_clients))
+            if len(rows) >= capacity or client_slots >= fair_share:
+                connection.execute("COMMIT")
+                return None
+            slot_id = uuid.uuid4().hex
+            connection.execute(
+                "INSERT INTO slots (slot_id, pool, client, lease_until) VALUES (?, ?, ?, ?)",
+                (slot_id, pool, client, now + (self.lease_seconds if lease_seconds is None else lease_seconds)),
+            )
+            connection.execute("COMMIT")
+            return slot_id
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def release_slot(self, slot_id: str) -> None:
+        self._connection().execute("DELETE FROM slots WHERE slot_id = ?", (slot_id,))
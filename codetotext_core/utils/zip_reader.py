@@ -0,0 +1,379 @@
+# codetotext_core/utils/zip_reader.py
+# [Version 1.2]
+
+from __future__ import annotations
+
+import bz2
+import io
+import lzma
+import mmap
+import os
+import struct
+import zipfile
+import zlib
+from collections.abc import Iterator
+from typing import NamedTuple
+
+from codetotext_core.utils.entry_table import ZipEntry
+
+# --- Structures binaires du format ZIP (APPNOTE.TXT) ---
+_EOCD = struct.Struct("<4s4H2LH")            # End Of Central Directory (22 octets)
+_EOCD_SIGNATURE = b"PK\x05\x06"
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")     # Localisateur ZIP64 (20 octets)
+_ZIP64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+_ZIP64_EOCD = struct.Struct("<4sQ2H2L4Q")    # EOCD ZIP64 (56 octets)
+_ZIP64_EOCD_SIGNATURE = b"PK\x06\x06"
+_CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")  # Entrée du répertoire central (46 octets)
+_CENTRAL_HEADER_SIGNATURE = b"PK\x01\x02"
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")   # En-tête local d'un membre (30 octets)
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+_EXTRA_HEADER = struct.Struct("<2H")
+_ZIP64_EXTRA_ID = 0x0001
+_LZMA_HEADER = struct.Struct("<BBH")  # Version de la bibliothèque (2 octets), taille des propriétés
+
+_MAX_COMMENT_SIZE = 0xFFFF
+_FLAG_ENCRYPTED = 0x1
+_FLAG_UTF8 = 0x800
+
+# Taille des tranches de données compressées passées au décompresseur.
+_READ_CHUNK_SIZE = 64 * 1024
+# Méthodes décompressées par ZipMemberReader ; les autres sont confiées à zipfile.
+_NATIVE_COMPRESS_TYPES = frozenset({zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA})
+
+
+def _lzma_decompressor(data: memoryview, filename: str) -> tuple[lzma.LZMADecompressor, int]:
+    """
+    Décompresseur d'un membre LZMA (méthode 14) : les données commencent par
+    un en-tête de 4 octets puis les propriétés LZMA1 (lc/lp/pb, dictionnaire).
+
+    Returns:
+        Le décompresseur et la position des données compressées.
+    """
+    if len(data) < _LZMA_HEADER.size:
+        raise zipfile.BadZipFile(f"En-tête LZMA tronqué pour {filename}")
+    _, _, properties_size = _LZMA_HEADER.unpack_from(data)
+    properties = bytes(data[_LZMA_HEADER.size:_LZMA_HEADER.size + properties_size])
+    if properties_size != 5 or len(properties) != 5 or properties[0] >= 9 * 5 * 5:
+        raise zipfile.BadZipFile(f"Propriétés LZMA invalides pour {filename}")
+    literal_context, remainder = properties[0] % 9, properties[0] // 9
+    filters = [{
+        "id": lzma.FILTER_LZMA1, "lc": literal_context, "lp": remainder % 5, "pb": remainder // 5,
+        "dict_size": int.from_bytes(properties[1:5], "little"),
+    }]
+    return lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=filters), _LZMA_HEADER.size + properties_size
+
+
+class CentralDirectoryRecord(NamedTuple):
+    """Enregistrement léger d'une entrée du répertoire central."""
+
+    filename: str
+    is_dir: bool
+    header_offset: int
+    compress_size: int
+    file_size: int
+    crc: int
+    compress_type: int
+
+
+class ZipMemberReader:
+    """
+    Lecteur en flux d'un membre de l'archive.
+
+    La décompression est incrémentale : `read(n)` ne décompresse que ce qui est
+    nécessaire pour produire `n` octets. Le CRC32 est vérifié en fin de lecture.
+    """
+
+    def __init__(self, data: memoryview, compress_type: int, file_size: int, crc: int, filename: str) -> None:
+        self._data = data
+        self._position = 0
+        self._compress_type = compress_type
+        self._remaining = file_size
+        self._expected_crc = crc
+        self._running_crc = 0
+        self._filename = filename
+        if compress_type == zipfile.ZIP_DEFLATED:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        elif compress_type == zipfile.ZIP_BZIP2:
+            self._decompressor = bz2.BZ2Decompressor()
+        elif compress_type == zipfile.ZIP_LZMA:
+            self._decompressor, self._position = _lzma_decompressor(data, filename)
+        elif compress_type == zipfile.ZIP_STORED:
+            self._decompressor = None
+        else:
+            raise zipfile.BadZipFile(
+                f"Méthode de compression non supportée ({compress_type}) pour {filename}"
+            )
+
+    def __enter__(self) -> ZipMemberReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._data = memoryview(b"")
+
+    def _next_chunk(self) -> memoryview:
+        chunk = self._data[self._position:self._position + _READ_CHUNK_SIZE]
+        self._position += len(chunk)
+        return chunk
+
+    def _decompress(self, wanted: int) -> bytes:
+        if self._decompressor is None:
+            chunk = self._data[self._position:self._position + wanted]
+            self._position += len(chunk)
+            return bytes(chunk)
+        if isinstance(self._decompressor, (bz2.BZ2Decompressor, lzma.LZMADecompressor)):
+            # Les décompresseurs bzip2 et LZMA conservent leur sortie en attente :
+            # on ne leur fournit de nouvelles données que lorsqu'ils les réclament.
+            if self._decompressor.needs_input:
+                compressed = self._next_chunk()
+                if not compressed:
+                    return b""
+            else:
+                compressed = b""
+        else:
+            # zlib conserve l'entrée non consommée dans `unconsumed_tail`.
+            compressed = self._decompressor.unconsumed_tail or self._next_chunk()
+            if not compressed:
+                return b""
+        try:
+            return self._decompressor.decompress(compressed, wanted)
+        except EOFError:
+            # Flux bzip2 / LZMA déjà terminé : la taille annoncée dépasse les données
+            raise zipfile.BadZipFile(f"Données tronquées pour {self._filename}") from None
+        except (zlib.error, lzma.LZMAError, OSError) as e:
+            raise zipfile.BadZipFile(f"Données compressées invalides pour {self._filename} : {e}") from None
+
+    def read(self, size: int = -1) -> bytes:
+        """Lit et décompresse au plus `size` octets (tout le reste si `size` < 0)."""
+        wanted = self._remaining if size < 0 else min(size, self._remaining)
+        parts: list[bytes] = []
+        produced = 0
+        while produced < wanted:
+            chunk = self._decompress(wanted - produced)
+            if not chunk:
+                if self._position >= len(self._data):
+                    raise zipfile.BadZipFile(f"Données tronquées pour {self._filename}")
+                continue
+            parts.append(chunk)
+            produced += len(chunk)
+        data = b"".join(parts)
+        self._remaining -= len(data)
+        self._running_crc = zlib.crc32(data, self._running_crc)
+        if self._remaining == 0 and self._running_crc != self._expected_crc:
+            raise zipfile.BadZipFile(f"CRC invalide pour {self._filename}")
+        return data
+
+
+class _BufferFile(io.RawIOBase):
+    """Fichier en lecture seule sur la vue de l'archive, pour le repli sur zipfile."""
+
+    def __init__(self, buffer: memoryview) -> None:
+        self._buffer = buffer
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        data = self._buffer[self._position:self._position + len(target)]
+        target[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._buffer)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+
+class CentralDirectoryReader:
+    """
+    Lecteur minimal d'archives ZIP travaillant directement sur le répertoire central.
+
+    Contrairement à `zipfile.ZipFile`, aucun objet `ZipInfo` n'est construit à
+    l'ouverture : `iter_records()` décode les entrées à la demande avec `struct`
+    sur une vue `mmap` (fichier sur disque) ou `memoryview` (flux en mémoire).
+    Seuls les membres retenus par les filtres sont ensuite ouverts via `open()`.
+    Les archives ZIP64 sont supportées.
+    """
+
+    def __init__(self, source: str | os.PathLike[str] | bytes | io.BytesIO | io.BufferedIOBase) -> None:
+        self._file: io.BufferedIOBase | None = None
+        self._mmap: mmap.mmap | None = None
+        self._fallback: zipfile.ZipFile | None = None  # Méthodes non décompressées ici
+        if isinstance(source, (str, os.PathLike)):
+            self._file = open(source, "rb")
+            self._buffer = self._map_file(self._file)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._buffer = memoryview(source)
+        elif isinstance(source, io.BytesIO):
+            self._buffer = source.getbuffer()
+        else:
+            self._buffer = self._map_file(source)
+
+        try:
+            self._locate_central_directory()
+        except Exception:
+            self.close()
+            raise
+
+    def _map_file(self, file: io.BufferedIOBase) -> memoryview:
+        try:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, io.UnsupportedOperation) as e:
+            raise zipfile.BadZipFile(f"Impossible de projeter l'archive en mémoire : {e}")
+        return memoryview(self._mmap)
+
+    def __enter__(self) -> CentralDirectoryReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fallback is not None:
+            self._fallback.close()
+            self._fallback = None
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _locate_central_directory(self) -> None:
+        buffer = self._buffer
+        search_start = max(0, len(buffer) - _EOCD.size - _MAX_COMMENT_SIZE)
+        eocd_position = bytes(buffer[search_start:]).rfind(_EOCD_SIGNATURE)
+        if eocd_position < 0:
+            raise zipfile.BadZipFile("Fichier ZIP invalide : fin du répertoire central introuvable.")
+        eocd_position += search_start
+        if eocd_position + _EOCD.size > len(buffer):
+            raise zipfile.BadZipFile("Fichier ZIP invalide : fin du répertoire central tronquée.")
+
+        _, _, _, _, entry_count, cd_size, cd_offset, _ = _EOCD.unpack_from(buffer, eocd_position)
+        cd_end = eocd_position
+
+        locator_position = eocd_position - _ZIP64_LOCATOR.size
+        if locator_position >= 0 and buffer[locator_position:locator_position + 4] == _ZIP64_LOCATOR_SIGNATURE:
+            _, _, zip64_eocd_offset, _ = _ZIP64_LOCATOR.unpack_from(buffer, locator_position)
+            zip64_position = locator_position - _ZIP64_EOCD.size
+            if zip64_position < 0 or buffer[zip64_position:zip64_position + 4] != _ZIP64_EOCD_SIGNATURE:
+                raise zipfile.BadZipFile("Fichier ZIP64 invalide : EOCD ZIP64 introuvable.")
+            (_, _, _, _, _, _, _, entry_count, cd_size, cd_offset) = _ZIP64_EOCD.unpack_from(buffer, zip64_position)
+            cd_end = zip64_position
+
+        # Données éventuellement préfixées à l'archive (ex: exécutable auto-extractible)
+        self._base_offset = cd_end - cd_size - cd_offset
+        if self._base_offset < 0:
+            raise zipfile.BadZipFile("Fichier ZIP invalide : répertoire central hors limites.")
+        self._cd_start = self._base_offset + cd_offset
+        self._cd_end = cd_end
+        self.entry_count = entry_count
+
+    def iter_records(self) -> Iterator[CentralDirectoryRecord]:
+        """Décode les entrées du répertoire central, dans l'ordre de l'archive."""
+        buffer = self._buffer
+        position = self._cd_start
+        unpack_header = _CENTRAL_HEADER.unpack_from
+        header_size = _CENTRAL_HEADER.size
+        cd_end = self._cd_end
+        while position < cd_end:
+            if position + header_size > cd_end:
+                raise zipfile.BadZipFile("Fichier ZIP invalide : répertoire central tronqué.")
+            (signature, _, _, flags, compress_type, _, _, crc, compress_size, file_size,
+             name_length, extra_length, comment_length, _, _, _, header_offset) = unpack_header(buffer, position)
+            if signature != _CENTRAL_HEADER_SIGNATURE:
+                raise zipfile.BadZipFile("Fichier ZIP invalide : entrée du répertoire central corrompue.")
+            name_start = position + header_size
+            if name_start + name_length + extra_length > cd_end:
+                raise zipfile.BadZipFile("Fichier ZIP invalide : répertoire central tronqué.")
+            raw_name = bytes(buffer[name_start:name_start + name_length])
+            try:
+                filename = raw_name.decode("utf-8" if flags & _FLAG_UTF8 else "cp437")
+            except UnicodeDecodeError:
+                raise zipfile.BadZipFile(f"Nom d'entrée invalide dans le répertoire central : {raw_name!r}.") from None
+
+            if 0xFFFFFFFF in (compress_size, file_size, header_offset):
+                file_size, compress_size, header_offset = self._read_zip64_extra(
+                    name_start + name_length, extra_length, file_size, compress_size, header_offset
+                )
+
+            yield CentralDirectoryRecord(
+                filename, filename.endswith("/"), header_offset,
+                compress_size, file_size, crc, compress_type,
+            )
+            position = name_start + name_length + extra_length + comment_length
+
+    def _read_zip64_extra(
+        self, extra_start: int, extra_length: int, file_size: int, compress_size: int, header_offset: int
+    ) -> tuple[int, int, int]:
+        buffer = self._buffer
+        position, extra_end = extra_start, extra_start + extra_length
+        while position + _EXTRA_HEADER.size <= extra_end:
+            field_id, field_size = _EXTRA_HEADER.unpack_from(buffer, position)
+            position += _EXTRA_HEADER.size
+            if field_id == _ZIP64_EXTRA_ID:
+                # Seuls les champs saturés à 0xFFFFFFFF sont présents, dans cet ordre.
+                field_position = position
+                saturated = (file_size, compress_size, header_offset).count(0xFFFFFFFF)
+                if field_size < 8 * saturated or position + field_size > extra_end:
+                    raise zipfile.BadZipFile("Fichier ZIP64 invalide : champ étendu tronqué.")
+                if file_size == 0xFFFFFFFF:
+                    (file_size,) = struct.unpack_from("<Q", buffer, field_position)
+                    field_position += 8
+                if compress_size == 0xFFFFFFFF:
+                    (compress_size,) = struct.unpack_from("<Q", buffer, field_position)
+                    field_position += 8
+                if header_offset == 0xFFFFFFFF:
+                    (header_offset,) = struct.unpack_from("<Q", buffer, field_position)
+                break
+            position += field_size
+        return file_size, compress_size, header_offset
+
+    def open(self, entry: ZipEntry | CentralDirectoryRecord) -> ZipMemberReader | zipfile.ZipExtFile:
+        """Ouvre un membre en lecture à partir de son en-tête local."""
+        if entry.compress_type not in _NATIVE_COMPRESS_TYPES:
+            return self._open_with_zipfile(entry)
+        position = self._base_offset + entry.header_offset
+        if position + _LOCAL_HEADER.size > len(self._buffer):
+            raise zipfile.BadZipFile(f"En-tête local hors de l'archive pour {entry.filename}")
+        (signature, _, flags, _, _, _, _, _, _, name_length, extra_length) = _LOCAL_HEADER.unpack_from(
+            self._buffer, position
+        )
+        if signature != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"En-tête local invalide pour {entry.filename}")
+        if flags & _FLAG_ENCRYPTED:
+            raise zipfile.BadZipFile(f"Les fichiers chiffrés ne sont pas supportés ({entry.filename})")
+        data_start = position + _LOCAL_HEADER.size + name_length + extra_length
+        if data_start + entry.compress_size > len(self._buffer):
+            raise zipfile.BadZipFile(f"Données tronquées pour {entry.filename}")
+        data = self._buffer[data_start:data_start + entry.compress_size]
+        return ZipMemberReader(data, entry.compress_type, entry.file_size, entry.crc, entry.filename)
+
+    def _open_with_zipfile(self, entry: ZipEntry | CentralDirectoryRecord) -> zipfile.ZipExtFile:
+        """
+        Repli sur zipfile pour une méthode de compression que ce lecteur ne
+        décompresse pas (selon la version de Python : Zstandard, ...). L'archive
+        n'est relue par zipfile qu'au premier membre concerné.
+        """
+        if self._fallback is None:
+            self._fallback = zipfile.ZipFile(_BufferFile(self._buffer))
+        try:
+            return self._fallback.open(entry.filename)
+        except NotImplementedError as e:
+            raise zipfile.BadZipFile(f"Méthode de compression non supportée ({entry.compress_type}) pour {entry.filename} : {e}")
+
+    def read(self, entry: ZipEntry | CentralDirectoryRecord) -> bytes:
+        """Lit et décompresse un membre en entier."""
+        with self.open(entry) as member:
+            return member.read()
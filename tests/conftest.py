@@ -0,0 +1,64 @@
+# tests/conftest.py
+# [Version 1.1]
+
+# Outils communs : archives ZIP construites en mémoire et traitement complet
+# d'une archive, dont les membres produits sont relus en dictionnaire ; client de
+# l'application dont l'état partagé et les dossiers sont redirigés vers tmp_path.
+
+from __future__ import annotations
+
+import io
+import zipfile
+
+import pytest
+
+from codetotext_core.processing.pipeline import process_zip_file
+from codetotext_core.profiles.registry import PROFILES
+from codetotext_core.utils.chunked_upload import ChunkedUploads
+from codetotext_core.utils.file_utils import generate_zip_tree
+from codetotext_core.utils.shared_store import SharedStore
+
+
+def build_zip(files: dict[str, bytes | str], compression: int = zipfile.ZIP_DEFLATED) -> bytes:
+    """Archive ZIP contenant `files` (chemin -> contenu), dans l'ordre donné."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def flatten(archive: bytes, profile_id: str = "complet", **options) -> dict[str, bytes]:
+    """Traite une archive ZIP avec un profil et retourne les membres de la sortie."""
+    tree_content = generate_zip_tree(io.BytesIO(archive))
+    output, _ = process_zip_file(
+        io.BytesIO(archive), "projet.zip", False, tree_content, PROFILES[profile_id], **options,
+    )
+    with zipfile.ZipFile(output) as result:
+        return {name: result.read(name) for name in result.namelist()}
+
+
+@pytest.fixture
+def sample_project() -> dict[str, str]:
+    """Petit projet : code Python et front, doublon, document d'architecture."""
+    return {
+        "projet/app.py": "import os\n\n\ndef main():\n    return os.getcwd()\n",
+        "projet/utils/helpers.py": "def aide(x):\n    return x * 2\n",
+        "projet/utils/copie.py": "def aide(x):\n    return x * 2\n",
+        "projet/static/style.css": "body { color: red; }\n",
+        "projet/README.md": "# Projet\n",
+    }
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Client de test de l'application et son `SharedStore`, isolés dans tmp_path."""
+    import app as webapp
+
+    store = SharedStore(str(tmp_path / "shared"))
+    monkeypatch.setattr(webapp, "STORE", store)
+    monkeypatch.setattr(webapp, "UPLOADS", ChunkedUploads(store, str(tmp_path / "uploads")))
+    monkeypatch.setitem(webapp.app.config, "DOWNLOAD_FOLDER", str(tmp_path / "downloads"))
+    monkeypatch.setitem(webapp.app.config, "MEMBERS_FOLDER", str(tmp_path / "downloads" / "_members"))
+    (tmp_path / "downloads").mkdir()
+    return webapp.app.test_client(), store
@@ -0,0 +1,80 @@
+# tests/test_api_process_tar.py
+# [Version 1.2]
+
+from __future__ import annotations
+
+import io
+import tarfile
+
+import pytest
+
+import app as webapp
+from codetotext_core.utils.shared_store import JOB_DONE, JOB_FAILED
+
+
+def _tar_gz(files: dict[str, str]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in files.items():
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def test_tar_is_processed(client):
+    test_client, store = client
+    response = test_client.post("/api/process-tar?profile=complet", data=_tar_gz({"p/app.py": "print(1)\n"}))
+    assert response.status_code == 200
+    assert store.get_job(response.get_json()["job_id"])["status"] == JOB_DONE
+
+
+def test_invalid_tar_fails_the_job(client):
+    test_client, store = client
+    response = test_client.post("/api/process-tar?profile=complet", data=b"pas une archive tar")
+    assert response.status_code == 400
+    assert store.get_job(response.get_json()["job_id"])["status"] == JOB_FAILED
+
+
+def test_unexpected_error_fails_the_job(client, monkeypatch):
+    def broken(*args, **kwargs):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(webapp, "process_tar_stream", broken)
+    test_client, store = client
+    response = test_client.post("/api/process-tar?profile=complet", data=_tar_gz({"p/app.py": "print(1)\n"}))
+    assert response.status_code == 500
+    job = store.get_job(response.get_json()["job_id"])
+    assert job["status"] == JOB_FAILED
+    assert "OSError" in job["error"]
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("projet.tar.gz", "projet.tar.gz"),
+    ("../../../../tmp/evil.tar.gz", "tmp_evil.tar.gz"),
+    ("日本.zip", "archive.zip"),
+    ("..", "archive.tar.gz"),
+    (None, "archive.tar.gz"),
+])
+def test_client_filename(filename, expected):
+    assert webapp.client_filename(filename, "archive.tar.gz") == expected
+
+
+def test_filename_cannot_escape_the_download_folder(client, tmp_path):
+    test_client, store = client
+    outside = tmp_path / "dehors"
+    outside.mkdir()
+    traversal = "../" * 12 + str(outside).lstrip("/") + "/evil.tar.gz"
+    response = test_client.post(
+        "/api/process-tar", query_string={"profile": "complet", "filename": traversal},
+        data=_tar_gz({"p/app.py": "print(1)\n"}),
+    )
+    assert response.status_code == 200
+    assert list(outside.iterdir()) == []
+    server_filename = store.get_job(response.get_json()["job_id"])["result"]["server_filename"]
+    assert "/" not in server_filename
+    assert (tmp_path / "downloads" / server_filename).is_file()
+
+    upload = test_client.post("/api/uploads", json={"filename": traversal, "size": 10}).get_json()
+    assert "/" not in upload["filename"] and upload["filename"].endswith(".tar.gz")
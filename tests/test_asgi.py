@@ -0,0 +1,150 @@
+# tests/test_asgi.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+from flask import Flask, jsonify, request, send_file
+
+import asgi
+from app import BODY_PATH_ENVIRON_KEY
+
+_CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serveur asynchrone autour d'une application Flask minimale."""
+    (tmp_path / "donnees.bin").write_bytes(_CONTENT)
+    flask_app = Flask(__name__)
+    flask_app.config["MAX_CONTENT_LENGTH"] = 4096
+    seen: dict = {}
+
+    @flask_app.post("/corps")
+    def body():
+        seen["body_path"] = request.environ.get(BODY_PATH_ENVIRON_KEY)
+        seen["spooled"] = seen["body_path"] is not None and os.path.exists(seen["body_path"])
+        return jsonify(length=len(request.get_data()), head=request.get_data()[:4].decode())
+
+    @flask_app.get("/fichier")
+    def file():
+        return send_file(tmp_path / "donnees.bin", conditional=True)
+
+    async_server = asgi.AsyncServer(flask_app, view_threads=2, processes=1)
+    yield async_server, seen
+    async_server.shutdown()
+
+
+def _request(async_server, method: str, path: str, chunks=(b"",), headers=()) -> list[dict]:
+    """Exécute une requête HTTP ; le corps est reçu par morceaux (`chunks`)."""
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": b"",
+        "headers": [(name.encode(), value.encode()) for name, value in headers],
+    }
+    asyncio.run(async_server(scope, receive, send))
+    return sent
+
+
+def _body(sent: list[dict]) -> bytes:
+    return b"".join(message.get("body", b"") for message in sent[1:])
+
+
+def test_small_body_stays_in_memory(server):
+    async_server, seen = server
+    sent = _request(async_server, "POST", "/corps", [b"abcd", b"efgh"])
+    assert sent[0]["status"] == 200
+    assert b'"length":8' in _body(sent).replace(b" ", b"")
+    assert seen["body_path"] is None
+
+
+def test_large_body_is_spooled_to_disk(server, monkeypatch):
+    monkeypatch.setattr(asgi, "BODY_SPOOL_SIZE", 16)
+    async_server, seen = server
+    sent = _request(async_server, "POST", "/corps", [b"abcd" * 3, b"x" * 100, b"y" * 100])
+    assert sent[0]["status"] == 200
+    assert b'"head":"abcd"' in _body(sent).replace(b" ", b"")
+    assert b'"length":212' in _body(sent).replace(b" ", b"")
+    assert seen["spooled"]
+    assert not os.path.exists(seen["body_path"])  # Supprimé après la réponse
+
+
+def test_body_over_the_limit_is_rejected(server):
+    async_server, seen = server
+    sent = _request(async_server, "POST", "/corps", [b"x" * 4000, b"x" * 200])
+    assert sent[0]["status"] == 413
+    assert "trop volumineux" in _body(sent).decode()
+    assert seen == {}  # La vue n'est pas appelée
+
+
+def test_disconnect_during_body_sends_nothing(server):
+    async_server, seen = server
+    messages = [{"type": "http.request", "body": b"abc", "more_body": True}, {"type": "http.disconnect"}]
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        return messages.pop(0)
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    asyncio.run(async_server({"type": "http", "method": "POST", "path": "/corps", "headers": []}, receive, send))
+    assert sent == [] and seen == {}
+
+
+def test_file_is_sent_in_chunks(server, monkeypatch):
+    monkeypatch.setattr(asgi, "FILE_CHUNK_SIZE", 100)
+    async_server, _ = server
+    sent = _request(async_server, "GET", "/fichier")
+    assert sent[0]["status"] == 200
+    assert _body(sent) == _CONTENT
+    assert len(sent) == 1 + 11 + 1  # En-têtes, blocs de 100 octets, fin du corps
+    assert sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
+
+
+@pytest.mark.parametrize("range_header, expected", [
+    ("bytes=10-309", _CONTENT[10:310]),
+    ("bytes=-5", _CONTENT[-5:]),
+    ("bytes=1000-", _CONTENT[1000:]),
+], ids=["plage", "suffixe", "fin"])
+def test_range_requests_send_only_the_slice(server, monkeypatch, range_header, expected):
+    monkeypatch.setattr(asgi, "FILE_CHUNK_SIZE", 128)
+    async_server, _ = server
+    sent = _request(async_server, "GET", "/fichier", headers=[("Range", range_header)])
+    assert sent[0]["status"] == 206
+    assert _body(sent) == expected
+    assert dict(sent[0]["headers"])[b"content-length"] == str(len(expected)).encode()
+    assert sent[-1] == {"type": "http.response.body", "body": b"", "more_body": False}  # Transmis par la boucle
+
+
+def test_lifespan_installs_the_process_pool(server):
+    async_server, _ = server
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent: list[dict] = []
+    executors = []
+
+    async def receive() -> dict:
+        executors.append(async_server.wsgi_app.config.get("PROCESSING_EXECUTOR"))
+        return messages.pop(0)
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    asyncio.run(async_server({"type": "lifespan"}, receive, send))
+    assert [message["type"] for message in sent] == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert executors[1] is not None  # Installé entre le démarrage et l'arrêt
+    assert async_server.wsgi_app.config["PROCESSING_EXECUTOR"] is None
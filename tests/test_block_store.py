@@ -0,0 +1,94 @@
+# tests/test_block_store.py
+# [Version 1.1]
+
+from __future__ import annotations
+
+import pytest
+
+from codetotext_core.processing import block_store, pipeline
+from codetotext_core.processing.block_store import BlockStore
+from codetotext_core.processing.output_writer import ArchiveWriter
+
+from conftest import build_zip, flatten
+
+
+class _MemoryWriter(ArchiveWriter):
+    def __init__(self) -> None:
+        self.members: dict[str, bytes] = {}
+        self.chunk_sizes: list[int] = []
+
+    def writestr(self, name: str, data: bytes) -> None:
+        self.members[name] = data
+
+    def write_chunks(self, name, chunks, size) -> None:
+        chunks = list(chunks)
+        self.chunk_sizes += [len(chunk) for chunk in chunks]
+        self.members[name] = b"".join(chunks)
+        assert len(self.members[name]) == size
+
+    def close(self) -> None:
+        pass
+
+
+def test_template_is_assembled_from_store(monkeypatch):
+    monkeypatch.setattr(block_store, "COPY_CHUNK_SIZE", 8)
+    blocks = ["premier bloc é\n", "", "second bloc, plus long que le morceau\n", "ü" * 5]
+    store = BlockStore()
+    try:
+        records = [store.add(block, f"f{i}.py", {"CAT"}) for i, block in enumerate(blocks)]
+        template = "en-tête\n" + "\n".join(record.placeholder for record in reversed(records)) + "\nfin"
+        writer = _MemoryWriter()
+        store.write_member(writer, "sortie.txt", template)
+        expected = "en-tête\n" + "\n".join(reversed(blocks)) + "\nfin"
+        assert writer.members["sortie.txt"] == expected.encode("utf-8")
+        assert max(writer.chunk_sizes) < 2 * 8 + len("en-tête\n".encode("utf-8"))
+        assert store.read_text(records[2]) == blocks[2]
+    finally:
+        store.close()
+
+
+def test_profiles_route_blocks_on_their_path():
+    # Le profil Mermaid aiguille certaines configurations d'après leur chemin :
+    # les marqueurs du magasin de blocs ne doivent pas changer leur destination.
+    members = flatten(build_zip({
+        "mermaid/frontend/package.json": '{"name": "editeur"}\n',
+        "mermaid/frontend/vite.config.ts": "export default {}\n",
+        "mermaid/frontend/eslint.config.js": "export default []\n",
+        "mermaid/backend/migrations/alembic.ini": "[alembic]\n",
+        "mermaid/backend/run.py": "print(1)\n",
+    }), "mermaid")
+    frontend = members["__code_mermaid_frontend.txt"].decode("utf-8")
+    config_docs = members["__code_mermaid_config_docs.txt"].decode("utf-8")
+    backend = members["__code_mermaid_backend.txt"].decode("utf-8")
+    assert "Chemin: frontend/package.json" in frontend
+    assert "Chemin: frontend/vite.config.ts" in frontend
+    assert "Chemin: frontend/eslint.config.js" in config_docs
+    assert "Chemin: backend/migrations/alembic.ini" in config_docs
+    assert "\x00" not in frontend + config_docs + backend
+
+
+def test_consolidations_contain_full_blocks(sample_project):
+    members = flatten(build_zip(sample_project))
+    full = members["__code_complet.txt"].decode("utf-8")
+    assert "Chemin: app.py\nLangage: Python\n-- CONTENU DU CODE --\n" + sample_project["projet/app.py"] in full
+    assert "Chemin: static/style.css" not in members["__code_complet_sans_CSS.txt"].decode("utf-8")
+
+
+@pytest.mark.parametrize("max_pending, max_size", [(1, block_store.MEMORY_CONTENT_LIMIT), (64, 10)])
+def test_pending_compactions_are_bounded(monkeypatch, sample_project, max_pending, max_size):
+    files = {**sample_project, **{f"projet/mod{i}.py": f"# Module {i}\nVALEUR = {i}  # valeur\n" for i in range(20)}}
+    expected = flatten(build_zip(files), compact=True)
+    monkeypatch.setattr(pipeline, "MAX_PENDING_COMPACTIONS", max_pending)
+    monkeypatch.setattr(pipeline, "MEMORY_CONTENT_LIMIT", max_size)
+    pending: list[int] = []
+    collect = pipeline.FlatteningPass._collect_compactions
+
+    def spy(self) -> None:
+        collect(self)
+        pending.append(len(self.pending_compactions))
+        assert len(self.pending_compactions) <= max_pending
+        assert self.pending_compaction_size <= max_size or not self.pending_compactions
+
+    monkeypatch.setattr(pipeline.FlatteningPass, "_collect_compactions", spy)
+    assert flatten(build_zip(files), compact=True) == expected
+    assert len(pending) == 23  # app.py, helpers.py, style.css et les 20 modules (copie.py est un doublon)
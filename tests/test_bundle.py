@@ -0,0 +1,82 @@
+# tests/test_bundle.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from codetotext_core.processing.bundle import BUNDLE_DATA_FILENAME, BUNDLE_INDEX_FILENAME, Bundle, open_bundle
+from codetotext_core.processing.output_writer import OutputFormat
+from codetotext_core.processing.pipeline import process_zip_file
+from codetotext_core.profiles.registry import PROFILES
+from codetotext_core.utils.file_utils import generate_zip_tree
+
+from conftest import build_zip
+
+
+@pytest.fixture(params=[OutputFormat(), OutputFormat(container="tar", compression="gz")], ids=["zip", "tar"])
+def archive_path(request, tmp_path, sample_project) -> str:
+    archive = build_zip({**sample_project, "projet/accents.py": "NOM = 'Événement'\n"})
+    output, _ = process_zip_file(
+        io.BytesIO(archive), "projet.zip", False, generate_zip_tree(io.BytesIO(archive)), PROFILES["complet"],
+        output_format=request.param, build_bundle=True,
+    )
+    path = tmp_path / f"sortie{request.param.extension}"
+    path.write_bytes(output.getvalue())
+    return str(path)
+
+
+def test_files_are_read_from_the_index(archive_path, tmp_path, sample_project):
+    with open_bundle(archive_path, str(tmp_path / "bundle")) as bundle:
+        assert bundle.read_text("app.py") == sample_project["projet/app.py"]
+        assert bundle.read_text("accents.py") == "NOM = 'Événement'\n"
+        assert all(bundle.verify(path) for path in bundle.paths)
+
+        copy = bundle.entry("utils/copie.py")
+        original = bundle.entry("utils/helpers.py")
+        assert copy.duplicate_of == "utils/helpers.py"
+        assert (copy.offset, copy.length) == (original.offset, original.length)
+        assert bytes(bundle.read("utils/copie.py")) == bytes(bundle.read("utils/helpers.py"))
+
+        for category in bundle.categories:
+            entries = bundle.category(category)
+            assert entries
+            for entry, content in entries:
+                assert category in entry.categories
+                assert bytes(content) == bytes(bundle.read(entry.path))
+        with pytest.raises(KeyError):
+            bundle.read("absent.py")
+
+
+def test_duplicates_are_stored_once(archive_path, tmp_path, sample_project):
+    with open_bundle(archive_path, str(tmp_path / "bundle")) as bundle:
+        unique = {entry.path for entry in bundle.entries if entry.duplicate_of is None}
+        assert (tmp_path / "bundle" / BUNDLE_DATA_FILENAME).stat().st_size == sum(
+            bundle.entry(path).length for path in unique
+        )
+
+
+def test_unknown_index_or_truncated_data_is_rejected(archive_path, tmp_path):
+    directory = tmp_path / "bundle"
+    open_bundle(archive_path, str(directory)).close()
+    data, index_path = directory / BUNDLE_DATA_FILENAME, directory / BUNDLE_INDEX_FILENAME
+    index = json.loads(index_path.read_text())
+
+    index_path.write_text(json.dumps({**index, "version": index["version"] + 1}))
+    with pytest.raises(ValueError, match="non reconnue"):
+        Bundle(str(data), str(index_path))
+
+    index_path.write_text(json.dumps(index))
+    data.write_bytes(data.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="tronquées"):
+        Bundle(str(data), str(index_path))
+
+
+def test_archive_without_bundle(tmp_path, sample_project):
+    path = tmp_path / "sans_bundle.zip"
+    path.write_bytes(build_zip(sample_project))
+    with pytest.raises(ValueError):
+        open_bundle(str(path), str(tmp_path / "bundle"))
@@ -0,0 +1,129 @@
+# tests/test_chunked_upload.py
+# [Version 1.1]
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import zipfile
+
+import pytest
+
+from codetotext_core.utils.chunked_upload import ChunkedUploads, UploadError
+from codetotext_core.utils.shared_store import JOB_DONE, SharedStore
+
+from conftest import build_zip
+
+_DATA = bytes(range(256)) * 40  # 10 240 octets : 3 morceaux de 4 096, le dernier partiel
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _chunk(index: int, chunk_size: int = 4096, data: bytes = _DATA) -> bytes:
+    return data[index * chunk_size:(index + 1) * chunk_size]
+
+
+@pytest.fixture
+def uploads(tmp_path) -> ChunkedUploads:
+    return ChunkedUploads(SharedStore(str(tmp_path / "shared")), str(tmp_path / "uploads"))
+
+
+def test_chunks_out_of_order_and_repeated(uploads):
+    session = uploads.initiate("projet.zip", len(_DATA), 4096)
+    for index in (2, 0, 2):
+        uploads.write_chunk(session, index, io.BytesIO(_chunk(index)), _sha256(_chunk(index)))
+    status = uploads.status(session)
+    assert status["received_ranges"] == [(0, 4096), (8192, len(_DATA))]
+    assert status["missing_chunks"] == [1]
+    with pytest.raises(UploadError):
+        uploads.assemble(session)
+
+    uploads.write_chunk(session, 1, io.BytesIO(_chunk(1)), _sha256(_chunk(1)))
+    assert uploads.status(session)["received_ranges"] == [(0, len(_DATA))]
+    path = uploads.assemble(session, _sha256(_DATA))
+    with open(path, "rb") as f:
+        assert f.read() == _DATA
+    with pytest.raises(UploadError):
+        uploads.assemble(session, _sha256(b"autre chose"))
+
+
+def test_rejected_chunks_are_not_recorded(uploads):
+    session = uploads.initiate("projet.zip", len(_DATA), 4096)
+    with pytest.raises(UploadError):
+        uploads.write_chunk(session, 0, io.BytesIO(_chunk(0)), _sha256(b"faux"))
+    with pytest.raises(UploadError):
+        uploads.write_chunk(session, 2, io.BytesIO(_chunk(2)[:-1]), _sha256(_chunk(2)[:-1]))
+    with pytest.raises(UploadError):
+        uploads.write_chunk(session, 3, io.BytesIO(b""), _sha256(b""))
+    assert uploads.status(session)["missing_chunks"] == [0, 1, 2]
+
+
+def test_oversized_chunk_does_not_overwrite_the_next(uploads):
+    session = uploads.initiate("projet.zip", len(_DATA), 4096)
+    uploads.write_chunk(session, 1, io.BytesIO(_chunk(1)), _sha256(_chunk(1)))
+    with pytest.raises(UploadError):
+        uploads.write_chunk(session, 0, io.BytesIO(b"x" * 5000), _sha256(b"x" * 5000))
+    with open(uploads.path_for(session.upload_id), "rb") as f:
+        f.seek(4096)
+        assert f.read(4096) == _chunk(1)
+
+
+@pytest.mark.parametrize("resent", [_chunk(1)[:-1] + b"?", b"?" * 100], ids=["corrompu", "court"])
+def test_bad_resend_keeps_the_accepted_chunk(uploads, resent):
+    session = uploads.initiate("projet.zip", len(_DATA), 4096)
+    for index in range(3):
+        uploads.write_chunk(session, index, io.BytesIO(_chunk(index)), _sha256(_chunk(index)))
+    with pytest.raises(UploadError):
+        uploads.write_chunk(session, 1, io.BytesIO(resent), _sha256(_chunk(1)))
+    assert uploads.status(session)["missing_chunks"] == []
+    with open(uploads.assemble(session), "rb") as f:
+        assert f.read() == _DATA
+
+
+def test_expired_uploads_are_purged(tmp_path):
+    uploads = ChunkedUploads(SharedStore(str(tmp_path / "shared")), str(tmp_path / "uploads"), expiry_seconds=-1)
+    session = uploads.initiate("projet.zip", 10, 4)
+    uploads.purge_expired()
+    assert uploads.session(session.upload_id) is None
+    assert not os.path.exists(uploads.path_for(session.upload_id))
+
+
+def test_upload_api_round_trip(client, sample_project):
+    test_client, store = client
+    archive = build_zip(sample_project)
+    response = test_client.post(
+        "/api/uploads", json={"filename": "projet.zip", "size": len(archive), "chunk_size": 1024},
+    )
+    assert response.status_code == 201
+    upload = response.get_json()
+    upload_url = f"/api/uploads/{upload['upload_id']}"
+
+    for index in reversed(range(upload["chunk_count"])):
+        chunk = _chunk(index, 1024, archive)
+        headers = {"X-Chunk-SHA256": _sha256(chunk)}
+        response = test_client.put(f"{upload_url}/chunks/{index}", data=chunk, headers=headers)
+        assert response.status_code == 200
+    assert test_client.get(upload_url).get_json()["missing_chunks"] == []
+
+    response = test_client.post(f"{upload_url}/finalize?profile=complet&sha256={_sha256(archive)}")
+    assert response.status_code == 200
+    result = response.get_json()
+    assert store.get_job(result["job_id"])["status"] == JOB_DONE
+    with zipfile.ZipFile(io.BytesIO(test_client.get(result["download_url"]).data)) as output:
+        assert "Chemin: app.py" in output.read("__code_complet.txt").decode()
+    assert test_client.get(upload_url).status_code == 404  # Supprimé une fois traité
+
+
+def test_upload_api_rejects_bad_chunks(client):
+    test_client, _ = client
+    upload = test_client.post("/api/uploads", json={"filename": "projet.zip", "size": 10, "chunk_size": 4}).get_json()
+    upload_url = f"/api/uploads/{upload['upload_id']}"
+    assert test_client.put(f"{upload_url}/chunks/0", data=b"abcd").status_code == 400
+    response = test_client.put(f"{upload_url}/chunks/0", data=b"abcd", headers={"X-Chunk-SHA256": _sha256(b"abce")})
+    assert response.status_code == 400
+    assert response.get_json()["missing_chunks"] == [0, 1, 2]
+    assert test_client.post(f"{upload_url}/finalize?profile=complet").status_code == 400
+    assert test_client.post("/api/uploads", json={"filename": "projet.exe", "size": 10}).status_code == 400
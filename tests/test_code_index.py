@@ -0,0 +1,64 @@
+# tests/test_code_index.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from codetotext_core.processing import code_index
+from codetotext_core.processing.code_index import INDEX_FILENAME, find_symbols, search_index
+
+from conftest import build_zip, flatten
+
+
+@pytest.fixture
+def index_path(tmp_path, sample_project) -> str:
+    path = tmp_path / INDEX_FILENAME
+    path.write_bytes(flatten(build_zip(sample_project), build_index=True)[INDEX_FILENAME])
+    return str(path)
+
+
+@pytest.fixture
+def connections(monkeypatch) -> list[sqlite3.Connection]:
+    """Connexions ouvertes par les fonctions d'interrogation."""
+    opened: list[sqlite3.Connection] = []
+    connect = sqlite3.connect
+
+    def spy(*args, **kwargs) -> sqlite3.Connection:
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(code_index.sqlite3, "connect", spy)
+    return opened
+
+
+def _assert_closed(connections: list[sqlite3.Connection]) -> None:
+    assert connections
+    for connection in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            connection.execute("SELECT 1")
+
+
+def test_search_index(index_path, connections):
+    matches = search_index(index_path, "getcwd")
+    assert [match["path"] for match in matches] == ["app.py"]
+    assert "[getcwd]" in matches[0]["snippet"]
+    _assert_closed(connections)
+
+
+def test_find_symbols(index_path, connections):
+    assert [(s["name"], s["path"]) for s in find_symbols(index_path, "aide")] == [
+        ("aide", "utils/helpers.py"),
+    ]
+    assert [s["name"] for s in find_symbols(index_path, "ma*")] == ["main"]
+    _assert_closed(connections)
+
+
+def test_connection_is_closed_on_error(tmp_path, connections):
+    path = tmp_path / "vide.sqlite"
+    sqlite3.connect(path).close()  # Base sans tables
+    with pytest.raises(sqlite3.OperationalError):
+        find_symbols(str(path), "main")
+    _assert_closed(connections)
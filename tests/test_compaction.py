@@ -0,0 +1,114 @@
+# tests/test_compaction.py
+# [Version 1.1]
+
+from __future__ import annotations
+
+import ast
+import sys
+
+import pytest
+
+from codetotext_core.processing.compaction import compact_python, compact_source
+
+
+def test_python_comments_docstrings_and_blank_lines_are_removed():
+    source = (
+        '"""Module."""\n\n'
+        "import os  # commentaire\n\n\n"
+        "def f():\n"
+        '    """Docstring."""\n'
+        "\n"
+        "    # ligne de commentaire\n"
+        "    return '# pas un commentaire'   \n"
+        "\n"
+        "class A:\n"
+        '    """Seule docstring."""\n'
+    )
+    compacted = compact_python(source)
+    assert compacted == (
+        "import os\n"
+        "def f():\n"
+        "    return '# pas un commentaire'\n"
+        "class A:\n"
+        "    ..."
+    )
+    ast.parse(compacted)
+
+
+@pytest.mark.parametrize("literal", [
+    '"""ligne un   \n\n   # pas un commentaire\n  """',
+    'f"""ligne un   \n\n   # pas un commentaire\n{x}  \n"""',
+    'rf"""\\d+   \n\n{x!r:>{width}}  \n"""',
+])
+def test_python_multiline_literals_are_untouched(literal):
+    # Depuis Python 3.12, les f-strings sont découpées en plusieurs jetons
+    source = f"x = width = 1\ns = {literal}\n\n# fin\n"
+    compacted = compact_python(source)
+    assert f"s = {literal}" in compacted
+    assert "# fin" not in compacted
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="f-strings imbriquées (PEP 701)")
+def test_python_nested_multiline_fstrings_are_untouched():
+    literal = 'f"a{f"""b  \n\n"""}c"'
+    assert compact_python(f"t = {literal}  # commentaire\n") == f"t = {literal}"
+
+
+def test_script_comments_are_removed_outside_literals():
+    source = (
+        "const url = 'http://example.com'; // commentaire\n"
+        "\n"
+        "const re = /\\/\\/+/g;   /* bloc */\n"
+        "const t = `a\n\n// garde ${x} b`;\n"
+    )
+    assert compact_source("TypeScript", source).text == (
+        "const url = 'http://example.com';\n"
+        "const re = /\\/\\/+/g;\n"
+        "const t = `a\n\n// garde ${x} b`;"
+    )
+
+
+def test_jsx_text_is_not_taken_for_comments():
+    source = (
+        "export const Aide = () => (\n"
+        "  <p>Voir http://example.com   pour plus /* sic */</p>   \n"
+        "\n"
+        ");\n"
+    )
+    assert compact_source("TypeScript React", source).text == (
+        "export const Aide = () => (\n"
+        "  <p>Voir http://example.com   pour plus /* sic */</p>\n"
+        ");"
+    )
+
+
+def test_jsx_comments_are_removed_outside_text():
+    source = (
+        "const f = <T,>(x: T) => x; // générique\n"
+        "export const Liste = ({ items }: Props) => (\n"
+        "  // commentaire de code\n"
+        "  <ul className=\"liste\"   title={/* note */ \"x\"} // attribut\n"
+        "      hidden={a < b}>\n"
+        "    <li>L'outil : http://example.com   // texte</li>\n"
+        "    {items.map((item) => <Item key={item} />)} {/* commentaire JSX */}\n"
+        "    <>Fragment /* texte */</>\n"
+        "  </ul>\n"
+        ");\n"
+    )
+    assert compact_source("TypeScript React", source).text == (
+        "const f = <T,>(x: T) => x;\n"
+        "export const Liste = ({ items }: Props) => (\n"
+        "  <ul className=\"liste\" title={  \"x\"}\n"
+        "      hidden={a < b}>\n"
+        "    <li>L'outil : http://example.com   // texte</li>\n"
+        "    {items.map((item) => <Item key={item} />)} { }\n"
+        "    <>Fragment /* texte */</>\n"
+        "  </ul>\n"
+        ");"
+    )
+
+
+@pytest.mark.parametrize("language", ["TypeScript", "TypeScript React"])
+def test_literal_newlines_survive_unusual_characters(language):
+    literal = "`\x00a\n\n\ue000b`"
+    assert compact_source(language, f"x = {literal}; /* fin */\n").text == f"x = {literal};"
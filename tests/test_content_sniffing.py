@@ -0,0 +1,42 @@
+# tests/test_content_sniffing.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import codecs
+
+import pytest
+
+from codetotext_core.processing.content_sniffing import FALLBACK_ENCODING, SniffResult, sniff_content
+
+from conftest import build_zip, flatten
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"", SniffResult(False, "utf-8")),
+    (b"print('bonjour')\n", SniffResult(False, "utf-8")),
+    ("x = 'résumé'".encode()[:-2], SniffResult(False, "utf-8")),  # Séquence coupée
+    (codecs.BOM_UTF8 + b"x = 1\n", SniffResult(False, "utf-8-sig", "BOM utf-8-sig")),
+    (codecs.BOM_UTF16_LE + "x = 1\n".encode("utf-16-le"), SniffResult(False, "utf-16", "BOM utf-16")),
+    (codecs.BOM_UTF32_LE + "x\n".encode("utf-32-le"), SniffResult(False, "utf-32", "BOM utf-32")),
+    ("s = 'café'\n".encode("cp1252"), SniffResult(False, FALLBACK_ENCODING, "UTF-8 invalide")),
+    (b"\x89PNG\r\n\x1a\n\x00\x00", SniffResult(True, reason="octet NUL")),
+    (bytes(range(1, 32)) * 4, SniffResult(True, reason="ratio de caractères imprimables trop faible")),
+    (bytes(range(0xA0, 0x100)) * 4, SniffResult(True, reason="octets non ASCII trop nombreux")),
+])
+def test_sniff_content(head, expected):
+    assert sniff_content(head) == expected
+
+
+def test_binary_skipped_legacy_transcoded_and_oversized_summarized():
+    output = flatten(build_zip({
+        "projet/a.py": "x = 1\n",
+        "projet/image.py": b"\x00\x01\x02binaire",
+        "projet/ancien.py": "s = 'café'\n".encode("cp1252"),
+        "projet/grand.py": "y = 2\n" * 100,
+    }), max_file_size=100)
+    code = output["__code_complet.txt"].decode()
+    assert "Chemin: image.py" not in code and "image.py" not in output
+    assert output["ancien.py"] == "s = 'café'\n".encode()
+    assert "s = 'café'" in code
+    assert "[FICHIER VOLUMINEUX RÉSUMÉ : 600 octets, limite 100 octets]" in code
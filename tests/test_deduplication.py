@@ -0,0 +1,69 @@
+# tests/test_deduplication.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import zlib
+
+import pytest
+
+from codetotext_core.processing import deduplication
+from codetotext_core.processing.deduplication import DuplicateTracker
+
+from conftest import build_zip, flatten
+
+
+@pytest.fixture
+def digests(monkeypatch) -> list[bytes]:
+    """Contenus passés à l'empreinte BLAKE2b."""
+    hashed: list[bytes] = []
+    digest = deduplication._digest
+    monkeypatch.setattr(deduplication, "_digest", lambda content: hashed.append(content) or digest(content))
+    return hashed
+
+
+def _register(tracker: DuplicateTracker, content: bytes, path: str, crc: int | None = None) -> str | None:
+    return tracker.find_original(zlib.crc32(content) if crc is None else crc, len(content), content, path)
+
+
+def test_duplicates_are_found_without_hashing(digests):
+    tracker = DuplicateTracker()
+    assert _register(tracker, b"un\n", "a.py") is None
+    assert _register(tracker, b"deux\n", "b.py") is None
+    assert _register(tracker, b"un\n", "c.py") == "a.py"
+    assert _register(tracker, b"un\n", "d.py") == "a.py"
+    assert (tracker.duplicate_count, tracker.bytes_saved) == (2, 6)
+    assert digests == []
+
+
+def test_same_key_with_different_content_is_not_a_duplicate():
+    tracker = DuplicateTracker()
+    assert _register(tracker, b"abc", "a.py", crc=7) is None
+    assert _register(tracker, b"xyz", "b.py", crc=7) is None
+    assert _register(tracker, b"xyz", "c.py", crc=7) == "b.py"
+    assert tracker.duplicate_count == 1
+
+
+def test_beyond_the_limit_originals_are_kept_by_digest(digests):
+    tracker = DuplicateTracker(retained_content_limit=4)
+    assert _register(tracker, b"abc", "a.py") is None  # Gardé tel quel
+    assert _register(tracker, b"defg", "b.py") is None  # Limite dépassée : empreinte
+    assert digests == [b"defg"]
+    assert _register(tracker, b"abc", "c.py") == "a.py"
+    assert _register(tracker, b"defg", "d.py") == "b.py"
+    assert _register(tracker, b"defh", "e.py", crc=zlib.crc32(b"defg")) is None
+    assert digests == [b"defg", b"defg", b"defh"]
+
+
+def test_empty_files_are_never_duplicates():
+    tracker = DuplicateTracker()
+    assert _register(tracker, b"", "a.py") is None
+    assert _register(tracker, b"", "b.py") is None
+    assert tracker.duplicate_count == 0
+
+
+def test_duplicate_becomes_a_reference(sample_project):
+    output = flatten(build_zip(sample_project))
+    code = output["__code_complet.txt"].decode()
+    assert "Chemin: utils/copie.py\nLangage: Python\n-- DOUBLON DE utils/helpers.py --" in code
+    assert "--- DEDUPLICATION : 1 doublon(s), 30 octets économisés ---" in code
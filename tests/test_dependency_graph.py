@@ -0,0 +1,92 @@
+# tests/test_dependency_graph.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import pytest
+
+from codetotext_core.processing.dependency_graph import DEPENDENCIES_FILENAME, DependencyGraph, DependencySelection
+
+from conftest import build_zip, flatten
+
+_FILES = {
+    "backend/app/main.py": (
+        "import os\nfrom app.services import users\nfrom .config import SETTINGS\n\n"
+        "def run():\n    from app import models\n"
+    ),
+    "backend/app/__init__.py": "",
+    "backend/app/config.py": "SETTINGS = {}\n",
+    "backend/app/services/__init__.py": "",
+    "backend/app/services/users.py": "from ..models import User\n",
+    "backend/app/models.py": "class User:\n    pass\n" * 20,
+    "backend/outils.py": "import app.config\n",
+    "frontend/src/main.tsx": (
+        'import { api } from "./api";\nimport App from "@/components/App";\n'
+        'import React from "react";\nimport "./styles.css";\n'
+    ),
+    "frontend/src/api/index.ts": 'export * from "./client.js";\n',
+    "frontend/src/api/client.ts": "export const api = 1;\n",
+    "frontend/src/components/App.tsx": 'const util = require("../util");\n',
+    "frontend/src/util.ts": "export {};\n",
+}
+_SIZES = {path: len(text) for path, text in _FILES.items()}
+
+
+@pytest.fixture
+def graph() -> DependencyGraph:
+    graph = DependencyGraph()
+    for path, text in _FILES.items():
+        graph.add_file(path, text)
+    return graph
+
+
+def test_imports_are_resolved(graph):
+    edges = graph.edges()
+    # Absolu depuis `backend/`, relatif, local à une fonction ; `os` est externe
+    assert edges["backend/app/main.py"] == [
+        "backend/app/services/users.py", "backend/app/services/__init__.py", "backend/app/config.py",
+        "backend/app/models.py", "backend/app/__init__.py",
+    ]
+    assert edges["backend/app/services/users.py"] == ["backend/app/models.py"]
+    assert edges["backend/outils.py"] == ["backend/app/config.py"]
+    # Dossier index, alias `@/`, paquet externe et CSS ignorés, `.js` désignant un `.ts`, require()
+    assert edges["frontend/src/main.tsx"] == ["frontend/src/api/index.ts", "frontend/src/components/App.tsx"]
+    assert edges["frontend/src/api/index.ts"] == ["frontend/src/api/client.ts"]
+    assert edges["frontend/src/components/App.tsx"] == ["frontend/src/util.ts"]
+
+
+def test_closure_is_bounded_in_depth(graph):
+    selection = DependencySelection(("main.py", "frontend/src/main.tsx", "absent.py"), max_depth=1)
+    closure = graph.closure(selection, _SIZES)
+    assert [path for path, depth in closure.selected if depth == 0] == ["backend/app/main.py", "frontend/src/main.tsx"]
+    assert "frontend/src/api/client.ts" not in dict(closure.selected)
+    assert closure.depth_limited == 2  # client.ts et util.ts
+    assert closure.missing_entries == ["absent.py"]
+
+    unlimited = graph.closure(DependencySelection(("frontend/src/main.tsx",)), _SIZES)
+    assert dict(unlimited.selected) == {
+        "frontend/src/main.tsx": 0, "frontend/src/api/index.ts": 1, "frontend/src/components/App.tsx": 1,
+        "frontend/src/api/client.ts": 2, "frontend/src/util.ts": 2,
+    }
+
+
+def test_closure_is_bounded_in_size(graph):
+    closure = graph.closure(DependencySelection(("app/main.py",), max_bytes=200), _SIZES)
+    assert closure.over_budget == ["backend/app/models.py"]
+    assert "backend/app/config.py" in dict(closure.selected)  # Plus petit, il entre encore
+    assert closure.selected_bytes == sum(_SIZES[path] for path, _ in closure.selected) <= 200
+
+
+def test_ambiguous_entry_is_missing(graph):
+    closure = graph.closure(DependencySelection(("__init__.py",)), _SIZES)
+    assert (closure.selected, closure.missing_entries) == ([], ["__init__.py"])
+
+
+def test_pipeline_writes_the_selection():
+    archive = build_zip({f"depot/{path}": text for path, text in _FILES.items()})
+    output = flatten(archive, selection=DependencySelection(("backend/app/services/users.py",)))
+    selection = output[DEPENDENCIES_FILENAME].decode()
+    assert selection.startswith("--- SELECTION PAR DEPENDANCES ---")
+    assert "2 fichier(s) retenu(s)" in selection
+    assert "Chemin: backend/app/models.py" in selection
+    assert "Chemin: backend/app/main.py" not in selection
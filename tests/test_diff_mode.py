@@ -0,0 +1,70 @@
+# tests/test_diff_mode.py
+# [Version 1.1]
+
+from __future__ import annotations
+
+import io
+import zipfile
+
+import pytest
+
+from codetotext_core.processing import diff_mode
+from codetotext_core.processing.diff_mode import DIFF_FILENAME, process_zip_diff
+from codetotext_core.profiles.registry import PROFILES
+
+from conftest import build_zip
+
+
+def _diff(baseline: dict[str, str], current: dict[str, str], profile_id: str = "complet"):
+    output, name, diff = process_zip_diff(
+        io.BytesIO(build_zip(baseline)), io.BytesIO(build_zip(current)), "projet.zip", False, PROFILES[profile_id],
+    )
+    with zipfile.ZipFile(output) as result:
+        return {member: result.read(member).decode() for member in result.namelist()}, name, diff
+
+
+def test_only_changes_are_read_and_emitted(sample_project, monkeypatch):
+    read: list[str] = []
+    read_text = diff_mode._read_text
+
+    def spy(reader, item, max_file_size):
+        read.append(item.filename)
+        return read_text(reader, item, max_file_size)
+
+    monkeypatch.setattr(diff_mode, "_read_text", spy)
+    current = dict(sample_project)
+    current["projet/app.py"] = sample_project["projet/app.py"].replace("getcwd", "getcwdb")
+    current["projet/nouveau.py"] = "VALEUR = 1\n"
+    del current["projet/static/style.css"]
+
+    output, name, diff = _diff(sample_project, current)
+
+    assert name == "projet_diff.zip"
+    assert (diff.added, diff.modified, diff.removed) == (["nouveau.py"], ["app.py"], ["static/style.css"])
+    assert sorted(read) == ["projet/app.py", "projet/app.py", "projet/nouveau.py"]  # Ancienne et nouvelle version
+    report = output[DIFF_FILENAME]
+    assert report.startswith("--- DIFF : 1 ajouté(s), 1 modifié(s), 1 supprimé(s), 3 inchangé(s) ---")
+    assert "-    return os.getcwd()\n+    return os.getcwdb()" in report
+    assert "Statut: ajouté\n-- CONTENU DU CODE --\nVALEUR = 1\n" in report
+    assert "--- FICHIERS SUPPRIMÉS ---\n- static/style.css" in report
+    assert "helpers.py" not in report
+    assert "Chemin: nouveau.py" in output["__code_diff_complet_total.txt"]
+
+
+def test_identical_archives_are_rejected(sample_project):
+    with pytest.raises(ValueError):
+        _diff(sample_project, sample_project)
+
+
+def test_binary_changes_are_counted_and_reported(sample_project):
+    baseline = {**sample_project, "projet/donnees.py": "VALEUR = 1\n"}
+    current = {**sample_project, "projet/donnees.py": b"\x00\x01binaire\x00", "projet/image.py": b"\x89PNG\x00\x00"}
+
+    output, _, diff = _diff(baseline, current)
+
+    assert (diff.added, diff.modified, diff.removed) == (["image.py"], ["donnees.py"], [])
+    report = output[DIFF_FILENAME]
+    assert report.startswith("--- DIFF : 1 ajouté(s), 1 modifié(s), 0 supprimé(s), 5 inchangé(s) ---")
+    assert "Chemin: donnees.py\nLangage: Python\nStatut: modifié (binaire)\n-- FIN DU FICHIER --" in report
+    assert "Chemin: image.py\nLangage: Python\nStatut: ajouté (binaire)\n" in report
+    assert list(output) == [DIFF_FILENAME]  # Rien à consolider
@@ -0,0 +1,80 @@
+# tests/test_entry_table.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from codetotext_core.utils.entry_table import ROOT_NODE, EntryTable
+from codetotext_core.utils.file_utils import generate_zip_tree
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+from conftest import build_zip
+
+
+@pytest.fixture
+def table() -> EntryTable:
+    table = EntryTable()
+    for name, is_dir in [
+        ("projet/", True), ("projet/src/app.py", False), ("projet\\src\\utils/aide.py", False),
+        ("projet/README.md", False), ("projet/docs/", True), ("projet/utils/aide.py", False),
+    ]:
+        table.add(name, is_dir)
+    table.freeze()
+    return table
+
+
+def test_tree_is_rendered_sorted_under_the_common_root(table):
+    assert table.render_tree() == "\n".join([
+        "projet",
+        "│   ├── README.md",
+        "│   ├── docs",
+        "│   ├── src",
+        "│   │   ├── app.py",
+        "│   │   └── utils",
+        "│   │       └── aide.py",
+        "│   └── utils",
+        "│       └── aide.py",
+    ])
+
+
+def test_paths_relative_to_the_common_root(table):
+    root = table.common_root()
+    assert table.name(root) == "projet"
+    assert len(table) == 4  # Les répertoires n'ont pas d'entrée
+    paths = {entry.filename: table.path(entry.node, root) for entry in table.entries}
+    assert paths == {
+        "projet/src/app.py": "src/app.py",
+        "projet\\src\\utils/aide.py": "src/utils/aide.py",  # Séparateurs Windows normalisés
+        "projet/README.md": "README.md",
+        "projet/utils/aide.py": "utils/aide.py",
+    }
+    assert table.components(table.entries[0].node) == ["projet", "src", "app.py"]
+    assert all(table.is_file(entry.node) for entry in table.entries)
+    assert not table.is_file(root)
+
+    counts = table.basename_counts()
+    assert {table.segments[segment]: count for segment, count in counts.items()} == {
+        "app.py": 1, "aide.py": 2, "README.md": 1,
+    }
+
+
+def test_file_at_the_root_means_no_common_root():
+    table = EntryTable()
+    table.add("projet/app.py", False)
+    table.add("LICENSE", False)
+    assert table.common_root() == ROOT_NODE
+    assert table.render_tree() == "\n".join(["├── LICENSE", "└── projet", "    └── app.py"])
+    assert EntryTable().render_tree() == "Le fichier ZIP est vide."
+
+
+def test_table_from_the_central_directory(sample_project):
+    archive = build_zip(sample_project)
+    with CentralDirectoryReader(io.BytesIO(archive)) as reader:
+        table = EntryTable.from_records(reader.iter_records())
+    assert sorted(entry.filename for entry in table.entries) == sorted(sample_project)
+    sizes = {entry.filename: entry.file_size for entry in table.entries}
+    assert sizes == {name: len(content.encode()) for name, content in sample_project.items()}
+    assert table.render_tree() == generate_zip_tree(io.BytesIO(archive))
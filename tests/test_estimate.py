@@ -0,0 +1,37 @@
+# tests/test_estimate.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import pytest
+
+from codetotext_core.processing.estimate import estimate_zip
+from codetotext_core.profiles.registry import BUILTIN_PROFILES, PROFILES
+
+from conftest import build_zip, flatten
+
+_MERMAID_PROJECT = {
+    "mermaid/frontend/package.json": '{"name": "editeur"}\n',
+    "mermaid/frontend/vite.config.ts": "export default {}\n",
+    "mermaid/frontend/eslint.config.js": "export default []\n",
+    "mermaid/frontend/src/App.tsx": "export const App = () => <p>é</p>;\n",
+    "mermaid/frontend/index.html": "<html></html>\n",
+    "mermaid/backend/migrations/alembic.ini": "[alembic]\n",
+    "mermaid/backend/app/routes/mermaid.py": "x = 1\n",
+    "mermaid/backend/tests/test_a.py": "def test_a():\n    pass\n",
+    "mermaid/backend/app/__init__.py": "",
+    "mermaid/backend/app/routes/__init__.py": "",
+}
+
+
+@pytest.mark.parametrize("profile_id", list(BUILTIN_PROFILES))
+@pytest.mark.parametrize("project", ["sample", "mermaid"])
+def test_estimate_matches_produced_sizes(profile_id, project, sample_project):
+    # Fichiers texte UTF-8, ni binaires ni volumineux : l'estimation est exacte
+    archive = build_zip(sample_project if project == "sample" else _MERMAID_PROJECT)
+    produced = flatten(archive, profile_id)
+    estimate = estimate_zip(archive, PROFILES[profile_id])
+    assert {output.name: output.size for output in estimate.outputs} == {
+        output.name: len(produced[output.name]) for output in estimate.outputs if output.name in produced
+    }
+    assert all(output.name in produced for output in estimate.outputs if output.size)
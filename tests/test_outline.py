@@ -0,0 +1,140 @@
+# tests/test_outline.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import pytest
+
+from codetotext_core.processing.outline import OutlineOptions, build_outline, outline_python, outline_script
+
+from conftest import build_zip, flatten
+
+_PYTHON = '''"""Module de services."""
+import os
+
+MAX_ITEMS: int = 10
+TIMEOUT = 5
+autre = 1
+
+
+@dataclass
+class Service(Base):
+    """Service principal.
+
+    Détails.
+    """
+
+    def run(self, x: int = 1) -> str:
+        """Exécute."""
+        def interne():
+            pass
+        return str(x)
+
+    async def stop(self):
+        pass
+
+
+def aide(*args, **kwargs):
+    return 1
+'''
+
+_TYPESCRIPT = '''import { x } from "y";
+
+export interface Options {
+  nom: string;
+}
+
+export class Client extends Base {
+  private url: string;
+
+  constructor(url: string) {
+    super();
+    if (url) {
+      this.url = url;
+    }
+  }
+
+  async fetch<T>(path: string): Promise<T> {
+    const s = "{";
+    return get(path);
+  }
+}
+
+export function aide(a: number): number {
+  return a * 2;
+}
+
+export const fleche = (x: string) => {
+  return x;
+};
+'''
+
+
+def test_python_outline():
+    assert outline_python(_PYTHON) == "\n".join([
+        '"""Module de services."""',
+        "MAX_ITEMS: int = ...  # L4",
+        "TIMEOUT = ...  # L5",
+        "@dataclass",
+        "class Service(Base):  # L10",
+        '    """Service principal."""',
+        "    def run(self, x: int=1) -> str: ...  # L16",
+        '        """Exécute."""',
+        "    async def stop(self): ...  # L22",
+        "def aide(*args, **kwargs): ...  # L26",
+    ])
+
+
+def test_typescript_outline():
+    assert outline_script("client.ts", _TYPESCRIPT) == "\n".join([
+        "export interface Options { … }  // L3",
+        "export class Client extends Base  // L7",
+        "  constructor(url: string) { … }  // L10",  # Le "{" de la chaîne ne fausse pas la profondeur
+        "  async fetch<T>(path: string): Promise<T> { … }  // L17",
+        "export function aide(a: number): number { … }  // L23",
+        "export const fleche = (x: string) => { … }  // L27",
+    ])
+
+
+@pytest.mark.parametrize("path, source, expected", [
+    (
+        "page.tsx",
+        "export const Bouton = ({ label }: Props) => {\n  return <button>{label}</button>;\n};\n\n"
+        "export default function Page() {\n  return <div />;\n}\n",
+        ["export const Bouton = ({ label }: Props) => { … }  // L1", "export default function Page() { … }  // L5"],
+    ),
+    (
+        "outil.js",
+        "function a(x) {\n  return x;\n}\nclass B {\n  m() {\n    return 1;\n  }\n}\n",
+        ["function a(x) { … }  // L1", "class B  // L4", "  m() { … }  // L5"],
+    ),
+])
+def test_script_outline(path, source, expected):
+    assert outline_script(path, source) == "\n".join(expected)
+
+
+def test_outline_is_only_used_when_it_helps():
+    outline = build_outline("services.py", _PYTHON)
+    assert outline.startswith("(plan : 28 lignes, ")
+    assert len(outline) < len(_PYTHON)
+    assert build_outline("style.css", "body { color: red; }\n") is None  # Langage non pris en charge
+    assert build_outline("casse.py", "def f(:\n") is None  # Source invalide
+    assert build_outline("court.py", "x = 1\n") is None  # Plan vide
+
+
+def test_options_choose_the_files():
+    options = OutlineOptions(size_threshold=100, categories=frozenset({"OTHER"}))
+    assert options.applies_to("a.py", 101, set())
+    assert not options.applies_to("a.py", 100, set())
+    assert options.applies_to("a.ts", 1, {"OTHER"})
+    assert not options.applies_to("a.ts", 10_000, {"OTHER", "BACKEND_CODE_CRITICAL"})  # Toujours intégral
+    assert not options.applies_to("a.css", 10_000, set())
+
+
+def test_consolidations_use_the_outline(sample_project):
+    archive = build_zip({**sample_project, "projet/services.py": _PYTHON})
+    output = flatten(archive, outline=OutlineOptions(size_threshold=0, full_categories=frozenset()))
+    combined = output["__code_complet.txt"].decode()
+    assert "(plan : 28 lignes" in combined
+    assert "return str(x)" not in combined
+    assert output["services.py"].decode() == _PYTHON  # La copie individuelle reste intégrale
@@ -0,0 +1,75 @@
+# tests/test_output_format.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import dataclasses
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+import app as webapp
+from codetotext_core.processing.output_writer import _ZIP_COMPRESSIONS, OUTPUT_FORMAT_PRESETS, OutputFormat
+from codetotext_core.processing.pipeline import process_zip_file
+from codetotext_core.profiles.registry import PROFILES
+from codetotext_core.utils.file_utils import generate_zip_tree
+
+from conftest import build_zip, flatten
+
+
+def _members(output: io.BytesIO, output_format: OutputFormat) -> dict[str, bytes]:
+    if output_format.container == "tar":
+        with tarfile.open(fileobj=output, mode="r:*") as tar:
+            return {member.name: tar.extractfile(member).read() for member in tar if member.isfile()}
+    with zipfile.ZipFile(output) as result:
+        expected = _ZIP_COMPRESSIONS[output_format.compression]
+        assert {info.compress_type for info in result.infolist()} == {expected}
+        return {name: result.read(name) for name in result.namelist()}
+
+
+@pytest.mark.parametrize("preset_id", list(OUTPUT_FORMAT_PRESETS))
+def test_presets_round_trip(sample_project, preset_id):
+    _, output_format = OUTPUT_FORMAT_PRESETS[preset_id]
+    archive = build_zip(sample_project)
+    output, name = process_zip_file(
+        io.BytesIO(archive), "projet.zip", False, generate_zip_tree(io.BytesIO(archive)), PROFILES["complet"],
+        output_format=output_format,
+    )
+    assert name.endswith(output_format.extension)
+    assert _members(output, output_format) == flatten(archive)  # Même contenu qu'avec le format par défaut
+
+
+def test_file_groups_can_be_omitted(sample_project):
+    archive = build_zip(sample_project)
+    full = flatten(archive)
+    without_copies = flatten(archive, output_format=OutputFormat(include_individual_files=False))
+    without_combined = flatten(archive, output_format=OutputFormat(include_combined_files=False))
+    assert "app.py" in full and "app.py" not in without_copies
+    assert "__code_complet.txt" in without_copies and "__code_complet.txt" not in without_combined
+    assert set(without_copies) | set(without_combined) == set(full)
+
+
+@pytest.mark.parametrize("options", [
+    {"container": "rar"},
+    {"container": "tar", "compression": "deflated"},
+    {"compression": "gz"},
+    {"level": 10},
+    {"deflate_workers": 0},
+])
+def test_invalid_formats_are_rejected(options):
+    with pytest.raises(ValueError):
+        OutputFormat(**options)
+
+
+def test_form_selects_a_preset():
+    with webapp.app.app_context():
+        output_format = webapp._output_format_from_form({"output_format": "tar_xz", "omit_combined_files": "true"})
+        assert output_format == dataclasses.replace(
+            OUTPUT_FORMAT_PRESETS["tar_xz"][1], include_combined_files=False,
+            deflate_workers=webapp.app.config["DEFLATE_WORKERS"],
+        )
+        assert output_format.extension == ".tar.xz"
+        with pytest.raises(ValueError):
+            webapp._output_format_from_form({"output_format": "inconnu"})
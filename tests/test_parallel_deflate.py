@@ -0,0 +1,80 @@
+# tests/test_parallel_deflate.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import io
+import random
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from codetotext_core.processing import output_writer
+from codetotext_core.processing.output_writer import PARALLEL_DEFLATE_MIN_SIZE, OutputFormat, ZipArchiveWriter
+from codetotext_core.processing.parallel_deflate import ParallelDeflater
+
+_BLOCK = 32 * 1024
+
+
+def _data(size: int) -> bytes:
+    """Contenu peu compressible mêlé de répétitions (correspondances à cheval sur les blocs)."""
+    rng = random.Random(size)
+    return b"".join(rng.choice((b"def f():\n    return 1\n", rng.randbytes(16))) for _ in range(size // 16 + 1))[:size]
+
+
+@pytest.mark.parametrize("size", [0, 1, _BLOCK - 1, _BLOCK, _BLOCK + 1, 5 * _BLOCK + 123])
+@pytest.mark.parametrize("pieces", [1, 7])
+def test_blocks_decompress_to_the_input(size, pieces):
+    data = _data(size)
+    with ThreadPoolExecutor(3) as executor:
+        deflater = ParallelDeflater(executor, 6, block_size=_BLOCK)
+        step = max(1, size // pieces)
+        stream = b"".join(deflater.compress(data[i:i + step]) for i in range(0, size, step)) + deflater.flush()
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    assert decompressor.decompress(stream) == data
+    assert decompressor.eof and not decompressor.unused_data
+
+
+def _write(chunks: list[bytes], deflate_workers: int) -> bytes:
+    buffer = io.BytesIO()
+    with ZipArchiveWriter(buffer, OutputFormat(deflate_workers=deflate_workers)) as writer:
+        writer.write_chunks("__code_complet.txt", chunks, sum(map(len, chunks)))
+        writer.writestr("petit.txt", "bonjour\n")
+    return buffer.getvalue()
+
+
+def _assert_reads_back(archive: bytes, chunks: list[bytes]) -> None:
+    with zipfile.ZipFile(io.BytesIO(archive)) as result:
+        assert result.testzip() is None  # CRC vérifié
+        assert result.read("__code_complet.txt") == b"".join(chunks)
+        assert result.read("petit.txt") == b"bonjour\n"
+        assert result.getinfo("__code_complet.txt").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_parallel_member_reads_back(monkeypatch):
+    deflaters: list[ParallelDeflater] = []
+
+    def spy(*args, **kwargs) -> ParallelDeflater:
+        deflaters.append(ParallelDeflater(*args, **kwargs))
+        return deflaters[-1]
+
+    monkeypatch.setattr(output_writer, "ParallelDeflater", spy)
+    chunks = [_data(PARALLEL_DEFLATE_MIN_SIZE // 3 + i) for i in range(4)]
+    _assert_reads_back(_write(chunks, deflate_workers=3), chunks)
+    assert len(deflaters) == 1  # Seul le gros membre est compressé par blocs
+
+
+def test_without_compressor_swap_member_is_deflated_serially(monkeypatch):
+    monkeypatch.setattr(ZipArchiveWriter, "_can_swap_compressor", staticmethod(lambda dest: False))
+    monkeypatch.setattr(output_writer, "ParallelDeflater", None)  # Tout usage échouerait
+    chunks = [_data(PARALLEL_DEFLATE_MIN_SIZE // 3 + i) for i in range(4)]
+    _assert_reads_back(_write(chunks, deflate_workers=3), chunks)
+
+
+def test_without_level_attribute_member_goes_through_writestr(monkeypatch):
+    monkeypatch.setattr(output_writer, "_ZIPINFO_LEVEL_ATTRIBUTE", None)
+    monkeypatch.setattr(output_writer, "ParallelDeflater", None)
+    chunks = [_data(PARALLEL_DEFLATE_MIN_SIZE // 3 + i) for i in range(4)]
+    _assert_reads_back(_write(chunks, deflate_workers=3), chunks)
@@ -0,0 +1,102 @@
+# tests/test_precompressed.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import gzip
+import io
+import os
+import tarfile
+
+import pytest
+
+from codetotext_core.utils import precompressed
+from codetotext_core.utils.precompressed import MANIFEST_FILENAME, content_etag, load_manifest, precompress_members
+
+from conftest import build_zip
+
+_TEXT = "".join(f"ligne {i}\n" for i in range(5000)).encode()
+
+
+def _tar(files: dict[str, bytes], mode: str = "w") -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("container", ["zip", "tar"])
+def test_members_are_precompressed_in_chunks(tmp_path, monkeypatch, container):
+    monkeypatch.setattr(precompressed, "_CHUNK_SIZE", 1000)  # Membre lu en plusieurs dizaines de morceaux
+    files = {"__code_complet.txt": _TEXT, "__arborescence.txt": b"projet/\n", "app.py": b"print(1)\n"}
+    archive = tmp_path / f"sortie.{container}"
+    archive.write_bytes(build_zip(files) if container == "zip" else _tar(files))
+    directory = tmp_path / "membres"
+
+    manifest = precompress_members(str(archive), container, str(directory))
+
+    assert manifest == load_manifest(str(directory))
+    assert manifest["etag"] == content_etag(archive.read_bytes())
+    assert sorted(manifest["members"]) == ["__arborescence.txt", "__code_complet.txt"]
+    member = manifest["members"]["__code_complet.txt"]
+    assert (member["size"], member["etag"]) == (len(_TEXT), content_etag(_TEXT))
+    assert (directory / "__code_complet.txt").read_bytes() == _TEXT
+    compressed = (directory / "__code_complet.txt.gz").read_bytes()
+    assert gzip.decompress(compressed) == _TEXT
+    assert member["encodings"]["gzip"] == len(compressed)
+    suffixes = ("", ".gz", ".br") if precompressed.brotli is not None else ("", ".gz")
+    assert sorted(os.listdir(directory)) == sorted(
+        [MANIFEST_FILENAME] + [name + suffix for name in manifest["members"] for suffix in suffixes]
+    )  # Ni membre non servable, ni fichier temporaire
+
+
+@pytest.fixture
+def output(client):
+    test_client, _ = client
+    response = test_client.post(
+        "/api/process-tar?profile=complet&filename=projet.tar.gz",
+        data=_tar({"projet/app.py": b"import os\n" * 200, "projet/README.md": b"# Projet\n"}, "w:gz"),
+    )
+    assert response.status_code == 200
+    return test_client, response.get_json()
+
+
+def test_archive_download_is_conditional_and_resumable(output):
+    test_client, result = output
+    response = test_client.get(result["download_url"])
+    assert response.status_code == 200
+    body, etag = response.data, response.headers["ETag"]
+    assert "immutable" in response.headers["Cache-Control"]
+
+    assert test_client.get(result["download_url"], headers={"If-None-Match": etag}).status_code == 304
+    partial = test_client.get(result["download_url"], headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.data == body[10:20]
+
+
+def test_member_download_negotiates_the_encoding(output):
+    test_client, result = output
+    listing = test_client.get(f"/api/jobs/{result['job_id']}/members").get_json()
+    members = {member["name"]: member for member in listing["members"]}
+    url = members["__code_complet.txt"]["url"]
+
+    plain = test_client.get(url, headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+    assert len(plain.data) == members["__code_complet.txt"]["size"]
+    assert "Chemin: app.py" in plain.data.decode()
+
+    compressed = test_client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers["ETag"] != plain.headers["ETag"]  # Une empreinte par variante
+
+    headers = {"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+    assert test_client.get(url, headers=headers).status_code == 304
+    partial = test_client.get(url, headers={"Accept-Encoding": "identity", "Range": "bytes=0-4"})
+    assert (partial.status_code, partial.data) == (206, plain.data[:5])
+    assert test_client.get(url.replace("__code_complet", "__absent")).status_code == 404
@@ -0,0 +1,82 @@
+# tests/test_profile_detection.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from codetotext_core.profiles.base import AnalysisProfile
+from codetotext_core.profiles.detection import FALLBACK_PROFILE_ID, detect_profile, detect_zip_profile
+from codetotext_core.profiles.registry import PROFILES
+
+from conftest import build_zip
+
+
+class _Signed(AnalysisProfile):
+    profile_id = "signe"
+    profile_name = "Signé"
+
+    def __init__(self, signatures: dict[str, float]) -> None:
+        self.PATH_SIGNATURES = signatures
+
+    def is_file_ignored(self, path_in_zip: str, path_components: list[str]) -> bool:
+        return False
+
+    def categorize_file(self, path_in_zip: str) -> set[str]:
+        return set()
+
+    def generate_consolidated_files(self, categorized_files) -> dict[str, str]:
+        return {}
+
+
+_PROFILES = {
+    "api": _Signed({"backend/app/": 1.5, "backend/main.py": 1.0}),
+    "front": _Signed({"frontend/src/": 1.0, "package.json": 0.5}),
+    "vide": _Signed({}),
+}
+
+
+def test_each_signature_counts_once():
+    paths = [f"backend/app/module_{i}.py" for i in range(50)] + ["backend/main.py", "package.json"]
+    detection = detect_profile(paths, _PROFILES)
+    assert detection.profile_id == "api"
+    assert detection.scores == {"api": 2.5, "front": 0.5}  # Profil sans signature hors concours
+    assert not detection.is_fallback
+    assert detection.summary_line() == "Profil détecté : « api » (score 2.5)."
+
+
+def test_common_root_is_optional():
+    assert detect_profile(["depot/frontend/src/index.ts"], _PROFILES).profile_id == "front"
+    assert detect_profile(["frontend/src/index.ts", "README.md"], _PROFILES).profile_id == "front"
+    assert detect_profile(["a/depot/frontend/src/index.ts", "b/x"], _PROFILES).scores["front"] == 0.0
+
+
+@pytest.mark.parametrize("paths", [["package.json"], ["README.md"], []])
+def test_weak_or_no_evidence_falls_back(paths):
+    detection = detect_profile(paths, _PROFILES)
+    assert detection.profile_id == FALLBACK_PROFILE_ID
+    assert detection.is_fallback
+    assert "repli" in detection.summary_line()
+
+
+def test_ties_go_to_the_first_registered_profile():
+    assert detect_profile(["backend/main.py", "frontend/src/a.ts"], _PROFILES).profile_id == "api"
+
+
+@pytest.mark.parametrize("files, expected", [
+    ({"depot/analysis_profiles.py": "", "depot/codetotext_core/cli.py": "", "depot/app.py": ""}, "codetotext"),
+    ({"frontend/src/types/api.ts": "", "backend/app/services/mermaid_parser.py": ""}, "mermaid"),
+    ({"projet/app.py": "", "projet/README.md": ""}, FALLBACK_PROFILE_ID),
+])
+def test_registered_profiles_are_detected_from_the_central_directory(files, expected):
+    assert detect_zip_profile(io.BytesIO(build_zip(files)), PROFILES).profile_id == expected
+
+
+def test_form_reports_the_detected_profile(client):
+    test_client, _ = client
+    archive = build_zip({"depot/analysis_profiles.py": "PROFILS = {}\n", "depot/codetotext_core/cli.py": "x = 1\n"})
+    response = test_client.post("/", data={"file": (io.BytesIO(archive), "depot.zip"), "analysis_profile": "auto"})
+    assert response.status_code == 200
+    assert "Profil détecté : « codetotext »" in response.get_data(as_text=True)
@@ -0,0 +1,91 @@
+# tests/test_profiling.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import io
+import os
+import pstats
+
+import pytest
+
+import app as webapp
+from codetotext_core.utils.profiling import FOLDED_SUFFIX, PSTATS_SUFFIX, capture_profile, rotate_profiles
+
+from conftest import build_zip
+
+
+def _busy_loop() -> int:
+    return sum(i * i for i in range(200_000))
+
+
+def test_capture_writes_both_profiles(tmp_path):
+    with capture_profile(str(tmp_path), "tache", sample_interval=0.001) as capture:
+        _busy_loop()
+        with capture_profile(str(tmp_path), "imbriquee") as nested:
+            pass
+    assert nested.artifacts() == {}  # Une seule capture à la fois
+    assert capture.artifacts() == {"pstats": "tache" + PSTATS_SUFFIX, "folded": "tache" + FOLDED_SUFFIX}
+    assert any("_busy_loop" in function for _, _, function in pstats.Stats(capture.pstats_path).stats)
+    folded = (tmp_path / ("tache" + FOLDED_SUFFIX)).read_text().splitlines()
+    assert capture.samples == sum(int(line.rsplit(" ", 1)[1]) for line in folded)
+
+
+def _fake_capture(directory, name: str, size: int, mtime: int) -> None:
+    for suffix in (PSTATS_SUFFIX, FOLDED_SUFFIX):
+        path = directory / (name + suffix)
+        path.write_bytes(b"x" * size)
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.mark.parametrize("keep, max_bytes, kept", [
+    (2, 10_000, ["c2", "c3"]),
+    (10, 450, ["c2", "c3"]),  # 200 octets par capture
+    (10, 10, ["c3"]),  # La plus récente est conservée même au-delà du budget
+])
+def test_rotation(tmp_path, keep, max_bytes, kept):
+    for index in range(4):
+        _fake_capture(tmp_path, f"c{index}", 100, 1_000_000 + index)
+    (tmp_path / "autre.txt").write_text("conservé")
+    rotate_profiles(str(tmp_path), keep, max_bytes)
+    remaining = {name.split(".")[0] for name in os.listdir(tmp_path) if name != "autre.txt"}
+    assert sorted(remaining) == kept
+    assert (tmp_path / "autre.txt").exists()
+
+
+@pytest.fixture
+def profiling_client(client, tmp_path, monkeypatch):
+    monkeypatch.setitem(webapp.app.config, "PROFILING_SECRET", "secret")
+    monkeypatch.setitem(webapp.app.config, "PROFILING_FOLDER", str(tmp_path / "profiling"))
+    return client
+
+
+def _submit(test_client, store, sample_project, **fields) -> dict:
+    response = test_client.post("/", data={
+        "file": (io.BytesIO(build_zip(sample_project)), "projet.zip"), "analysis_profile": "complet", **fields,
+    })
+    assert response.status_code == 200
+    job_id = store._connection().execute("SELECT job_id FROM jobs ORDER BY created_at DESC LIMIT 1").fetchone()[0]
+    return store.get_job(job_id)
+
+
+def test_profiling_requires_the_token(profiling_client, sample_project):
+    test_client, store = profiling_client
+    assert "profiling" not in _submit(test_client, store, sample_project, profiling_token="faux")["result"]
+
+    job = _submit(test_client, store, sample_project, profiling_token="secret")
+    assert job["result"]["profiling"] == {"pstats": job["job_id"] + PSTATS_SUFFIX, "folded": job["job_id"] + FOLDED_SUFFIX}
+
+    url = f"/api/jobs/{job['job_id']}/profiling"
+    assert test_client.get(f"{url}/pstats").status_code == 403
+    assert test_client.get(f"{url}/pstats?profiling_token=faux").status_code == 403
+    response = test_client.get(f"{url}/folded", headers={"X-Profiling-Token": "secret"})
+    assert response.status_code == 200 and response.data
+    assert test_client.get(f"{url}/autre", headers={"X-Profiling-Token": "secret"}).status_code == 404
+
+
+def test_profiling_is_disabled_without_a_secret(client, sample_project, monkeypatch):
+    monkeypatch.setitem(webapp.app.config, "PROFILING_SECRET", None)
+    test_client, store = client
+    assert "profiling" not in _submit(test_client, store, sample_project, profiling_token="")["result"]
+    assert test_client.get("/api/jobs/x/profiling/pstats?profiling_token=").status_code == 403
@@ -0,0 +1,116 @@
+# tests/test_resource_budget.py
+# [Version 1.1]
+
+from __future__ import annotations
+
+import pytest
+
+from codetotext_core.processing import resource_budget
+from codetotext_core.processing.resource_budget import (
+    BudgetExceeded,
+    JobBudget,
+    ResourceLimits,
+    check_zip_archive,
+    job_budget,
+)
+from codetotext_core.utils.shared_store import SharedStore
+
+from conftest import build_zip, flatten
+
+_NO_LIMITS = ResourceLimits(
+    max_entries=None, max_total_uncompressed=None, max_compression_ratio=None,
+    max_wall_seconds=None, max_output_bytes=None, max_memory_growth=None,
+)
+
+
+@pytest.mark.parametrize("limits, limit", [
+    (ResourceLimits(max_entries=4), "max_entries"),
+    (ResourceLimits(max_total_uncompressed=100), "max_total_uncompressed"),
+    (ResourceLimits(max_compression_ratio=2.0, ratio_check_min_size=0), "max_compression_ratio"),
+])
+def test_admission_rejects_from_the_central_directory(sample_project, limits, limit):
+    archive = build_zip({**sample_project, "projet/zeros.txt": "0" * 100_000})
+    with pytest.raises(BudgetExceeded) as excinfo:
+        check_zip_archive(archive, limits)
+    assert excinfo.value.limit == limit
+    with pytest.raises(BudgetExceeded):
+        flatten(archive, limits=limits)
+
+
+def test_output_budget_interrupts_processing(sample_project):
+    limits = ResourceLimits(max_output_bytes=200)
+    check_zip_archive(build_zip(sample_project), limits)
+    with pytest.raises(BudgetExceeded) as excinfo:
+        flatten(build_zip(sample_project), limits=limits)
+    assert excinfo.value.limit == "max_output_bytes"
+
+
+def test_wall_clock_budget(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resource_budget.time, "monotonic", lambda: now[0])
+    budget = JobBudget(ResourceLimits(max_wall_seconds=10, max_memory_growth=None))
+    budget.check()
+    now[0] += 11
+    with pytest.raises(BudgetExceeded) as excinfo:
+        budget.check()
+    assert excinfo.value.limit == "max_wall_seconds"
+
+
+def test_memory_growth_of_a_lone_job(monkeypatch):
+    memory = [100]
+    monkeypatch.setattr(resource_budget, "_resident_memory", lambda: memory[0])
+    with job_budget(ResourceLimits(max_memory_growth=50)) as budget:
+        memory[0] = 140
+        budget.check()
+        memory[0] = 160
+        with pytest.raises(BudgetExceeded) as excinfo:
+            budget.check()
+    assert excinfo.value.limit == "max_memory_growth"
+
+
+def test_memory_is_not_charged_to_concurrent_jobs(monkeypatch):
+    memory = [100]
+    monkeypatch.setattr(resource_budget, "_resident_memory", lambda: memory[0])
+    limits = ResourceLimits(max_memory_growth=50)
+    with job_budget(limits) as first:
+        with job_budget(limits) as second:
+            memory[0] = 1000  # La croissance due à l'un ne peut être imputée à l'autre
+            first.check()
+            second.check()
+        first.check()  # Mesure faussée par le chevauchement : plus de contrôle mémoire
+    with job_budget(limits) as alone:  # Seul à nouveau : nouvelle référence
+        alone.check()
+        memory[0] = 1100
+        with pytest.raises(BudgetExceeded):
+            alone.check()
+
+
+def test_streamed_entries_are_counted():
+    budget = JobBudget(ResourceLimits(max_entries=2, max_total_uncompressed=None))
+    budget.add_entry(10)
+    budget.add_entry(10)
+    with pytest.raises(BudgetExceeded):
+        budget.add_entry(10)
+
+
+def test_no_limits(sample_project):
+    check_zip_archive(build_zip(sample_project), _NO_LIMITS)
+    assert "__code_complet.txt" in flatten(build_zip(sample_project), limits=_NO_LIMITS)
+
+
+def test_slots_are_shared_fairly(tmp_path):
+    store = SharedStore(str(tmp_path / "shared"))
+    held = [store.acquire_slot("traitement", "a", capacity=4) for _ in range(4)]
+    assert all(held)  # Client seul : toute la capacité
+    assert store.acquire_slot("traitement", "b", capacity=4) is None  # Pool plein
+    store.release_slot(held.pop())
+    store.release_slot(held.pop())
+    assert store.acquire_slot("traitement", "b", capacity=4) is not None
+    assert store.acquire_slot("traitement", "a", capacity=4) is None  # Part équitable atteinte : 4 // 2
+    assert store.acquire_slot("traitement", "b", capacity=4) is not None
+
+
+def test_expired_slots_are_reclaimed(tmp_path):
+    store = SharedStore(str(tmp_path / "shared"))
+    assert store.acquire_slot("traitement", "a", capacity=1, lease_seconds=-1) is not None
+    assert store.acquire_slot("traitement", "b", capacity=1) is not None  # Bail du premier expiré
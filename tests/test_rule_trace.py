@@ -0,0 +1,82 @@
+# tests/test_rule_trace.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import json
+
+from codetotext_core.profiles.base import AnalysisProfile
+from codetotext_core.profiles.rule_trace import RULES_TRACE_FILENAME, RuleTracer
+
+from conftest import build_zip, flatten
+
+
+class _Profile(AnalysisProfile):
+    """Règles de formes variées : corps sur la ligne de la condition, condition sur plusieurs lignes, elif."""
+
+    profile_id = "trace"
+    profile_name = "Traçage"
+
+    def is_file_ignored(self, path_in_zip: str, path_components: list[str]) -> bool:
+        if path_in_zip.endswith(".log"):
+            return True
+        if "tmp" in path_components: return True
+        if (path_in_zip.startswith("vendor/")
+                and path_in_zip.endswith(".js")):
+            return True
+        return False
+
+    def categorize_file(self, path_in_zip: str) -> set[str]:
+        categories = set()
+        if path_in_zip.endswith(".py"):
+            categories.add("PY")
+        elif path_in_zip.endswith(".md"): categories.add("DOC")
+        return categories
+
+    def generate_consolidated_files(self, categorized_files) -> dict[str, str]:
+        return {}
+
+
+def _rules(report: dict, method: str) -> dict[str, dict]:
+    return {rule["source"]: rule for rule in report["methods"][f"_Profile.{method}"]["rules"]}
+
+
+def test_hits_decisions_and_examples():
+    profile = _Profile()
+    tracer = RuleTracer(profile, examples=2)
+    paths = ["a.log", "b.log", "c.log", "tmp/x.py", "vendor/lib.js", "vendor/lib.css", "src/app.py", "README.md"]
+    ignored = []
+    for path in paths:  # Comme le pipeline : filtres puis catégorisation, fichier par fichier
+        if tracer.call(path, profile.is_file_ignored, path, path.split("/")):
+            ignored.append(path)
+        else:
+            tracer.call(path, profile.categorize_file, path)
+
+    assert ignored == ["a.log", "b.log", "c.log", "tmp/x.py", "vendor/lib.js"]
+    report = tracer.report()
+    assert report["profile"] == "trace" and report["files"] == len(paths)
+
+    rules = _rules(report, "is_file_ignored")
+    log, tmp, vendor = (rules[source] for source in (
+        'if path_in_zip.endswith(".log"):', 'if "tmp" in path_components: return True',
+        'if (path_in_zip.startswith("vendor/")',
+    ))
+    assert (log["evaluations"], log["matches"], log["decided"]) == (8, 3, 3)
+    assert log["examples"] == ["a.log", "b.log"]
+    assert log["results"] == {"True": 3}
+    assert (tmp["evaluations"], tmp["matches"], tmp["examples"]) == (5, 1, ["tmp/x.py"])
+    assert (vendor["evaluations"], vendor["matches"], vendor["examples"]) == (4, 1, ["vendor/lib.js"])
+    assert report["methods"]["_Profile.is_file_ignored"]["undecided"] == 3
+
+    categories = _rules(report, "categorize_file")
+    assert categories['if path_in_zip.endswith(".py"):']["examples"] == ["src/app.py"]
+    assert categories['elif path_in_zip.endswith(".md"): categories.add("DOC")']["matches"] == 1
+    assert report["never_matched"] == []
+
+
+def test_trace_is_written_by_the_pipeline(sample_project):
+    output = flatten(build_zip({**sample_project, "projet/node_modules/x.js": "x"}), trace_rules=True)
+    report = json.loads(output[RULES_TRACE_FILENAME])
+    assert report["profile"] == "complet"
+    assert report["files"] >= len(sample_project)
+    assert any(method["calls"] for method in report["methods"].values())
@@ -0,0 +1,74 @@
+# tests/test_shared_store.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import io
+import threading
+import time
+
+import app as webapp
+from codetotext_core.utils.shared_store import JOB_FAILED, SharedStore
+
+from conftest import build_zip
+
+
+def test_claim_then_value(tmp_path):
+    store = SharedStore(str(tmp_path / "shared"))
+    assert store.cache_claim("result", "cle", job_id="premier").owner
+    pending = store.cache_claim("result", "cle", timeout=0)
+    assert (pending.value, pending.owner, pending.pending_job) == (None, False, "premier")  # Pas de second calcul
+
+    store.cache_put("result", "cle", {"sortie": 1})
+    claim = store.cache_claim("result", "cle", timeout=0)
+    assert (claim.value, claim.owner) == ({"sortie": 1}, False)
+
+
+def test_waiter_receives_the_value(tmp_path):
+    store = SharedStore(str(tmp_path / "shared"), poll_interval=0.01)
+    assert store.cache_claim("result", "cle").owner
+    threading.Timer(0.1, store.cache_put, ("result", "cle", {"sortie": 2})).start()
+    assert store.cache_claim("result", "cle", timeout=10).value == {"sortie": 2}
+
+
+def test_released_or_expired_claims_are_taken_over(tmp_path):
+    store = SharedStore(str(tmp_path / "shared"))
+    assert store.cache_claim("result", "cle").owner
+    store.cache_release("result", "cle")  # Échec du premier calcul
+    assert store.cache_claim("result", "cle", timeout=0).owner
+
+    expired = SharedStore(str(tmp_path / "shared"), lease_seconds=-1)
+    assert expired.cache_claim("result", "autre").owner
+    assert expired.cache_claim("result", "autre", timeout=0).owner  # Bail expiré : processus présumé tué
+
+
+def test_old_jobs_are_purged(tmp_path):
+    store = SharedStore(str(tmp_path / "shared"))
+    old = store.create_job("upload", {})
+    store.fail_job(old, "erreur")
+    assert store.purge_jobs(time.time() - 60) == 0
+    assert store.get_job(old) is not None
+
+    expiring = SharedStore(str(tmp_path / "shared"), job_expiry_seconds=-1)
+    recent = expiring.create_job("upload", {})  # La création purge les tâches expirées
+    assert store.get_job(old) is None
+    assert store.get_job(recent) is not None
+
+
+def test_identical_upload_in_progress_is_not_awaited(client, monkeypatch, sample_project):
+    test_client, store = client
+    monkeypatch.setitem(webapp.app.config, "CACHE_WAIT_SECONDS", 0)
+    monkeypatch.setattr(webapp, "_result_cache_key", lambda *parts: "cle")
+    assert store.cache_claim("result", "cle", job_id="premier").owner  # Même archive, autre requête
+
+    started = time.monotonic()
+    response = test_client.post("/", data={
+        "file": (io.BytesIO(build_zip(sample_project)), "projet.zip"), "analysis_profile": "complet",
+    })
+    assert response.status_code == 302
+    assert time.monotonic() - started < 5
+
+    job = store._connection().execute("SELECT job_id FROM jobs WHERE kind = 'upload'").fetchone()
+    job = store.get_job(job[0])
+    assert job["status"] == JOB_FAILED
+    assert "premier" in job["error"]
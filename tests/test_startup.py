@@ -0,0 +1,40 @@
+# tests/test_startup.py
+# [Version 1.0]
+
+# Démarrage à froid : budget de temps d'import (commande `startup-budget`,
+# dans des interpréteurs neufs) et imports évités par le registre paresseux.
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=_PROJECT_ROOT, capture_output=True, text=True, timeout=120,
+    )
+
+
+def test_import_time_budget():
+    result = _run("-m", "codetotext_core", "startup-budget", "--runs", "3")
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_cli_does_not_import_flask_or_profiles():
+    result = _run("-c", (
+        "import sys, codetotext_core.cli; "
+        "print(sorted(m for m in ('flask', 'analysis_profiles') if m in sys.modules))"
+    ))
+    assert result.stdout.strip() == "[]", result.stderr
+
+
+def test_app_import_constructs_no_profile():
+    result = _run("-c", (
+        "import sys, app; "
+        "print('analysis_profiles' in sys.modules, app.PROFILES._instances)"
+    ))
+    assert result.stdout.strip() == "False {}", result.stderr
@@ -0,0 +1,81 @@
+# tests/test_watch_mode.py
+# [Version 1.0]
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+
+from codetotext_core.processing.watch_mode import DirectoryFlattener, watch_directory
+from codetotext_core.profiles.registry import PROFILES
+
+
+def _write(root, files: dict[str, str]) -> None:
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+def _touch(path, offset_ns: int) -> None:
+    """Change le mtime de façon visible quelle que soit la résolution du système de fichiers."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset_ns))
+
+
+def _outputs(directory) -> dict[str, str]:
+    return {path.name: path.read_text() for path in directory.iterdir()}
+
+
+def test_update_rewrites_only_what_changed(tmp_path, sample_project):
+    source = tmp_path / "projet"
+    _write(tmp_path, sample_project)
+    flattener = DirectoryFlattener(str(source), str(tmp_path / "sortie"), PROFILES["complet"])
+    first = flattener.update()
+    assert sorted(first.added) == sorted(path.removeprefix("projet/") for path in sample_project)
+    assert flattener.update() is None  # Rien n'a changé
+
+    initial = _outputs(tmp_path / "sortie")
+    (source / "app.py").write_text("def main():\n    return 42\n")
+    _touch(source / "app.py", 10**9)
+    _write(source, {"api/helpers.py": "def api():\n    pass\n"})  # Rend le nom helpers.py ambigu
+    (source / "static" / "style.css").unlink()
+
+    update = flattener.update()
+    assert (update.added, update.modified, update.removed) == (["api/helpers.py"], ["app.py"], ["static/style.css"])
+    outputs = _outputs(tmp_path / "sortie")
+    assert outputs["app.py"] == "def main():\n    return 42\n"
+    assert "helpers.py" not in outputs and {"api.helpers.py", "utils.helpers.py"} <= set(outputs)
+    assert "style.css" not in outputs
+    assert outputs["copie.py"] == initial["copie.py"]
+    assert "return 42" in outputs["__code_complet.txt"]
+    assert "── api" in outputs["__arborescence.txt"] and "style.css" not in outputs["__arborescence.txt"]
+
+    # L'état incrémental aboutit à la même sortie qu'une reconstruction complète
+    rebuilt = DirectoryFlattener(str(source), str(tmp_path / "reconstruit"), PROFILES["complet"])
+    rebuilt.update()
+    assert _outputs(tmp_path / "reconstruit") == outputs
+
+
+def test_watch_loop_applies_changes(tmp_path, sample_project):
+    source = tmp_path / "projet"
+    _write(tmp_path, sample_project)
+    flattener = DirectoryFlattener(str(source), str(tmp_path / "sortie"), PROFILES["complet"])
+    updates: queue.Queue = queue.Queue()
+    stop = threading.Event()
+    watcher = threading.Thread(
+        target=watch_directory, args=(flattener, updates.put),
+        kwargs={"poll_interval": 0.01, "debounce": 0.01, "stop_event": stop},
+    )
+    watcher.start()
+    try:
+        assert updates.get(timeout=10).added  # État initial
+        _write(source, {"nouveau.py": "VALEUR = 1\n"})
+        update = updates.get(timeout=10)
+        assert update.added == ["nouveau.py"]
+        assert (tmp_path / "sortie" / "nouveau.py").read_text() == "VALEUR = 1\n"
+    finally:
+        stop.set()
+        watcher.join(timeout=10)
+    assert not watcher.is_alive()
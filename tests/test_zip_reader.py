@@ -0,0 +1,106 @@
+# tests/test_zip_reader.py
+# [Version 1.1]
+
+from __future__ import annotations
+
+import random
+import zipfile
+
+import pytest
+
+from codetotext_core.utils import zip_reader
+from codetotext_core.utils.zip_reader import CentralDirectoryReader
+
+from conftest import build_zip, flatten
+
+# Plus grand qu'une tranche de lecture : plusieurs passages dans le décompresseur
+_LARGE = "".join(f"ligne {i} {random.Random(i).random()}\n" for i in range(20000))
+
+
+@pytest.mark.parametrize("compression", [
+    zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA,
+])
+def test_members_are_read_back_in_pieces(compression):
+    files = {"a/petit.txt": "bonjour\n", "a/vide.txt": "", "a/grand.txt": _LARGE}
+    with CentralDirectoryReader(build_zip(files, compression)) as reader:
+        records = {record.filename: record for record in reader.iter_records()}
+        assert {name: records[name].file_size for name in files} == {
+            name: len(content.encode()) for name, content in files.items()
+        }
+        for name, content in files.items():
+            with reader.open(records[name]) as member:
+                data = member.read(100) + member.read(70000) + member.read()
+            assert data == content.encode()
+
+
+def test_zip64_records_and_directories(tmp_path):
+    path = tmp_path / "zip64.zip"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("dossier/", "")
+        with archive.open("dossier/fichier.py", "w", force_zip64=True) as member:
+            member.write(b"print('zip64')\n")
+    with CentralDirectoryReader(str(path)) as reader:
+        records = list(reader.iter_records())
+        assert [(record.filename, record.is_dir) for record in records] == [
+            ("dossier/", True), ("dossier/fichier.py", False),
+        ]
+        assert reader.read(records[1]) == b"print('zip64')\n"
+
+
+def test_corrupted_member_fails_crc_check():
+    archive = bytearray(build_zip({"f.txt": "contenu original\n"}, zipfile.ZIP_STORED))
+    position = bytes(archive).index(b"original")
+    archive[position] = ord("O")
+    with CentralDirectoryReader(bytes(archive)) as reader:
+        (record,) = reader.iter_records()
+        with pytest.raises(zipfile.BadZipFile, match="CRC"):
+            reader.read(record)
+
+
+def test_unsupported_methods_fall_back_to_zipfile(monkeypatch):
+    monkeypatch.setattr(zip_reader, "_NATIVE_COMPRESS_TYPES", frozenset({zipfile.ZIP_STORED}))
+    with CentralDirectoryReader(build_zip({"f.txt": _LARGE}, zipfile.ZIP_LZMA)) as reader:
+        (record,) = reader.iter_records()
+        with reader.open(record) as member:
+            assert member.read(10) + member.read() == _LARGE.encode()
+
+
+def test_lzma_archives_are_processed(sample_project):
+    members = flatten(build_zip(sample_project, zipfile.ZIP_LZMA))
+    assert sample_project["projet/app.py"] in members["__code_complet.txt"].decode("utf-8")
+
+
+def _read_all(archive: bytes) -> None:
+    with CentralDirectoryReader(archive) as reader:
+        for record in reader.iter_records():
+            reader.read(record)
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2])
+def test_truncated_archives_raise_bad_zip_file(compression):
+    archive = build_zip({"a.txt": "un\n" * 50, "b/c.py": "print(2)\n"}, compression)
+    for cut in range(len(archive) - 1, 0, -1):
+        with pytest.raises(zipfile.BadZipFile):
+            _read_all(archive[:cut])
+    # Chaque entrée du répertoire central déclare une longueur de nom hors de l'archive
+    corrupted = bytearray(archive)
+    position = bytes(archive).index(b"PK\x01\x02")
+    corrupted[position + 28:position + 30] = b"\xff\xff"
+    with pytest.raises(zipfile.BadZipFile):
+        _read_all(bytes(corrupted))
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA])
+def test_declared_size_beyond_the_data(compression):
+    with CentralDirectoryReader(build_zip({"f.txt": _LARGE}, compression)) as reader:
+        (record,) = reader.iter_records()
+        with pytest.raises(zipfile.BadZipFile, match="tronquées"):
+            reader.read(record._replace(file_size=record.file_size + 10))
+
+
+def test_truncated_archive_is_rejected_by_the_api(client, sample_project):
+    test_client, _ = client
+    archive = build_zip(sample_project)
+    response = test_client.post("/api/estimate?profile=complet", data=archive[:-5])
+    assert response.status_code == 400
+    assert "ZIP" in response.get_json()["error"]